@@ -0,0 +1,208 @@
+"""
+Batched activity logging.
+
+Route handlers and the auth_utils log_* helpers hand their documents to
+submit(), which queues them for a background writer instead of inserting
+on the request path. The writer takes up to `batch_size` documents, or
+whatever arrived within `flush_interval` seconds, and writes each target
+collection with one insert_many. Documents that need the user's _id (the
+auth_utils layout) are resolved with one users lookup per batch; those for
+unknown users are skipped, as the helpers did before.
+
+The queue holds at most `max_queue` documents. When it is full, submit()
+waits up to `block_timeout` seconds for room (backpressure on the caller)
+and then drops the document; on an event loop thread it never waits, so
+coroutines on the aio loop can log without stalling it. close() drains
+the queue; the app registers it to run at exit. stats() reports queued,
+flushed, dropped and failed counts.
+
+A db without an installed ActivityLog (scripts, app_old.py) is written
+synchronously, one insert per call.
+"""
+
+import asyncio
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class ActivityLog:
+    def __init__(self, db, max_queue: int = 10000, batch_size: int = 200, flush_interval: float = 1.0,
+                 block_timeout: float = 0.05):
+        self.db             = db
+        self.batch_size     = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout  = block_timeout
+        self._q      = queue.Queue(maxsize=max_queue)
+        self._lock   = threading.Lock()
+        self._thread = None
+        self._pid    = None
+        self._closed = False
+        self._stats  = {"submitted": 0, "flushed": 0, "dropped": 0, "failed": 0, "unknown_user": 0,
+                        "batches": 0, "blocked": 0}
+
+    def _bump(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    def _ensure_writer(self):
+        """Start the writer once per process (safe after a fork)."""
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid    = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="activity-log", daemon=True)
+                self._thread.start()
+
+    def submit(self, collection: str, doc: dict, resolve_user: str = None) -> bool:
+        """Queue doc for db[collection]; with resolve_user (an email) the writer sets doc["user_id"].
+        False if the document was dropped."""
+        if self._closed:
+            return write_now(self.db, collection, doc, resolve_user)
+        self._ensure_writer()
+        item = (collection, doc, resolve_user)
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            self._bump("blocked")
+            try:
+                if _on_event_loop():
+                    raise queue.Full
+                self._q.put(item, timeout=self.block_timeout)
+            except queue.Full:
+                self._bump("dropped")
+                return False
+        self._bump("submitted")
+        return True
+
+    # ---- writer ----
+
+    def _run(self):
+        while True:
+            item = self._q.get()
+            if item is _STOP:
+                self._q.task_done()
+                return
+            batch, stop = [item], False
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                left = deadline - time.monotonic()
+                try:
+                    nxt = self._q.get(timeout=left) if left > 0 else self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            try:
+                self._write(batch)
+            finally:
+                for _ in range(len(batch) + stop):
+                    self._q.task_done()
+            if stop:
+                return
+
+    def _write(self, batch):
+        emails = {email for _, _, email in batch if email}
+        users = {}
+        if emails:
+            try:
+                users = {u["email"]: u["_id"] for u in self.db["users"].find({"email": {"$in": list(emails)}},
+                                                                              {"email": 1})}
+            except Exception as exc:
+                logger.warning(f"Activity log: user lookup for {len(batch)} documents failed: {exc}")
+                self._bump("failed", len(batch))
+                return
+        by_col = defaultdict(list)
+        for col, doc, email in batch:
+            if email:
+                if email not in users:
+                    self._bump("unknown_user")
+                    continue
+                doc = {"user_id": users[email], **doc}
+            by_col[col].append(doc)
+        for col, docs in by_col.items():
+            try:
+                self.db[col].insert_many(docs, ordered=False)
+                self._bump("flushed", len(docs))
+            except Exception as exc:
+                logger.warning(f"Activity log: insert of {len(docs)} documents into {col} failed: {exc}")
+                self._bump("failed", len(docs))
+        self._bump("batches")
+
+    # ---- flush / shutdown ----
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until everything queued so far is written; False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self._q.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        """Stop accepting queued writes, drain the queue and stop the writer."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            try:
+                self._q.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(timeout)
+        if self._q.qsize():
+            logger.warning(f"Activity log: {self._q.qsize()} documents not written at shutdown")
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+        out.update(queued=self._q.qsize(), max_queue=self._q.maxsize, batch_size=self.batch_size)
+        return out
+
+
+_installed = None
+
+
+def install(log: ActivityLog):
+    """Route submit() calls for log.db through `log`."""
+    global _installed
+    _installed = log
+
+
+def submit(db, collection: str, doc: dict, resolve_user: str = None) -> bool:
+    """Queue doc on the installed ActivityLog for this db, or write it now if there is none."""
+    log = _installed
+    if log is not None and log.db is db:
+        return log.submit(collection, doc, resolve_user)
+    return write_now(db, collection, doc, resolve_user)
+
+
+def write_now(db, collection: str, doc: dict, resolve_user: str = None) -> bool:
+    try:
+        if resolve_user:
+            user = db["users"].find_one({"email": resolve_user}, {"_id": 1})
+            if not user:
+                return False
+            doc = {"user_id": user["_id"], **doc}
+        db[collection].insert_one(doc)
+        return True
+    except Exception as exc:
+        logger.warning(f"Activity log: insert into {collection} failed: {exc}")
+        return False
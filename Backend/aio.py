@@ -0,0 +1,118 @@
+"""
+Async execution path for outbound I/O.
+
+Each process runs one background event loop that owns the shared
+aiohttp session and every await-able upstream call (Gemini, Groq,
+DuckDuckGo, Vapi, Google OAuth). Sync Flask views bridge into it with
+run(); ASGI handlers (asgi.py) await it with call(). Either way thousands
+of in-flight LLM calls multiplex on one loop instead of one blocked
+socket per worker.
+"""
+
+import asyncio
+import atexit
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("AIO_MAX_CONNECTIONS", "200"))
+
+_lock   = threading.Lock()
+_loop   = None
+_pid    = None
+_client = None
+_closers = []
+
+
+def loop() -> asyncio.AbstractEventLoop:
+    """Start (once per process, so it is safe after gunicorn forks) and return the I/O loop."""
+    global _loop, _pid, _client
+    with _lock:
+        if _loop is None or _pid != os.getpid():
+            _loop, _pid, _client = asyncio.new_event_loop(), os.getpid(), None
+            threading.Thread(target=_loop.run_forever, name="aio-loop", daemon=True).start()
+    return _loop
+
+
+def submit(coro):
+    return asyncio.run_coroutine_threadsafe(coro, loop())
+
+
+def run(coro, timeout: float = None):
+    """Block the calling (sync) thread until `coro` finishes on the I/O loop."""
+    return submit(coro).result(timeout)
+
+
+async def call(coro):
+    """Await `coro` on the I/O loop from another event loop (e.g. uvicorn's)."""
+    return await asyncio.wrap_future(submit(coro))
+
+
+async def _anext(agen):
+    return await agen.__anext__()
+
+
+def iterate(agen, timeout: float = None):
+    """Drive an async generator on the I/O loop from a sync caller (e.g. a streaming Flask view).
+    Closing this generator early (client disconnect) closes `agen`, cancelling upstream work."""
+    try:
+        while True:
+            try:
+                yield run(_anext(agen), timeout)
+            except StopAsyncIteration:
+                return
+    finally:
+        run(agen.aclose(), 5)
+
+
+async def aiterate(agen):
+    """iterate() for callers on another event loop (ASGI)."""
+    try:
+        while True:
+            try:
+                yield await call(_anext(agen))
+            except StopAsyncIteration:
+                return
+    finally:
+        await call(agen.aclose())
+
+
+def http():
+    """Shared aiohttp.ClientSession; only use from coroutines running on the I/O loop."""
+    global _client
+    if _client is None or _client.closed:
+        import aiohttp
+        _client = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_MAX_CONNECTIONS),
+            timeout=aiohttp.ClientTimeout(total=30, sock_connect=5),
+        )
+    return _client
+
+
+def on_shutdown(closer):
+    """Register an async callable (e.g. a client's aclose) to run at interpreter exit."""
+    _closers.append(closer)
+
+
+async def _close_all():
+    for closer in _closers + ([_client.close] if _client is not None else []):
+        try:
+            await closer()
+        except Exception as exc:
+            logger.warning(f"aio shutdown: {exc}")
+
+
+@atexit.register
+def _shutdown():
+    if _loop is not None and _pid == os.getpid() and _loop.is_running():
+        try:
+            run(_close_all(), timeout=5)
+        except Exception:
+            pass
+
+
+def timeout(seconds: float):
+    import aiohttp
+    return aiohttp.ClientTimeout(total=seconds)
@@ -8,22 +8,26 @@ Render-safe: no FileHandler, no sounddevice, no hardcoded URLs.
 # IMPORTS
 # ============================================================
 import os
+import atexit
+import base64
+import hashlib
 import logging
 import json
 import re
-import math
 import time
 import tempfile
 import threading
 import asyncio
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from urllib.parse import urlencode
+from types import MappingProxyType
 from typing import TypedDict
 from queue import Queue
 
+import aiohttp
 import numpy as np
-import requests
-from flask import Flask, request, jsonify, redirect
+from flask import Flask, Request, Response, request, jsonify, redirect
 from flask_cors import CORS
 from dotenv import load_dotenv
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -31,7 +35,29 @@ import jwt
 from pymongo import MongoClient, ASCENDING
 from pymongo.errors import DuplicateKeyError
 from itsdangerous import URLSafeTimedSerializer, SignatureExpired
-import pdfplumber
+
+import aio
+from activity_log import ActivityLog
+import activity_log
+import auth_utils
+from gemini_client import GeminiClient, GEMINI_BASE_URL
+from continuity import ContinuityParser
+import ats_scorer
+from history import SummaryStore, budget_for, clip, compact
+from intent_classifier import load_classifier
+import job_json
+from job_cache import JobCache
+from job_prefetch import JobPrefetcher
+from job_sites import MultiSiteScraper, dedupe_key
+from job_store import JobStore
+from latency import LatencyStats
+from llm_cache import LRUTier, MongoTier, ResponseCache, cache_key
+from pdf_text import extract_pdf_text
+import pdf_text
+from resume_cache import ResumeCache, jd_key, normalize_sections
+from semantic_cache import SemanticCache
+from singleflight import SingleFlight
+from tasks import QueueFull, TaskQueue, public as task_public
 
 # ============================================================
 # ENVIRONMENT VARIABLES
@@ -86,12 +112,25 @@ for _k, _v in [
 # ============================================================
 # FLASK APP + CORS
 # ============================================================
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(4 * 1024 * 1024)))
+
+
+class UploadRequest(Request):
+    """Keeps uploads up to UPLOAD_SPOOL_BYTES in memory (werkzeug spools from 500 KB)."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES, mode="rb+")
+
+
 app = Flask(__name__)
-app.secret_key = SECRET_KEY
+app.secret_key    = SECRET_KEY
+app.request_class = UploadRequest
+
+CORS_ORIGINS = [FRONTEND_URL, "http://localhost:3000"]
 
 CORS(
     app,
-    origins=[FRONTEND_URL, "http://localhost:3000"],
+    origins=CORS_ORIGINS,
     methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["Content-Type", "Authorization"],
     supports_credentials=True,
@@ -121,6 +160,17 @@ except Exception as _e:
     app.mongo_db  = None
     app.users_col = None
 
+# user_activities and the auth_utils log_* collections are written in batches off the request path
+activity = None
+if mongo_db is not None:
+    activity = ActivityLog(mongo_db,
+                           max_queue=int(os.getenv("ACTIVITY_QUEUE_MAX", "10000")),
+                           batch_size=int(os.getenv("ACTIVITY_BATCH_SIZE", "200")),
+                           flush_interval=float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "1.0")),
+                           block_timeout=float(os.getenv("ACTIVITY_BLOCK_MS", "50")) / 1e3)
+    activity_log.install(activity)
+    atexit.register(activity.close)
+
 # ============================================================
 # AUTH HELPERS
 # ============================================================
@@ -132,26 +182,32 @@ def revoke_token(token: str):
     _revoked_tokens.add(token)
 
 
+def authenticate(auth_header: str):
+    """Return (payload, None, None) or (None, error_message, status) for a Bearer header."""
+    if not auth_header.startswith("Bearer "):
+        return None, "Authorization header missing or malformed", 401
+    token = auth_header.split(" ", 1)[1]
+    if token in _revoked_tokens:
+        return None, "Token has been revoked", 401
+    if not JWT_SECRET:
+        return None, "JWT not configured on server", 500
+    try:
+        return jwt.decode(token, JWT_SECRET, algorithms=["HS256"]), None, None
+    except jwt.ExpiredSignatureError:
+        return None, "Token expired", 401
+    except jwt.InvalidTokenError as exc:
+        return None, f"Invalid token: {exc}", 401
+
+
 def require_auth(f):
     from functools import wraps
     @wraps(f)
     def decorated(*args, **kwargs):
-        auth_header = request.headers.get("Authorization", "")
-        if not auth_header.startswith("Bearer "):
-            return jsonify({"error": "Authorization header missing or malformed"}), 401
-        token = auth_header.split(" ", 1)[1]
-        if token in _revoked_tokens:
-            return jsonify({"error": "Token has been revoked"}), 401
-        if not JWT_SECRET:
-            return jsonify({"error": "JWT not configured on server"}), 500
-        try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
-            request.user_email = payload.get("email")
-            request.user_id    = payload.get("sub")
-        except jwt.ExpiredSignatureError:
-            return jsonify({"error": "Token expired"}), 401
-        except jwt.InvalidTokenError as exc:
-            return jsonify({"error": f"Invalid token: {exc}"}), 401
+        payload, err, status = authenticate(request.headers.get("Authorization", ""))
+        if err:
+            return jsonify({"error": err}), status
+        request.user_email = payload.get("email")
+        request.user_id    = payload.get("sub")
         return f(*args, **kwargs)
     return decorated
 
@@ -170,16 +226,14 @@ def issue_jwt(user_id, email: str) -> str:
     }, JWT_SECRET, algorithm="HS256")
 
 
-def log_activity(db, email: str, action_type: str, detail: str = ""):
+def log_activity(db, email: str, action_type: str, detail: str = "", metadata: dict = None):
+    """Queue a user_activities entry; the activity_log writer inserts it in a batch."""
     if db is None:
         return
-    try:
-        db["user_activities"].insert_one({
-            "email": email, "type": action_type,
-            "detail": detail, "created_at": datetime.now(timezone.utc),
-        })
-    except Exception:
-        pass
+    activity_log.submit(db, "user_activities", {
+        "email": email, "type": action_type, "detail": detail,
+        "metadata": metadata or {}, "created_at": datetime.now(timezone.utc),
+    })
 
 
 def serialize_doc(doc):
@@ -200,21 +254,94 @@ def serialize_doc(doc):
 # GEMINI HELPERS
 # ============================================================
 
-def _call_gemini(prompt: str, timeout: int = 30):
-    if not API_KEY:
-        return None
-    url = ("https://generativelanguage.googleapis.com/v1beta/models/"
-           f"gemini-2.5-flash:generateContent?key={API_KEY}")
+gemini = GeminiClient(
+    API_KEY,
+    base_url=os.getenv("GEMINI_BASE_URL", GEMINI_BASE_URL),
+    pool_size=int(os.getenv("GEMINI_POOL_SIZE", "10")),
+    async_pool_size=int(os.getenv("GEMINI_ASYNC_POOL_SIZE", "100")),
+    max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "2")),
+) if API_KEY else None
+if gemini is not None:
+    aio.on_shutdown(gemini.aclose)
+
+
+_llm_shared = None
+if mongo_db is not None and os.getenv("LLM_CACHE_SHARED", "1") == "1":
     try:
-        r = requests.post(url, json={"contents": [{"parts": [{"text": prompt}]}]}, timeout=timeout)
-        if not r.ok:
-            logger.error(f"Gemini {r.status_code}: {r.text[:200]}")
-            return None
-        cands = r.json().get("candidates", [])
-        return cands[0].get("content", {}).get("parts", [{}])[0].get("text") if cands else None
-    except Exception as exc:
-        logger.error(f"Gemini error: {exc}")
+        _llm_shared = MongoTier(mongo_db["llm_cache"], ttl=int(os.getenv("LLM_CACHE_SHARED_TTL", "86400")))
+    except Exception as _e:
+        logger.error(f"LLM cache shared tier disabled: {_e}")
+
+llm_cache = ResponseCache(
+    LRUTier(max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+            max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            ttl=int(os.getenv("LLM_CACHE_TTL", "3600"))),
+    shared=_llm_shared,
+)
+
+
+# Concurrent identical upstream calls share one in-flight request
+_SINGLE_FLIGHT = os.getenv("SINGLE_FLIGHT", "1") == "1"
+gemini_flight  = SingleFlight(_SINGLE_FLIGHT)
+scrape_flight  = SingleFlight(_SINGLE_FLIGHT)
+ddg_flight     = SingleFlight(_SINGLE_FLIGHT)
+
+
+def _cache_store(key: str, text, validate):
+    # `validate` (e.g. _clean_gemini_json) must not raise for the text to be cached
+    if text is not None:
+        try:
+            validate and validate(text)
+            llm_cache.set(key, text)
+        except Exception:
+            pass
+
+
+def _call_gemini(prompt: str, endpoint: str = "default", timeout: int = None,
+                 use_cache: bool = True, validate=None, generation_config: dict = None):
+    if gemini is None:
         return None
+    key = cache_key(gemini.model, prompt, generation_config)
+    if use_cache:
+        hit = llm_cache.get(key)
+        if hit is not None:
+            return hit
+    def fetch():
+        text = gemini.generate(prompt, endpoint=endpoint, timeout=timeout, generation_config=generation_config)
+        _cache_store(key, text, validate)
+        return text
+    return gemini_flight.do(key, fetch)
+
+
+async def _acall_gemini(prompt: str, endpoint: str = "default", timeout: int = None,
+                        use_cache: bool = True, validate=None, generation_config: dict = None):
+    if gemini is None:
+        return None
+    key = cache_key(gemini.model, prompt, generation_config)
+    if use_cache:
+        hit = llm_cache.get(key)
+        if hit is not None:
+            return hit
+    async def fetch():
+        text = await gemini.agenerate(prompt, endpoint=endpoint, timeout=timeout,
+                                      generation_config=generation_config)
+        _cache_store(key, text, validate)
+        return text
+    return await gemini_flight.ado(key, fetch)
+
+
+def llm_cache_allowed(cache_control: str, no_cache_flag) -> bool:
+    """Per-request opt-out: `Cache-Control: no-cache` header or a truthy `no_cache` field."""
+    if "no-cache" in (cache_control or "").lower():
+        return False
+    return str(no_cache_flag or "").lower() not in ("1", "true", "yes")
+
+
+def _use_llm_cache() -> bool:
+    return llm_cache_allowed(
+        request.headers.get("Cache-Control", ""),
+        request.values.get("no_cache") or (request.get_json(silent=True) or {}).get("no_cache"),
+    )
 
 
 def _clean_gemini_json(text: str):
@@ -224,23 +351,11 @@ def _clean_gemini_json(text: str):
     return json.loads(text)
 
 
-def extract_pdf_text(pdf_path: str) -> str:
-    text = ""
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for page in pdf.pages:
-                pt = page.extract_text()
-                if pt:
-                    text += pt + "\n"
-    except Exception as exc:
-        logger.error(f"PDF error: {exc}")
-    return text.strip()
-
-
-def get_gemini_resume_improvements(resume_text: str) -> dict:
+def get_gemini_resume_improvements(resume_text: str, use_cache: bool = True) -> dict:
     text = _call_gemini(
         'You are an expert resume reviewer. Respond ONLY with JSON: {"suggestions": "..."}\n'
-        f"Resume:\n{resume_text}"
+        f"Resume:\n{resume_text}",
+        endpoint="resume_improvements", use_cache=use_cache, validate=_clean_gemini_json,
     )
     if text is None:
         return {"error": "AI unavailable"}
@@ -250,29 +365,232 @@ def get_gemini_resume_improvements(resume_text: str) -> dict:
         return {"error": f"Parse error: {exc}"}
 
 
-def get_gemini_ats_score(resume_text: str, jd: str) -> dict:
-    text = _call_gemini(
-        "ATS evaluator. Return ONLY JSON: {match_score (int), summary (str), missing_keywords (list)}\n"
-        f"Resume:\n{resume_text}\nJob Description:\n{jd}"
-    )
-    if text is None:
-        return {"error": "AI unavailable"}
+ATS_LLM_SUMMARY = os.getenv("ATS_LLM_SUMMARY", "1") == "1"
+
+
+def _ats_summary_prompt(jd: str, result: dict) -> str:
+    return ("ATS reviewer. A resume was scored locally against the job description below.\n"
+            f"Match score: {result['match_score']}/100\n"
+            f"Matched keywords: {', '.join(result['matched_keywords'][:20]) or 'none'}\n"
+            f"Missing keywords: {', '.join(result['missing_keywords']) or 'none'}\n"
+            f"Job Description:\n{jd}\n\n"
+            'Write a 2-3 sentence summary of the fit for the candidate. Return ONLY JSON: {"summary": "..."}')
+
+
+def _with_summary(result: dict, text) -> dict:
     try:
-        return _clean_gemini_json(text)
-    except Exception as exc:
-        return {"error": f"Parse error: {exc}"}
+        summary = text and _clean_gemini_json(text).get("summary")
+    except Exception:
+        summary = None
+    return {**result, "summary": summary or ats_scorer.summary_text(result),
+            "summary_source": "gemini" if summary else "local"}
+
+
+def get_ats_score(resume_text: str, jd: str, use_cache: bool = True, llm_summary: bool = True) -> dict:
+    """match_score / missing_keywords from the local scorer; Gemini only writes the summary."""
+    result = ats_scorer.score(resume_text, jd)
+    text   = None
+    if llm_summary and ATS_LLM_SUMMARY:
+        text = _call_gemini(_ats_summary_prompt(jd, result), endpoint="ats_summary",
+                            use_cache=use_cache, validate=_clean_gemini_json)
+    return _with_summary(result, text)
+
+# ============================================================
+# RESUME FINGERPRINT CACHE
+# ============================================================
+resume_cache = ResumeCache(
+    mongo_db["resume_cache"] if mongo_db is not None else None,
+    max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=int(os.getenv("RESUME_CACHE_TTL", str(30 * 86400))),
+    user_max_bytes=int(os.getenv("RESUME_CACHE_USER_MAX_BYTES", str(2 * 1024 * 1024))),
+    user_max_entries=int(os.getenv("RESUME_CACHE_USER_MAX_ENTRIES", "20")),
+)
+
+
+def _parsed_resume(email: str, upload):
+    """(fingerprint, entry) for an uploaded resume; parses the PDF only on a cache miss."""
+    fp    = pdf_text.fingerprint(upload)
+    entry = resume_cache.get(email, fp)
+    if entry is None or "text" not in entry:
+        text  = extract_pdf_text(upload)
+        entry = {"text": text, "sections": normalize_sections(text)}
+        if text:
+            resume_cache.put(email, fp, entry)
+    return fp, entry
 
 # ============================================================
 # JOB CACHE
 # ============================================================
-_job_cache: dict = {}
-_JOB_TTL = 300
+job_cache = JobCache(
+    max_entries=int(os.getenv("JOB_CACHE_MAX_ENTRIES", "500")),
+    max_bytes=int(os.getenv("JOB_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    ttl=int(os.getenv("JOB_CACHE_TTL", "300")),
+    stale_ttl=int(os.getenv("JOB_CACHE_STALE_TTL", "3600")),
+    flight=scrape_flight,
+)
+
+# Indeed country per canonical location; unknown locations search India
+_JOB_COUNTRY = {"india": "india", "bengaluru": "india", "hyderabad": "india", "mumbai": "india",
+                "pune": "india", "chennai": "india", "delhi": "india", "gurugram": "india", "noida": "india",
+                "usa": "usa", "new york, ny": "usa", "san francisco, ca": "usa", "seattle, wa": "usa",
+                "united kingdom": "united kingdom", "london, uk": "united kingdom",
+                "canada": "canada", "toronto": "canada", "australia": "australia", "sydney": "australia",
+                "remote": "usa"}
+_LOCATION_ALIASES = {"bangalore": "bengaluru", "bengaluru, india": "bengaluru", "bangalore, india": "bengaluru",
+                     "bombay": "mumbai", "madras": "chennai", "new delhi": "delhi", "gurgaon": "gurugram",
+                     "us": "usa", "united states": "usa", "united states of america": "usa",
+                     "new york": "new york, ny", "nyc": "new york, ny", "san francisco": "san francisco, ca",
+                     "sf": "san francisco, ca", "seattle": "seattle, wa", "uk": "united kingdom",
+                     "london": "london, uk", "toronto, on": "toronto", "sydney, nsw": "sydney"}
+
+
+# /api/jobs bodies at least this large are gzipped for clients that accept it (0 = never)
+JOB_GZIP_MIN_BYTES = int(os.getenv("JOB_GZIP_MIN_BYTES", "1024"))
+# upper bound for num_jobs and page_size on /api/jobs and /api/jobs/stream
+JOB_MAX_RESULTS = int(os.getenv("JOB_MAX_RESULTS", "100"))
+
+# scraped concurrently, one jobspy call per site
+job_scraper = MultiSiteScraper(
+    [x.strip() for x in os.getenv("JOB_SITES", "indeed,linkedin,glassdoor").split(",") if x.strip()],
+    workers=int(os.getenv("JOB_SCRAPE_WORKERS", "16")),
+    timeout=float(os.getenv("JOB_SCRAPE_TIMEOUT", "60")))
+
+job_store = None
+if mongo_db is not None and os.getenv("JOB_STORE", "1") == "1":
+    try:
+        job_store = JobStore(mongo_db["job_postings"],
+                             fresh_age=int(os.getenv("JOB_STORE_FRESH_AGE", str(6 * 3600))),
+                             max_age=int(os.getenv("JOB_STORE_MAX_AGE", str(30 * 86400))))
+    except Exception as exc:
+        logger.warning(f"Job store disabled: {exc}")
+
+
+def _find_jobs(scrape_jobs, q: str, loc: str, country: str, wanted: int) -> dict:
+    """Local job_postings first; scrape every site only when they are too few or too old, then store
+    and merge. If every site fails but some postings are stored, they are returned marked partial
+    (not cached)."""
+    local, covered = job_store.lookup(q, loc, country, wanted) if job_store else ([], False)
+    if covered:
+        return {"wanted": wanted, "jobs": local}
+    try:
+        found = job_scraper.search(scrape_jobs, (q, loc, country), wanted).result(job_scraper.timeout)
+    except Exception as exc:
+        if not local: raise
+        logger.warning(f"Job scrape failed, serving {len(local)} stored postings: {exc}")
+        return {"wanted": wanted, "jobs": local, "partial": True}
+    return _merge_found(found, local, loc, country)
+
+
+def _merge_found(found: dict, local: list, loc: str, country: str) -> dict:
+    """Store freshly scraped jobs and append stored postings the scrape did not return."""
+    if job_store:
+        job_store.upsert(found["jobs"], loc, country)
+    seen = {dedupe_key(j) for j in found["jobs"]}
+    return {"wanted": found["wanted"], "jobs": found["jobs"] + [j for j in local if dedupe_key(j) not in seen]}
+
+
+def _covers(entry: dict, num_jobs: int) -> bool:
+    """A cached search answers any request for as many jobs as it asked for, or any size once it came back short."""
+    return entry["wanted"] >= num_jobs or len(entry["jobs"]) < entry["wanted"]
+
+
+def _cached_jobs(scrape_jobs, key, num_jobs: int):
+    """(entry, state) from job_cache, which holds one entry per canonical search and loads misses
+    through _find_jobs."""
+    def load(prev):
+        return _find_jobs(scrape_jobs, *key, max(num_jobs, prev["wanted"] if prev else 0))
+    return job_cache.get_or_load(key, load, keep=lambda e: bool(e["jobs"]) and not e.get("partial"),
+                                 covers=lambda e: _covers(e, num_jobs))
+
+
+def _job_count(raw, default: int) -> int:
+    """num_jobs / page_size clamped to 1..JOB_MAX_RESULTS; ValueError when not a number."""
+    return min(max(1, int(raw or default)), JOB_MAX_RESULTS)
+
+
+def _served_version(jobs: list, offset: int) -> str:
+    """Fingerprint of the jobs before `offset`, i.e. those a cursor's client has been sent already."""
+    ids = "\n".join(str(j.get("id") or j.get("job_url") or "") for j in jobs[:offset])
+    return hashlib.sha256(ids.encode()).hexdigest()[:16]
+
+
+def _jobs_cursor(query: str, location: str, num_jobs: int, offset: int, page_size: int, jobs: list) -> str:
+    """Cursor for jobs[offset:offset + page_size], valid while the cached result keeps jobs[:offset]
+    unchanged (a background refresh that reorders or replaces them invalidates it)."""
+    raw = json.dumps({"q": query, "l": location, "n": num_jobs, "o": offset, "p": page_size,
+                      "v": _served_version(jobs, offset)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _read_jobs_cursor(cursor: str):
+    """(query, location, num_jobs, offset, page_size, version); ValueError when malformed."""
+    try:
+        c = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return (str(c["q"]), str(c["l"]), _job_count(c["n"], 10), max(0, int(c["o"])),
+                _job_count(c["p"], 10), str(c["v"]))
+    except Exception as exc:
+        raise ValueError("invalid cursor") from exc
+
+
+def _job_search_key(query: str, location: str):
+    """(query, location, country) with case, whitespace and location spelling normalized."""
+    q   = " ".join(query.lower().split())
+    loc = re.sub(r"\s*,\s*", ", ", " ".join(location.lower().split())).strip(", ")
+    loc = _LOCATION_ALIASES.get(loc, loc) or "india"
+    return q, loc, _JOB_COUNTRY.get(loc, "india")
+
+
+def _prefetch_search(key, wanted: int) -> int:
+    """Warm one popular search: skip it if the cache already covers it, else load it (from
+    job_postings, scraping through the prefetch rate limiter only when needed) into the cache."""
+    cached, state = job_cache.get(key)
+    if state == "fresh" and cached["wanted"] >= wanted:
+        return len(cached["jobs"])
+    from jobspy import scrape_jobs
+
+    def limited(**kw):
+        job_prefetcher.limiter.wait()
+        return scrape_jobs(**kw)
+    entry = _find_jobs(limited, *key, max(wanted, cached["wanted"] if cached else 0))
+    if entry["jobs"] and not entry.get("partial"):
+        job_cache.set(key, entry)
+    return len(entry["jobs"])
+
+
+job_prefetcher = None
+# not in pdf_text's spawned workers, which re-import this file as __mp_main__ under `python app.py`
+if mongo_db is not None and os.getenv("JOB_PREFETCH", "0") == "1" and __name__ != "__mp_main__":
+    job_prefetcher = JobPrefetcher(
+        mongo_db, _prefetch_search, _job_search_key,
+        interval=int(os.getenv("JOB_PREFETCH_INTERVAL", "900")),
+        top_n=int(os.getenv("JOB_PREFETCH_TOP_N", "20")),
+        concurrency=int(os.getenv("JOB_PREFETCH_CONCURRENCY", "2")),
+        rate=float(os.getenv("JOB_PREFETCH_RATE", "0.2")))
+    job_prefetcher.start()
+    atexit.register(job_prefetcher.stop)
 
 # ============================================================
 # MULTI-AGENT SYSTEM
 # ============================================================
 multi_agent_workflow = None
 get_agent_by_name    = None   # filled below if Groq is available
+llm_route            = None   # async (query, legacy=False) -> leaf label; for benchmarks
+resolve_agent        = None   # async (query) -> (agent name, category code); streaming chat
+summarize_history    = None   # async (summary, messages) -> updated summary
+
+_HISTORY_SCALE = float(os.getenv("CHAT_HISTORY_BUDGET_SCALE", "1.0"))
+
+# Near-duplicate stateless questions ("what is RAG" / "explain RAG") reuse an agent's earlier answer
+chat_cache = SemanticCache(
+    max_entries=int(os.getenv("CHAT_SEMANTIC_CACHE_MAX_ENTRIES", "2048")),
+    threshold=float(os.getenv("CHAT_SEMANTIC_CACHE_THRESHOLD", "0.9")),
+    ttl=float(os.getenv("CHAT_SEMANTIC_CACHE_TTL", "86400")),
+) if os.getenv("CHAT_SEMANTIC_CACHE", "1") == "1" else None
+
+# Local intent classifier answers confident routing decisions without Groq
+intent_router = load_classifier() if os.getenv("CHAT_LOCAL_ROUTER", "1") == "1" else None
+if intent_router is not None and os.getenv("CHAT_LOCAL_ROUTER_THRESHOLD"):
+    intent_router.threshold = float(os.getenv("CHAT_LOCAL_ROUTER_THRESHOLD"))
 
 if GROQ_API_KEY:
     try:
@@ -283,40 +601,8 @@ if GROQ_API_KEY:
         from langchain_community.tools import DuckDuckGoSearchResults
 
         class MultiAgentState(TypedDict):
-            query: str; category: str; response: str
-            messages: list; current_agent: str; should_reroute: bool
-
-        def _parse_continuity(content: str, name: str = "Agent") -> dict:
-            content = re.sub(r"```json\s*", "", content)
-            content = re.sub(r"```\s*$", "", content).strip()
-            try:
-                if content.startswith("{"):
-                    end = content.find("}")
-                    if end != -1:
-                        try:
-                            p = json.loads(content[:end+1])
-                            remaining = content[end+1:].strip()
-                            should = p.get("should_handle", False)
-                            reason = p.get("reason", "")
-                            if should and remaining:
-                                return {"should_handle": True,  "response": remaining, "reason": reason}
-                            return {"should_handle": False, "response": None, "reason": reason}
-                        except json.JSONDecodeError:
-                            pass
-                m = re.search(r'\{\s*"should_handle"\s*:\s*(true|false)\s*,\s*"reason"\s*:\s*"([^"]+)"\s*\}',
-                              content, re.IGNORECASE)
-                if m:
-                    should = m.group(1).lower() == "true"
-                    remaining = content[m.end():].strip()
-                    if should and remaining:
-                        return {"should_handle": True, "response": remaining, "reason": m.group(2)}
-                    return {"should_handle": False, "response": None, "reason": m.group(2)}
-                if any(p in content.lower() for p in
-                       ['"should_handle": false', "cannot handle", "not my domain"]):
-                    return {"should_handle": False, "response": None, "reason": "Explicit rejection"}
-                return {"should_handle": False, "response": None, "reason": "No valid format"}
-            except Exception as exc:
-                return {"should_handle": False, "response": None, "reason": str(exc)}
+            query: str; category: str; response: str; route: str
+            messages: list; summary: dict; current_agent: str; should_reroute: bool
 
         _SYS = {
             "general":              ("You are PrepWise AI, a friendly career coach. Handle greetings, "
@@ -346,76 +632,242 @@ if GROQ_API_KEY:
         _job_m = ChatGroq(model="llama-3.3-70b-versatile", groq_api_key=GROQ_API_KEY, temperature=0.3)
         _ddg   = DuckDuckGoSearchResults(max_results=10)
 
+        async def _ddg_search(query: str):
+            return await ddg_flight.ado(" ".join(query.lower().split()), lambda: _ddg.ainvoke(query))
+
         _MODEL_MAP = {
             "general": _fast, "learning_resource": _smart, "tutorial": _smart,
             "interview_preparation": _fast, "resume_making": _smart, "job_search": _job_m,
         }
 
-        def _do_check(name: str, model, user_input: str, history: list) -> dict:
-            msgs = [SystemMessage(content=_SYS[name])]
-            for m in (history or [])[-20:]:
-                if m.get("role") == "user":      msgs.append(HumanMessage(content=m["content"]))
-                elif m.get("role") == "assistant": msgs.append(AIMessage(content=m["content"]))
-            msgs.append(HumanMessage(content=(
-                f"User Query: {user_input}\n\nDomain check:\n{_HINTS[name]}\n\n"
-                'Respond with JSON first: {"should_handle": true/false, "reason": "..."}\n'
-                "If true, write full response AFTER the JSON. If false, ONLY the JSON."
-            )))
-            return _parse_continuity(model.invoke(msgs).content.strip(), name)
+        def _check_messages(agent, user_input: str, history: list, summary: dict = None) -> list:
+            c = compact(history, agent.history_budget, summary)
+            msgs = [agent.system]
+            if c.summary:
+                msgs.append(SystemMessage(content=f"Summary of the earlier conversation:\n{c.summary}"))
+            for m in c.recent:
+                if m["role"] == "user": msgs.append(HumanMessage(content=m["content"]))
+                else:                   msgs.append(AIMessage(content=m["content"]))
+            msgs.append(HumanMessage(content=f"User Query: {user_input}{agent.check_suffix}"))
+            return msgs
+
+        async def _stream_check(agent, user_input: str, history: list, summary: dict = None):
+            """The continuity check, streamed: yields the accept/decline bool once, then answer deltas.
+
+            A decline stops generation as soon as the leading JSON says so; replies that are
+            not JSON-first are judged once complete, like the one-shot parser did.
+            """
+            parser, started = ContinuityParser(), False
+            chunks = agent.model.astream(_check_messages(agent, user_input, history, summary))
+            try:
+                async for chunk in chunks:
+                    out = parser.feed(chunk.content)
+                    if parser.should_handle is False:
+                        break
+                    if out:
+                        if not started:
+                            started = True
+                            yield True
+                        yield out
+            finally:
+                await chunks.aclose()
+            if started:
+                tail = parser.flush()
+                if tail:
+                    yield tail
+                return
+            r = parser.finish()
+            if not r["should_handle"]:
+                logger.info(f"{agent.name} declined: {r['reason']}")
+            yield r["should_handle"]
+            if r["should_handle"]:
+                yield r["response"]
+
+        async def _do_check(agent, user_input: str, history: list, summary: dict = None) -> dict:
+            deltas = _stream_check(agent, user_input, history, summary)
+            try:
+                if not await deltas.__anext__():
+                    return {"should_handle": False, "response": None}
+                return {"should_handle": True, "response": "".join([d async for d in deltas]).strip()}
+            finally:
+                await deltas.aclose()
+
+        _JOB_FORMAT_PROMPT = ChatPromptTemplate.from_template(
+            "Format these job results with titles, companies, links:\n\n{results}")
 
         class _Agent:
+            """Built once at startup; everything request-independent is precomputed here."""
+            __slots__ = ("name", "model", "system", "check_suffix", "format_chain", "history_budget")
+
             def __init__(self, name, model):
-                self.name  = name
-                self.model = model
-            def check_and_respond(self, user_input, history):
-                result = _do_check(self.name, self.model, user_input, history)
-                if self.name == "job_search" and result["should_handle"]:
+                self.name         = name
+                self.model        = model
+                self.system       = SystemMessage(content=_SYS[name])
+                self.check_suffix = (
+                    f"\n\nDomain check:\n{_HINTS[name]}\n\n"
+                    'Respond with JSON first: {"should_handle": true/false, "reason": "..."}\n'
+                    "If true, write full response AFTER the JSON. If false, ONLY the JSON."
+                )
+                self.format_chain = _JOB_FORMAT_PROMPT | model if name == "job_search" else None
+                self.history_budget = budget_for(getattr(model, "model_name", ""), _HISTORY_SCALE)
+
+            def _cacheable(self, history, summary) -> bool:
+                """Stateless turns only; live job results are never cached."""
+                return chat_cache is not None and self.format_chain is None and not history and not summary
+
+            async def check_and_respond(self, user_input, history, summary=None):
+                cacheable = self._cacheable(history, summary)
+                if cacheable:
+                    hit = chat_cache.get(self.name, user_input)
+                    if hit is not None:
+                        return {"should_handle": True, "response": hit}
+                t0     = time.perf_counter()
+                result = await _do_check(self, user_input, history, summary)
+                if cacheable and result["should_handle"]:
+                    chat_cache.put(self.name, user_input, result["response"], time.perf_counter() - t0)
+                if self.format_chain is not None and result["should_handle"]:
                     try:
-                        sr = _ddg.invoke(user_input)
-                        chain = (ChatPromptTemplate.from_template(
-                            "Format these job results with titles, companies, links:\n\n{results}"
-                        ) | self.model)
-                        result["response"] = chain.invoke({"results": sr}).content
+                        sr = await _ddg_search(user_input)
+                        result["response"] = (await self.format_chain.ainvoke({"results": sr})).content
                     except Exception:
                         result["response"] = ("I can help find jobs! Please provide a specific "
                                               "role and location.")
                 return result
 
+            async def stream(self, user_input, history, summary=None):
+                """check_and_respond as a stream: the accept/decline bool, then response deltas."""
+                cacheable = self._cacheable(history, summary)
+                hit = chat_cache.get(self.name, user_input) if cacheable else None
+                if hit is not None:
+                    yield True
+                    yield hit
+                    return
+                t0     = time.perf_counter()
+                deltas = _stream_check(self, user_input, history, summary)
+                try:
+                    handled = await deltas.__anext__()
+                    yield handled
+                    if not handled:
+                        return
+                    if self.format_chain is None:
+                        parts = []
+                        async for d in deltas:
+                            parts.append(d)
+                            yield d
+                        if cacheable:
+                            chat_cache.put(self.name, user_input, "".join(parts).strip(),
+                                           time.perf_counter() - t0)
+                        return
+                finally:
+                    await deltas.aclose()
+                sent = False
+                try:
+                    sr = await _ddg_search(user_input)
+                    async for chunk in self.format_chain.astream({"results": sr}):
+                        if chunk.content:
+                            sent = True
+                            yield chunk.content
+                except Exception:
+                    if sent:
+                        raise
+                    yield "I can help find jobs! Please provide a specific role and location."
+
+        _SUMMARY_CHAIN = ChatPromptTemplate.from_template(
+            "Update the running summary of a career-coaching chat. Keep what the user said about "
+            "themselves (role, experience, goals, target companies), decisions made and open "
+            "questions; drop pleasantries and long code. At most 150 words.\n\n"
+            "Current summary:\n{summary}\n\nNew messages:\n{messages}\n\nUpdated summary:"
+        ) | _fast
+
+        async def summarize_history(summary: str, messages: list) -> str:
+            text = "\n".join(f"{m['role']}: {clip(m['content'], 300)}" for m in messages)
+            r = await _SUMMARY_CHAIN.ainvoke({"summary": summary or "(none)", "messages": text})
+            return r.content.strip()
+
+        _AGENTS = MappingProxyType({name: _Agent(name, model) for name, model in _MODEL_MAP.items()})
+
         def get_agent_by_name(name: str):
-            if name not in _MODEL_MAP:
-                return None
-            return _Agent(name, _MODEL_MAP[name])
+            return _AGENTS.get(name)
+
+        # Router label -> (graph node, frontend category code, agent)
+        _LEAVES = {
+            "general":             ("general_agent",       "0", "general"),
+            "tutorial":            ("tutorial_agent",      "1", "tutorial"),
+            "learning_resource":   ("ask_query_bot",       "1", "learning_resource"),
+            "resume_making":       ("handle_resume",       "2", "resume_making"),
+            "interview_questions": ("interview_questions", "3", "interview_preparation"),
+            "mock_interview":      ("mock_interview",      "3", "interview_preparation"),
+            "job_search":          ("job_search",          "4", "job_search"),
+        }
+        _LEAF_RE = re.compile(r"\b(" + "|".join(_LEAVES) + r")\b")
+        _SINGLE_CALL_ROUTER = os.getenv("CHAT_SINGLE_CALL_ROUTER", "1") == "1"
 
         # Nodes
-        def _categorize(state):
-            r = (ChatPromptTemplate.from_template(
-                "Categorize (NUMBER only):\n0:greeting/general\n1:learning/AI\n"
-                "2:resume\n3:interview\n4:job search\nQuery:{query}\nCategory:"
-            ) | _fast).invoke({"query": state["query"]})
+        _ROUTE_CHAIN = ChatPromptTemplate.from_template(
+            "Pick the handler for this query. Reply with ONE label only:\n"
+            "general: greetings, small talk, what PrepWise can do\n"
+            "tutorial: write a tutorial / blog post / step-by-step guide\n"
+            "learning_resource: AI/ML or coding questions, explain a concept\n"
+            "resume_making: resume/CV writing, ATS tips\n"
+            "interview_questions: interview questions to practise, role preparation\n"
+            "mock_interview: conduct a mock interview\n"
+            "job_search: find jobs, openings, job market\n"
+            "Query:{query}\nLabel:"
+        ) | _fast
+        _CATEGORIZE_CHAIN = ChatPromptTemplate.from_template(
+            "Categorize (NUMBER only):\n0:greeting/general\n1:learning/AI\n"
+            "2:resume\n3:interview\n4:job search\nQuery:{query}\nCategory:"
+        ) | _fast
+        _SUB_LEARN_CHAIN = ChatPromptTemplate.from_template(
+            "One word — Tutorial or Question:\nQuery:{query}\nSub-category:"
+        ) | _fast
+        _SUB_INTERVIEW_CHAIN = ChatPromptTemplate.from_template(
+            "One word — Mock or Question:\nQuery:{query}\nSub-category:"
+        ) | _fast
+
+        async def _llm_leaf(query: str):
+            r = await _ROUTE_CHAIN.ainvoke({"query": query})
+            m = _LEAF_RE.search(r.content.strip().lower())
+            return m.group(1) if m else None
+
+        async def _route(state):
+            """Local classifier, else one LLM round-trip (CHAT_SINGLE_CALL_ROUTER); no leaf falls back to
+            the _categorize chain."""
+            leaf = intent_router.route(state["query"]) if intent_router else None
+            if leaf is None and _SINGLE_CALL_ROUTER:
+                leaf = await _llm_leaf(state["query"])
+            if leaf is None:
+                return {"route": ""}
+            return {"route": leaf, "category": _LEAVES[leaf][1]}
+
+        async def _categorize(state):
+            r = await _CATEGORIZE_CHAIN.ainvoke({"query": state["query"]})
             return {"category": r.content.strip()}
 
-        def _sub_learn(state):
-            r = (ChatPromptTemplate.from_template(
-                "One word — Tutorial or Question:\nQuery:{query}\nSub-category:"
-            ) | _fast).invoke({"query": state["query"]})
+        async def _sub_learn(state):
+            r = await _SUB_LEARN_CHAIN.ainvoke({"query": state["query"]})
             return {"category": r.content.strip()}
 
-        def _sub_interview(state):
-            r = (ChatPromptTemplate.from_template(
-                "One word — Mock or Question:\nQuery:{query}\nSub-category:"
-            ) | _fast).invoke({"query": state["query"]})
+        async def _sub_interview(state):
+            r = await _SUB_INTERVIEW_CHAIN.ainvoke({"query": state["query"]})
             return {"category": r.content.strip()}
 
         def _make_node(agent_name):
-            def node(state):
-                result = _Agent(agent_name, _MODEL_MAP[agent_name]).check_and_respond(
-                    state["query"], state.get("messages", [])
+            agent = _AGENTS[agent_name]
+
+            async def node(state):
+                result = await agent.check_and_respond(
+                    state["query"], state.get("messages", []), state.get("summary")
                 )
                 return {"response": result.get("response") or "Please try rephrasing.",
                         "current_agent": agent_name, "should_reroute": not result["should_handle"]}
             node.__name__ = agent_name + "_node"
             return node
 
+        def _route_leaf(state):
+            leaf = state.get("route")
+            return _LEAVES[leaf][0] if leaf in _LEAVES else "categorize"
+
         def _route_main(state):
             c = state["category"]
             if "0" in c: return "general_agent"
@@ -431,7 +883,31 @@ if GROQ_API_KEY:
         def _route_interview(state):
             return "mock_interview" if "mock" in state["category"].lower() else "interview_questions"
 
+        _NODE_LEAF = {node: leaf for leaf, (node, _, _) in _LEAVES.items()}
+
+        async def llm_route(query: str, legacy: bool = False):
+            if not legacy:
+                return await _llm_leaf(query)
+            st = {"query": query}
+            st.update(await _categorize(st))
+            nxt = _route_main(st)
+            if nxt == "handle_learning":
+                st.update(await _sub_learn(st)); nxt = _route_learn(st)
+            elif nxt == "handle_interview":
+                st.update(await _sub_interview(st)); nxt = _route_interview(st)
+            return _NODE_LEAF[nxt]
+
+        async def resolve_agent(query: str):
+            """The graph's routing decision without running the agent (for streaming)."""
+            leaf = intent_router.route(query) if intent_router else None
+            if leaf is None and _SINGLE_CALL_ROUTER:
+                leaf = await _llm_leaf(query)
+            if leaf is None:
+                leaf = await llm_route(query, legacy=True)
+            return _LEAVES[leaf][2], _LEAVES[leaf][1]
+
         wf = StateGraph(MultiAgentState)
+        wf.add_node("route",              _route)
         wf.add_node("categorize",         _categorize)
         wf.add_node("general_agent",      _make_node("general"))
         wf.add_node("handle_learning",    _sub_learn)
@@ -443,7 +919,9 @@ if GROQ_API_KEY:
         wf.add_node("interview_questions",_make_node("interview_preparation"))
         wf.add_node("mock_interview",     _make_node("interview_preparation"))
 
-        wf.add_edge(START, "categorize")
+        wf.add_edge(START, "route")
+        wf.add_conditional_edges("route", _route_leaf,
+                                 {n: n for n in {"categorize", *(v[0] for v in _LEAVES.values())}})
         wf.add_conditional_edges("categorize", _route_main, {
             "general_agent":"general_agent", "handle_learning":"handle_learning",
             "handle_resume":"handle_resume", "handle_interview":"handle_interview",
@@ -476,6 +954,29 @@ def healthz():
     except Exception as exc:
         return jsonify({"status": "degraded", "error": str(exc)}), 200
 
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return jsonify({
+        "gemini":    gemini.stats() if gemini else None,
+        "llm_cache": llm_cache.stats(),
+        "router":    intent_router.stats() if intent_router else None,
+        "chat_stream": {"ttft": chat_ttft.stats(), "duration": chat_duration.stats()},
+        "sticky":    sticky_stats.stats(),
+        "history":   history_store.stats(),
+        "semantic_cache": chat_cache.stats() if chat_cache else None,
+        "pdf":       pdf_text.stats(),
+        "resume_cache": resume_cache.stats(),
+        "tasks":     task_queue.stats(),
+        "activity_log": activity.stats() if activity else None,
+        "job_cache": job_cache.stats(),
+        "job_scraper": job_scraper.stats(),
+        "job_store": job_store.stats() if job_store else None,
+        "job_prefetch": job_prefetcher.stats() if job_prefetcher else None,
+        "single_flight": {"gemini": gemini_flight.stats(), "scrape": scrape_flight.stats(),
+                          "ddg": ddg_flight.stats()},
+    }), 200
+
 # ============================================================
 # ROUTES — GOOGLE OAUTH
 # ============================================================
@@ -490,6 +991,26 @@ def google_login():
     return redirect(f"{GOOGLE_AUTH_URL}?{urlencode(params)}")
 
 
+async def _google_profile(code: str):
+    """Exchange an OAuth code for the Google profile. Returns (info, error_code)."""
+    async with aio.http().post(GOOGLE_TOKEN_URL, data={
+        "code": code, "client_id": GOOGLE_CLIENT_ID,
+        "client_secret": GOOGLE_CLIENT_SECRET,
+        "redirect_uri": GOOGLE_REDIRECT_URI, "grant_type": "authorization_code",
+    }, timeout=aio.timeout(15)) as tr:
+        if tr.status != 200:
+            return None, "token_exchange_failed"
+        access_token = (await tr.json(content_type=None)).get("access_token")
+    if not access_token:
+        return None, "no_access_token"
+
+    async with aio.http().get(GOOGLE_USERINFO_URL, headers={"Authorization": f"Bearer {access_token}"},
+                              timeout=aio.timeout(10)) as ur:
+        if ur.status != 200:
+            return None, "user_info_failed"
+        return await ur.json(content_type=None), None
+
+
 @app.route("/auth/google/callback", methods=["GET"])
 def google_callback():
     code  = request.args.get("code")
@@ -500,24 +1021,10 @@ def google_callback():
         return redirect(f"{FRONTEND_URL}/login?error=no_code")
 
     try:
-        tr = requests.post(GOOGLE_TOKEN_URL, data={
-            "code": code, "client_id": GOOGLE_CLIENT_ID,
-            "client_secret": GOOGLE_CLIENT_SECRET,
-            "redirect_uri": GOOGLE_REDIRECT_URI, "grant_type": "authorization_code",
-        }, timeout=15)
-        if tr.status_code != 200:
-            return redirect(f"{FRONTEND_URL}/login?error=token_exchange_failed")
-
-        access_token = tr.json().get("access_token")
-        if not access_token:
-            return redirect(f"{FRONTEND_URL}/login?error=no_access_token")
-
-        ur = requests.get(GOOGLE_USERINFO_URL,
-                          headers={"Authorization": f"Bearer {access_token}"}, timeout=10)
-        if ur.status_code != 200:
-            return redirect(f"{FRONTEND_URL}/login?error=user_info_failed")
-
-        info  = ur.json()
+        info, err = aio.run(_google_profile(code))
+        if err:
+            return redirect(f"{FRONTEND_URL}/login?error={err}")
+
         email = info.get("email")
         logger.info(f"Google OAuth: {email}")
 
@@ -556,7 +1063,7 @@ def google_callback():
         # FIX: query param (not # hash fragment) — Login.jsx reads ?session_token=
         return redirect(f"{FRONTEND_URL}/login?session_token={token}")
 
-    except requests.RequestException as exc:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
         logger.error(f"OAuth HTTP: {exc}")
         return redirect(f"{FRONTEND_URL}/login?error=oauth_request_failed")
     except Exception as exc:
@@ -740,49 +1247,314 @@ def update_chat_session(session_id):
 # ROUTES — MULTI-AGENT CHAT
 # ============================================================
 
-@app.route("/multi-agent/chat", methods=["POST"])
-def multi_agent_chat():
+chat_ttft     = LatencyStats()   # request start -> first streamed token
+chat_duration = LatencyStats()   # request start -> done event
+
+# Speculative routing: with a sticky current_agent, route the query while that agent's
+# continuity check runs, so a decline does not pay for the router afterwards.
+_SPECULATE             = os.getenv("CHAT_SPECULATIVE_ROUTING", "0") == "1"
+_SPECULATE_MIN_DECLINE = float(os.getenv("CHAT_SPECULATE_MIN_DECLINE", "0.2"))
+_SPECULATE_DELAY       = float(os.getenv("CHAT_SPECULATE_DELAY_MS", "0")) / 1e3
+
+
+class StickyStats:
+    """Sticky-agent accept/decline counts (all turns) and speculative-routing outcomes."""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._lock        = threading.Lock()
+        self._window      = window
+        self._min_samples = min_samples
+        self._recent      = {}   # agent -> deque of 1 (declined) / 0 (accepted)
+        self._totals      = {}   # agent -> [accepts, declines]
+        self._spec = {"launched": 0, "skipped": 0, "used": 0, "wasted": 0, "cancelled_in_delay": 0}
+        self.head_start = LatencyStats()   # router progress already made when the sticky agent declined
+
+    def record(self, agent: str, accepted: bool):
+        with self._lock:
+            self._recent.setdefault(agent, deque(maxlen=self._window)).append(0 if accepted else 1)
+            self._totals.setdefault(agent, [0, 0])[0 if accepted else 1] += 1
+
+    def decline_rate(self, agent: str):
+        """Recent decline rate, or None until enough turns have been seen."""
+        with self._lock:
+            recent = self._recent.get(agent)
+            if not recent or len(recent) < self._min_samples:
+                return None
+            return sum(recent) / len(recent)
+
+    def count(self, outcome: str):
+        with self._lock:
+            self._spec[outcome] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            agents = {a: {"accepts": t[0], "declines": t[1],
+                          "recent_decline_rate": round(sum(self._recent[a]) / len(self._recent[a]), 4)}
+                      for a, t in self._totals.items()}
+            spec = dict(self._spec)
+        return {"agents": agents, "speculation": {**spec, "enabled": _SPECULATE,
+                                                  "head_start": self.head_start.stats()}}
+
+
+sticky_stats = StickyStats()
+
+
+class _SpeculativeRoute:
+    """resolve_agent(query) running alongside a sticky check; settle with cancel() or result()."""
+
+    def __init__(self, query: str):
+        self.started = self.finished = None
+        self.task    = asyncio.ensure_future(self._run(query))
+
+    async def _run(self, query):
+        if _SPECULATE_DELAY:
+            await asyncio.sleep(_SPECULATE_DELAY)
+        self.started = time.perf_counter()
+        try:
+            return await resolve_agent(query)
+        finally:
+            self.finished = time.perf_counter()
+
+    def cancel(self):
+        """The sticky agent kept the turn (or failed): drop the route."""
+        if self.task.cancel() or self.task.done():
+            sticky_stats.count("wasted" if self.started else "cancelled_in_delay")
+
+    async def result(self):
+        """The sticky agent declined: the route is (partly) done already."""
+        now = time.perf_counter()
+        sticky_stats.count("used")
+        if self.started:
+            sticky_stats.head_start.record((self.finished or now) - self.started)
+        return await self.task
+
+
+def _speculate(agent_name: str, query: str):
+    """A _SpeculativeRoute if enabled and the agent declines often enough to be worth it, else None."""
+    if not _SPECULATE or resolve_agent is None:
+        return None
+    rate = sticky_stats.decline_rate(agent_name)
+    if rate is not None and rate < _SPECULATE_MIN_DECLINE:
+        sticky_stats.count("skipped")
+        return None
+    sticky_stats.count("launched")
+    return _SpeculativeRoute(query)
+
+
+def _chat_unavailable(query: str):
+    """(payload, status) if a chat turn cannot run, else None."""
     if not GROQ_API_KEY:
-        return jsonify({"error": "Multi-agent chat not configured. GROQ_API_KEY is missing."}), 503
+        return {"error": "Multi-agent chat not configured. GROQ_API_KEY is missing."}, 503
     if multi_agent_workflow is None:
-        return jsonify({"error": "Multi-agent workflow failed to initialize."}), 503
+        return {"error": "Multi-agent workflow failed to initialize."}, 503
+    if not query:
+        return {"error": "Query is required"}, 400
+    return None
+
+
+def optional_email(auth_header: str):
+    payload, _, _ = authenticate(auth_header or "")
+    return payload.get("email") if payload else None
+
+
+async def _persist_turn(email: str, session_id: str, query: str, response: str):
+    """Append the turn to the user's chat_sessions document when signed in with a session_id."""
+    if mongo_db is None or not email or not session_id:
+        return
+    for role, content in (("user", query), ("assistant", response)):
+        await asyncio.to_thread(auth_utils.update_chat_session, mongo_db, email, session_id, content, role)
+
 
-    data   = request.get_json() or {}
+history_store = SummaryStore(mongo_db)
+_folds = {}   # conversation key -> running summary update
+
+
+async def _load_summary(msgs: list, email: str, session_id: str):
+    """(store key, rolling summary or None) for this conversation."""
+    key = history_store.key(msgs, session_id, email)
+    if not msgs:
+        return key, None
+    return key, await asyncio.to_thread(history_store.get, key, email, session_id)
+
+
+def _schedule_fold(key: str, msgs: list, summary: dict, agent_name: str, email: str, session_id: str):
+    """Fold messages that fell out of the answering agent's budget into the summary, in the background."""
+    agent = get_agent_by_name(agent_name) if (get_agent_by_name and agent_name) else None
+    if summarize_history is None or agent is None or key in _folds:
+        return
+    c = compact(msgs, agent.history_budget, summary)
+    if not c.fold:
+        return
+
+    async def fold():
+        try:
+            text = await summarize_history(c.summary, c.fold)
+            await asyncio.to_thread(history_store.put, key,
+                                    {"upto": c.fold_upto, "digest": c.fold_digest, "text": text},
+                                    email, session_id)
+        except Exception as exc:
+            history_store.fold_failed()
+            logger.warning(f"History fold failed: {exc}")
+        finally:
+            _folds.pop(key, None)
+    _folds[key] = asyncio.ensure_future(fold())
+
+
+async def _chat_reply(data: dict, email: str = None):
+    """One /multi-agent/chat turn. Returns (payload, status)."""
     query  = (data.get("query") or "").strip()
     msgs   = data.get("messages", [])
     cur_ag = data.get("current_agent") or ""
 
-    if not query:
-        return jsonify({"error": "Query is required"}), 400
+    err = _chat_unavailable(query)
+    if err:
+        return err
 
     logger.info(f"Chat: '{query[:60]}' | agent='{cur_ag}'")
 
+    sid, spec = data.get("session_id"), None
     try:
+        hkey, summary = await _load_summary(msgs, email, sid)
         if cur_ag and get_agent_by_name:
             agent = get_agent_by_name(cur_ag)
             if agent:
-                result = agent.check_and_respond(query, msgs)
+                spec   = _speculate(cur_ag, query)
+                result = await agent.check_and_respond(query, msgs, summary)
+                sticky_stats.record(cur_ag, result["should_handle"])
                 if result["should_handle"]:
-                    return jsonify({"query": query, "response": result["response"],
-                                    "current_agent": cur_ag, "should_continue": True,
-                                    "status": "success"}), 200
+                    _schedule_fold(hkey, msgs, summary, cur_ag, email, sid)
+                    await _persist_turn(email, sid, query, result["response"])
+                    return {"query": query, "response": result["response"],
+                            "current_agent": cur_ag, "should_continue": True,
+                            "status": "success"}, 200
                 logger.info(f"Agent '{cur_ag}' declined — rerouting")
 
-        r = multi_agent_workflow.invoke({
-            "query": query, "messages": msgs, "current_agent": cur_ag,
-            "category": "", "response": "", "should_reroute": False,
-        })
-        return jsonify({
+        if spec is not None:
+            name, category = await spec.result()
+            spec   = None
+            result = await get_agent_by_name(name).check_and_respond(query, msgs, summary)
+            r = {"category": category, "response": result["response"], "current_agent": name}
+        else:
+            r = await multi_agent_workflow.ainvoke({
+                "query": query, "messages": msgs, "summary": summary, "current_agent": cur_ag,
+                "category": "", "route": "", "response": "", "should_reroute": False,
+            })
+        reply = r.get("response") or "Please try rephrasing."
+        _schedule_fold(hkey, msgs, summary, r.get("current_agent"), email, sid)
+        await _persist_turn(email, sid, query, reply)
+        return {
             "query":    query,
             "category": r.get("category", ""),
-            "response": r.get("response") or "Please try rephrasing.",
+            "response": reply,
             "current_agent":  r.get("current_agent", "unknown"),
             "should_continue": True, "status": "success",
-        }), 200
+        }, 200
+
+    except Exception as exc:
+        logger.error(f"Chat: {exc}", exc_info=True)
+        return {"error": f"Error: {exc}"}, 500
+    finally:
+        if spec is not None:
+            spec.cancel()
+
+
+async def _chat_events(data: dict, email: str = None):
+    """_chat_reply as (event, payload) pairs: route, token..., then done (same fields) or error."""
+    t0     = time.perf_counter()
+    query  = (data.get("query") or "").strip()
+    msgs   = data.get("messages", [])
+    cur_ag = data.get("current_agent") or ""
+    sid    = data.get("session_id")
+    parts, agent_name, category, summary = [], "", "", None
+
+    def route(name, source):
+        return "route", {"current_agent": name, "category": category, "source": source}
+
+    async def relay(agent, sticky=False):
+        """Stream the agent's answer into `parts`; a sticky agent is announced once it accepts."""
+        stream = agent.stream(query, msgs, summary)
+        try:
+            if not await stream.__anext__():
+                return
+            if sticky:
+                yield route(agent.name, "sticky")
+            async for delta in stream:
+                if not parts:
+                    chat_ttft.record(time.perf_counter() - t0)
+                parts.append(delta)
+                yield "token", {"delta": delta}
+        finally:
+            await stream.aclose()
+
+    spec = None
+    try:
+        hkey, summary = await _load_summary(msgs, email, sid)
+        agent = get_agent_by_name(cur_ag) if cur_ag else None
+        if agent:
+            spec = _speculate(cur_ag, query)
+            async for ev in relay(agent, sticky=True):
+                if ev[0] == "route" and spec is not None:
+                    spec.cancel()
+                    spec = None
+                yield ev
+            sticky_stats.record(cur_ag, bool(parts))
+            if parts:
+                agent_name = cur_ag
+            else:
+                logger.info(f"Agent '{cur_ag}' declined — rerouting")
+        if not agent_name:
+            if spec is not None:
+                agent_name, category = await spec.result()
+                spec = None
+            else:
+                agent_name, category = await resolve_agent(query)
+            yield route(agent_name, "router")
+            async for ev in relay(get_agent_by_name(agent_name)):
+                yield ev
+
+        reply = "".join(parts) or "Please try rephrasing."
+        _schedule_fold(hkey, msgs, summary, agent_name, email, sid)
+        await _persist_turn(email, sid, query, reply)
+        chat_duration.record(time.perf_counter() - t0)
+        yield "done", {"query": query, "category": category, "response": reply,
+                       "current_agent": agent_name, "should_continue": True, "status": "success"}
 
     except Exception as exc:
-        import traceback; traceback.print_exc()
-        return jsonify({"error": f"Error: {exc}"}), 500
+        logger.error(f"Chat stream: {exc}", exc_info=True)
+        yield "error", {"error": f"Error: {exc}"}
+    finally:
+        if spec is not None:
+            spec.cancel()
+
+
+def sse(event: str, payload) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.route("/multi-agent/chat", methods=["POST"])
+def multi_agent_chat():
+    body, status = aio.run(_chat_reply(request.get_json() or {},
+                                       optional_email(request.headers.get("Authorization"))))
+    return jsonify(body), status
+
+
+@app.route("/multi-agent/chat/stream", methods=["POST"])
+def multi_agent_chat_stream():
+    """Server-Sent Events variant of /multi-agent/chat."""
+    data = request.get_json() or {}
+    err  = _chat_unavailable((data.get("query") or "").strip())
+    if err:
+        return jsonify(err[0]), err[1]
+    events = aio.iterate(_chat_events(data, optional_email(request.headers.get("Authorization"))))
+
+    def body():
+        try:
+            for event, payload in events:
+                yield sse(event, payload)
+        finally:
+            events.close()
+    return Response(body(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 # ============================================================
 # ROUTES — RESUME
@@ -794,34 +1566,42 @@ def improve_resume():
     if "file" not in request.files:
         return jsonify({"error": "Missing resume file"}), 400
     f = request.files["file"]
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        f.save(tmp.name); p = tmp.name
-    try:
-        result = get_gemini_resume_improvements(extract_pdf_text(p))
+    fp, entry = _parsed_resume(request.user_email, f)
+    use_cache = _use_llm_cache()
+    result    = use_cache and entry.get("improvements")
+    if not result:
+        result = get_gemini_resume_improvements(entry["text"], use_cache=use_cache)
         if "error" in result: return jsonify(result), 500
-        if mongo_db: log_activity(mongo_db, request.user_email, "resume_builder", f"Improve: {f.filename}")
-        return jsonify(result), 200
-    finally:
-        os.path.exists(p) and os.remove(p)
+        if entry["text"]: resume_cache.put(request.user_email, fp, {**entry, "improvements": result})
+    log_activity(mongo_db, request.user_email, "resume_builder", f"Improve: {f.filename}")
+    return jsonify(result), 200
 
 
-@app.route("/generate-resume", methods=["POST"])
-@require_auth
-def generate_resume():
-    if not API_KEY: return jsonify({"error": "Gemini not configured"}), 500
-    data = request.get_json() or {}
+async def _generate_resume_reply(data: dict, email: str, use_cache: bool = True):
+    if not API_KEY: return {"error": "Gemini not configured"}, 500
     jd   = data.get("jobDescription")
     tmpl = data.get("template", "modern")
     ud   = data.get("userData", {})
-    if not jd: return jsonify({"error": "Job description required"}), 400
-    text = _call_gemini(
+    if not jd: return {"error": "Job description required"}, 400
+    text = await _acall_gemini(
         f"Expert ATS resume writer.\n\nJD:\n{jd}\n\nUser Data:\n{json.dumps(ud,indent=2)}\n\n"
         "Generate ATS-optimized resume with action verbs and JD keywords. 1 page. ONLY resume text.",
-        timeout=45,
+        endpoint="generate_resume", use_cache=use_cache,
     )
-    if text is None: return jsonify({"error": "Failed to generate resume"}), 500
-    if mongo_db: log_activity(mongo_db, request.user_email, "resume_builder", f"Generate ({tmpl})")
-    return jsonify({"resume": text}), 200
+    if text is None: return {"error": "Failed to generate resume"}, 500
+    if mongo_db is not None:
+        log_activity(mongo_db, email, "resume_builder", f"Generate ({tmpl})")
+    return {"resume": text}, 200
+
+
+@app.route("/generate-resume", methods=["POST"])
+@require_auth
+def generate_resume():
+    data = request.get_json() or {}
+    if _prefers_async():
+        return _submit_task("generate_resume", data)
+    body, status = aio.run(_generate_resume_reply(data, request.user_email, _use_llm_cache()))
+    return jsonify(body), status
 
 
 @app.route("/evaluate-resume", methods=["POST"])
@@ -831,16 +1611,101 @@ def evaluate_resume():
     f  = request.files["file"]
     jd = request.form.get("job_description")
     if not jd: return jsonify({"error": "Missing job description"}), 400
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-        f.save(tmp.name); p = tmp.name
+    fp, entry = _parsed_resume(request.user_email, f)
+    if not entry["text"]: return jsonify({"error": "Could not extract text from the resume PDF"}), 422
+    use_cache   = _use_llm_cache()
+    llm_summary = request.form.get("summary", "1").lower() not in ("0", "false", "no")
+    ats, key    = entry.get("ats", {}), jd_key(jd) + (":llm" if llm_summary else "")
+    result      = use_cache and ats.get(key)
+    if not result:
+        result = get_ats_score(entry["text"], jd, use_cache=use_cache, llm_summary=llm_summary)
+        resume_cache.put(request.user_email, fp, {**entry, "ats": {**ats, key: result}})
+    log_activity(mongo_db, request.user_email, "resume_evaluator",
+                 f"Score {result.get('match_score','?')} — {f.filename}")
+    return jsonify(result), 200
+
+
+ATS_BATCH_CONCURRENCY = int(os.getenv("ATS_BATCH_CONCURRENCY", "4"))
+ATS_BATCH_MAX_PAIRS   = int(os.getenv("ATS_BATCH_MAX_PAIRS", "50"))
+
+
+async def _ats_batch_events(resumes: list, jds: list, email: str, use_cache: bool = True,
+                            llm_summary: bool = True):
+    """resumes: [{"index", "filename", "fp", "entry"}] already parsed. Scores every resume x JD pair in one
+    pass, then yields ("result", pair) as each pair's summary completes (Gemini calls bounded by
+    ATS_BATCH_CONCURRENCY), and finally ("done", counts)."""
+    suffix = ":llm" if llm_summary else ""
+    keys   = [jd_key(jd) + suffix for jd in jds]
+    matrix = ats_scorer.score_matrix([r["entry"]["text"] for r in resumes], jds)
+    sem    = asyncio.Semaphore(ATS_BATCH_CONCURRENCY)
+
+    async def one(i, j):
+        cached = use_cache and resumes[i]["entry"].get("ats", {}).get(keys[j])
+        if cached:
+            return i, j, cached, True
+        text = None
+        if llm_summary and ATS_LLM_SUMMARY:
+            async with sem:
+                text = await _acall_gemini(_ats_summary_prompt(jds[j], matrix[i][j]), endpoint="ats_summary",
+                                           use_cache=use_cache, validate=_clean_gemini_json)
+        return i, j, _with_summary(matrix[i][j], text), False
+
+    tasks = [asyncio.ensure_future(one(i, j)) for i in range(len(resumes)) for j in range(len(jds))]
+    fresh = [{} for _ in resumes]
     try:
-        result = get_gemini_ats_score(extract_pdf_text(p), jd)
-        if "error" in result: return jsonify(result), 500
-        if mongo_db: log_activity(mongo_db, request.user_email, "resume_evaluator",
-                                   f"Score {result.get('match_score','?')} — {f.filename}")
-        return jsonify(result), 200
+        for fut in asyncio.as_completed(tasks):
+            i, j, result, cached = await fut
+            if not cached:
+                fresh[i][keys[j]] = result
+            yield "result", {"resume": resumes[i]["index"], "jd": j, "filename": resumes[i]["filename"],
+                             "cached": cached, **result}
     finally:
-        os.path.exists(p) and os.remove(p)
+        for t in tasks:
+            t.cancel()
+    for r, new in zip(resumes, fresh):
+        if new:
+            entry = {**r["entry"], "ats": {**r["entry"].get("ats", {}), **new}}
+            await asyncio.to_thread(resume_cache.put, email, r["fp"], entry)
+    if mongo_db is not None:
+        log_activity(mongo_db, email, "resume_evaluator", f"Batch: {len(resumes)} resume(s) x {len(jds)} JD(s)")
+    yield "done", {"resumes": len(resumes), "jds": len(jds), "pairs": len(tasks)}
+
+
+@app.route("/evaluate-resume/batch", methods=["POST"])
+@require_auth
+def evaluate_resume_batch():
+    """Multipart: one or more `files` and one or more `job_description` fields (or a JSON list in
+    `job_descriptions`). Streams one SSE `result` per resume x JD pair as it completes."""
+    files = request.files.getlist("files") + request.files.getlist("file")
+    jds   = [jd for jd in request.form.getlist("job_description") if jd.strip()]
+    try:
+        jds += [jd for jd in json.loads(request.form.get("job_descriptions") or "[]") if str(jd).strip()]
+    except (TypeError, ValueError):
+        return jsonify({"error": "job_descriptions must be a JSON list of strings"}), 400
+    if not files or not jds: return jsonify({"error": "Need at least one resume file and one job description"}), 400
+    if len(files) * len(jds) > ATS_BATCH_MAX_PAIRS:
+        return jsonify({"error": f"At most {ATS_BATCH_MAX_PAIRS} resume x job description pairs per batch"}), 400
+
+    resumes, unreadable = [], []
+    for n, f in enumerate(files):
+        fp, entry = _parsed_resume(request.user_email, f)
+        (resumes if entry["text"] else unreadable).append(
+            {"index": n, "filename": f.filename, "fp": fp, "entry": entry})
+    llm_summary = request.form.get("summary", "1").lower() not in ("0", "false", "no")
+    events = aio.iterate(_ats_batch_events(resumes, [str(jd) for jd in jds], request.user_email,
+                                           _use_llm_cache(), llm_summary)) if resumes else iter(())
+
+    def body():
+        try:
+            for r in unreadable:
+                yield sse("error", {"resume": r["index"], "filename": r["filename"],
+                                    "error": "Could not extract text from the resume PDF"})
+            for event, payload in events:
+                yield sse(event, payload)
+        finally:
+            resumes and events.close()
+    return Response(body(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 # ============================================================
 # ROUTES — JOB FINDER
@@ -858,84 +1723,162 @@ def scrape_review():
 @app.route("/api/jobs", methods=["GET"])
 @require_auth
 def get_jobs():
+    """Jobs for query/location from every configured site, merged and deduplicated, one page at a time:
+    page_size (default num_jobs, both at most JOB_MAX_RESULTS) jobs plus next_cursor, which fetches the
+    next page of the same set. A cursor whose earlier pages changed in the cache since is answered 410;
+    the client should search again."""
     try:
         from jobspy import scrape_jobs
     except ImportError:
         return jsonify({"error": "jobspy not installed"}), 500
 
-    query    = request.args.get("query", "").strip()
-    location = request.args.get("location", "india")
-    num_jobs = int(request.args.get("num_jobs", 10))
+    cursor, version = request.args.get("cursor"), None
+    if cursor:
+        try:
+            query, location, num_jobs, offset, page_size, version = _read_jobs_cursor(cursor)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+    else:
+        query    = request.args.get("query", "").strip()
+        location = request.args.get("location", "india")
+        offset   = 0
+        try:
+            num_jobs  = _job_count(request.args.get("num_jobs"), 10)
+            page_size = _job_count(request.args.get("page_size"), num_jobs)
+        except ValueError:
+            return jsonify({"error": "num_jobs and page_size must be numbers"}), 400
     if not query: return jsonify({"error": "Query required"}), 400
 
-    ck = f"{query}:{location}:{num_jobs}"
-    if ck in _job_cache and time.time() - _job_cache[ck]["ts"] < _JOB_TTL:
-        return jsonify({"jobs": _job_cache[ck]["data"]}), 200
-
-    _LOC = {"india":"india","bengaluru":"india","hyderabad":"india","mumbai":"india",
-            "pune":"india","chennai":"india","usa":"usa","us":"usa","united states":"usa",
-            "new york, ny":"usa","san francisco, ca":"usa","seattle, wa":"usa",
-            "uk":"united kingdom","london, uk":"united kingdom",
-            "canada":"canada","toronto":"canada",
-            "australia":"australia","sydney":"australia","remote":"usa"}
-    country = _LOC.get(location.strip().lower(), "india")
-
+    ck = _job_search_key(query, location)
     try:
-        df = scrape_jobs(site_name=["indeed"], search_term=query,
-                         location=location, results_wanted=num_jobs, country_indeed=country)
-        if df is None or len(df) == 0: return jsonify({"jobs": []}), 200
-        jobs = df.to_dict("records")
-        for job in jobs:
-            for k, v in job.items():
-                if isinstance(v, float) and math.isnan(v): job[k] = None
-        _job_cache[ck] = {"data": jobs, "ts": time.time()}
-        if mongo_db: log_activity(mongo_db, request.user_email, "job_finder", f"Query: {query}")
-        return jsonify({"jobs": jobs}), 200
+        entry, state = _cached_jobs(scrape_jobs, ck, num_jobs)
+        if cursor and _served_version(entry["jobs"], offset) != version:
+            return jsonify({"error": "Job results changed since this cursor was issued; search again"}), 410
+        if entry["jobs"] and not cursor and mongo_db is not None:
+            # every served search counts towards the popular searches the prefetcher keeps warm
+            log_activity(mongo_db, request.user_email, "job_finder", f"Query: {query}",
+                         {"query": query, "location": location, "num_jobs": num_jobs})
+        total = len(entry["jobs"])
+        nxt   = offset + page_size
+        body, headers = job_json.encode({
+            "jobs": entry["jobs"][offset:nxt], "total": total,
+            "next_cursor": (_jobs_cursor(query, location, num_jobs, nxt, page_size, entry["jobs"])
+                            if nxt < total else None),
+        }, request.headers.get("Accept-Encoding", ""), JOB_GZIP_MIN_BYTES)
+        return Response(body, status=200, mimetype="application/json", headers=headers)
     except Exception as exc:
         logger.error(f"Job search: {exc}")
         return jsonify({"error": str(exc), "jobs": []}), 500
 
+
+@app.route("/api/jobs/stream", methods=["GET"])
+@require_auth
+def stream_jobs():
+    """Server-Sent Events variant of /api/jobs: a `jobs` event per site as it finishes (only postings
+    not sent yet), `site_error` for a failed site, then `done` with the total and a cursor for paging
+    the merged set through /api/jobs. Cached or stored results arrive as a single `jobs` event."""
+    try:
+        from jobspy import scrape_jobs
+    except ImportError:
+        return jsonify({"error": "jobspy not installed"}), 500
+    query    = request.args.get("query", "").strip()
+    location = request.args.get("location", "india")
+    try:
+        num_jobs = _job_count(request.args.get("num_jobs"), 10)
+    except ValueError:
+        return jsonify({"error": "num_jobs must be a number"}), 400
+    if not query: return jsonify({"error": "Query required"}), 400
+    ck = _job_search_key(query, location)
+    q, loc, country = ck
+    email = request.user_email
+
+    def body():
+        t0 = time.monotonic()
+        cached, state = job_cache.get(ck)
+        if state is not None and _covers(cached, num_jobs):
+            entry, _ = _cached_jobs(scrape_jobs, ck, num_jobs)    # a stale entry is refreshed in the background
+            yield sse("jobs", {"source": "cache", "jobs": entry["jobs"]})
+        else:
+            wanted = max(num_jobs, cached["wanted"] if cached else 0)
+            local, covered = job_store.lookup(q, loc, country, wanted) if job_store else ([], False)
+            if covered:
+                entry = {"wanted": wanted, "jobs": local}
+                yield sse("jobs", {"source": "store", "jobs": local})
+            else:
+                run, sent = job_scraper.search(scrape_jobs, ck, wanted), set()
+                for site, jobs, error, seconds in run.follow(job_scraper.timeout):
+                    if error is not None:
+                        yield sse("site_error", {"site": site, "error": error})
+                        continue
+                    new = [j for j in jobs if dedupe_key(j) not in sent]
+                    sent.update(dedupe_key(j) for j in new)
+                    yield sse("jobs", {"source": site, "jobs": new, "elapsed_ms": round((time.monotonic() - t0) * 1e3)})
+                try:
+                    entry = _merge_found(run.result(0), local, loc, country)
+                except RuntimeError:
+                    entry = {"wanted": wanted, "jobs": local, "partial": True}
+                extra = [j for j in entry["jobs"] if dedupe_key(j) not in sent]
+                if extra:
+                    yield sse("jobs", {"source": "store", "jobs": extra})
+            if entry["jobs"] and not entry.get("partial"):
+                job_cache.set(ck, entry)
+        total = len(entry["jobs"])
+        if total and mongo_db is not None:
+            # logged once the search produced jobs, as /api/jobs does (the prefetcher ranks these)
+            log_activity(mongo_db, email, "job_finder", f"Query: {query}",
+                         {"query": query, "location": location, "num_jobs": num_jobs})
+        yield sse("done", {"total": total, "elapsed_ms": round((time.monotonic() - t0) * 1e3),
+                           "cursor": _jobs_cursor(query, location, num_jobs, 0, num_jobs, entry["jobs"]) if total else None})
+    return Response(body(), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 # ============================================================
 # ROUTES — QUESTION BANK
 # ============================================================
 
-@app.route("/generate-questions", methods=["POST"])
-@require_auth
-def generate_questions():
-    if not API_KEY: return jsonify({"error": "Gemini not configured"}), 500
-    d  = request.get_json() or {}
+async def _generate_questions_reply(d: dict, email: str, use_cache: bool = True):
+    if not API_KEY: return {"error": "Gemini not configured"}, 500
     co = d.get("company_name"); ro = d.get("role"); dom = d.get("domain")
     ex = d.get("experience_level"); qt = d.get("question_type"); di = d.get("difficulty")
     nq = int(d.get("num_questions", 15))
     if not all([co, ro, dom, ex, qt, di]):
-        return jsonify({"error": "Missing required fields"}), 400
+        return {"error": "Missing required fields"}, 400
 
-    text = _call_gemini(
+    text = await _acall_gemini(
         f"Expert interviewer. Generate {nq} interview questions.\n"
         f"Company:{co} Role:{ro} Domain:{dom} Experience:{ex} Type:{qt} Difficulty:{di}\n\n"
-        "Each item: {id, question, answer, explanation}. Return ONLY a JSON array.", timeout=60)
-    if text is None: return jsonify({"error": "Failed to generate questions"}), 500
+        "Each item: {id, question, answer, explanation}. Return ONLY a JSON array.",
+        endpoint="generate_questions", use_cache=use_cache, validate=_clean_gemini_json)
+    if text is None: return {"error": "Failed to generate questions"}, 500
     try:
         questions = _clean_gemini_json(text)
     except json.JSONDecodeError as exc:
-        return jsonify({"error": f"Parse error: {exc}"}), 500
-    if mongo_db: log_activity(mongo_db, request.user_email, "question_bank", f"{nq} q — {co} {ro}")
-    return jsonify({"questions": questions}), 200
+        return {"error": f"Parse error: {exc}"}, 500
+    if mongo_db is not None:
+        log_activity(mongo_db, email, "question_bank", f"{nq} q — {co} {ro}")
+    return {"questions": questions}, 200
+
+
+@app.route("/generate-questions", methods=["POST"])
+@require_auth
+def generate_questions():
+    data = request.get_json() or {}
+    if _prefers_async():
+        return _submit_task("generate_questions", data)
+    body, status = aio.run(_generate_questions_reply(data, request.user_email, _use_llm_cache()))
+    return jsonify(body), status
 
 # ============================================================
 # ROUTES — MOCK INTERVIEW (Vapi)
 # ============================================================
 
-@app.route("/api/vapi/assistant", methods=["POST"])
-@require_auth
-def create_vapi_assistant():
-    if not VAPI_PRIVATE_KEY: return jsonify({"error": "Vapi not configured"}), 500
-    d  = request.get_json() or {}
+async def _vapi_assistant_reply(d: dict, email: str):
+    if not VAPI_PRIVATE_KEY: return {"error": "Vapi not configured"}, 500
     jd = d.get("jd", "")
-    if not jd: return jsonify({"error": "No JD provided"}), 400
+    if not jd: return {"error": "No JD provided"}, 400
     jd_short = jd[:1500] + ("..." if len(jd) > 1500 else "")
     try:
-        r = requests.post("https://api.vapi.ai/assistant",
+        async with aio.http().post("https://api.vapi.ai/assistant",
             headers={"Authorization": f"Bearer {VAPI_PRIVATE_KEY}",
                      "Content-Type": "application/json"},
             json={"name": "AI Interviewer",
@@ -944,13 +1887,160 @@ def create_vapi_assistant():
                              "messages": [{"role": "system", "content":
                                  f"You are a professional AI interviewer. JD:\n{jd_short}"}]},
                   "voice": {"provider": "azure", "voiceId": "en-US-JennyNeural"}},
-            timeout=15)
-        if r.status_code not in (200, 201):
-            return jsonify({"error": "Failed to create Vapi assistant"}), 500
-        if mongo_db: log_activity(mongo_db, request.user_email, "mock_interview", "Started")
-        return jsonify({"id": r.json().get("id")}), 200
+            timeout=aio.timeout(15)) as r:
+            if r.status not in (200, 201):
+                return {"error": "Failed to create Vapi assistant"}, 500
+            assistant_id = (await r.json(content_type=None)).get("id")
+        if mongo_db is not None:
+            log_activity(mongo_db, email, "mock_interview", "Started")
+        return {"id": assistant_id}, 200
     except Exception as exc:
-        return jsonify({"error": str(exc)}), 500
+        return {"error": str(exc)}, 500
+
+
+@app.route("/api/vapi/assistant", methods=["POST"])
+@require_auth
+def create_vapi_assistant():
+    body, status = aio.run(_vapi_assistant_reply(request.get_json() or {}, request.user_email))
+    return jsonify(body), status
+
+
+def _parse_json_block(text: str):
+    try:
+        return _clean_gemini_json(text)
+    except json.JSONDecodeError:
+        m = re.search(r"\{.*\}", text, re.DOTALL)
+        if not m:
+            raise
+        return json.loads(m.group(0))
+
+
+async def _interview_feedback_reply(d: dict, email: str, use_cache: bool = True):
+    if not API_KEY: return {"error": "Gemini not configured"}, 500
+    jd         = d.get("jobDescription", "")
+    transcript = d.get("transcript", "")
+    duration   = d.get("duration", 0)
+    if not transcript: return {"error": "No interview transcript provided"}, 400
+    text = await _acall_gemini(
+        "You are an expert interview coach analyzing a mock interview performance.\n\n"
+        f"Job Description:\n{jd}\n\nInterview Transcript:\n{transcript}\n\n"
+        f"Interview Duration: {duration} minutes\n\n"
+        "Analyze this interview. Return ONLY JSON: {overall_score, communication_score, technical_score, "
+        "confidence_score (numbers 1-10), strengths, weaknesses, improvement_areas, recommended_actions "
+        "(lists of 3 strings), summary (2-3 sentences), detailed_feedback (paragraph on the candidate's "
+        "responses, communication style and technical knowledge)}.\n"
+        "Evaluate communication clarity, technical accuracy, confidence, relevance of answers and use of "
+        "specific examples. Be constructive, actionable, encouraging but honest.",
+        endpoint="interview_feedback", use_cache=use_cache, validate=_parse_json_block,
+        generation_config={"temperature": 0.5, "maxOutputTokens": 2048, "responseMimeType": "application/json"})
+    if text is None: return {"error": "Failed to generate feedback"}, 500
+    try:
+        feedback = _parse_json_block(text)
+    except json.JSONDecodeError as exc:
+        return {"error": "Failed to parse AI response", "details": str(exc)}, 500
+    if mongo_db is not None:
+        await asyncio.to_thread(_save_interview_feedback, email, jd, transcript, duration, feedback)
+    return feedback, 200
+
+
+def _save_interview_feedback(email, jd, transcript, duration, feedback):
+    user = users_col.find_one({"email": email}, {"_id": 1}) if users_col is not None else None
+    if not user:
+        return
+    mongo_db["interview_feedback"].insert_one({
+        "user_id": user["_id"], "email": email, "job_description": jd[:500], "transcript": transcript,
+        "duration_minutes": duration, "feedback": feedback, "timestamp": datetime.now(timezone.utc),
+    })
+    log_activity(mongo_db, email, "mock_interview",
+                 f"Interview Feedback - Score: {feedback.get('overall_score', 0)}/10")
+
+
+@app.route("/api/vapi/generate-feedback", methods=["POST"])
+@require_auth
+def generate_interview_feedback():
+    data = request.get_json() or {}
+    if _prefers_async():
+        return _submit_task("interview_feedback", data)
+    body, status = aio.run(_interview_feedback_reply(data, request.user_email, _use_llm_cache()))
+    return jsonify(body), status
+
+# ============================================================
+# ROUTES — BACKGROUND TASKS
+# ============================================================
+task_queue = TaskQueue(
+    mongo_db["tasks"] if mongo_db is not None else None,
+    concurrency=int(os.getenv("TASK_CONCURRENCY", "8")),
+    max_pending=int(os.getenv("TASK_MAX_PENDING", "200")),
+    result_ttl=int(os.getenv("TASK_RESULT_TTL", "3600")),
+)
+task_queue.register("generate_resume",    _generate_resume_reply)
+task_queue.register("generate_questions", _generate_questions_reply)
+task_queue.register("interview_feedback", _interview_feedback_reply)
+
+
+def prefers_async(prefer: str, async_param) -> bool:
+    """`Prefer: respond-async` (RFC 7240) or ?async=1 turns a long AI request into a task."""
+    return "respond-async" in (prefer or "").lower() or str(async_param or "").lower() in ("1", "true", "yes")
+
+
+def queue_task(kind: str, payload: dict, email: str, use_cache: bool):
+    """(body, status, headers): 202 with the task and its Location, or 429 when the queue is full."""
+    try:
+        task, created = task_queue.submit(kind, payload, email, use_cache)
+    except QueueFull as exc:
+        return {"error": f"Too many pending tasks: {exc}"}, 429, {}
+    return {"task": task, "deduplicated": not created}, 202, {"Location": f"/api/tasks/{task['task_id']}"}
+
+
+def _prefers_async() -> bool:
+    return prefers_async(request.headers.get("Prefer"), request.args.get("async"))
+
+
+def _submit_task(kind: str, payload: dict):
+    body, status, headers = queue_task(kind, payload, request.user_email, _use_llm_cache())
+    return jsonify(body), status, headers
+
+
+@app.route("/api/tasks", methods=["POST"])
+@require_auth
+def submit_task():
+    data = request.get_json() or {}
+    kind = data.get("kind")
+    if kind not in task_queue.kinds:
+        return jsonify({"error": f"kind must be one of {task_queue.kinds}"}), 400
+    return _submit_task(kind, data.get("payload") or {})
+
+
+@app.route("/api/tasks/<task_id>", methods=["GET"])
+@require_auth
+def get_task(task_id):
+    record = task_queue.get(task_id, request.user_email)
+    if record is None: return jsonify({"error": "Task not found"}), 404
+    return jsonify({"task": task_public(record)}), 200
+
+
+@app.route("/api/tasks/<task_id>/result", methods=["GET"])
+@require_auth
+def get_task_result(task_id):
+    record = task_queue.get(task_id, request.user_email)
+    if record is None: return jsonify({"error": "Task not found"}), 404
+    if record["status"] in ("queued", "running"):
+        return jsonify({"task": task_public(record)}), 202
+    if record["status"] == "cancelled":
+        return jsonify({"error": "Task was cancelled", "task": task_public(record)}), 410
+    if record.get("result") is None:
+        return jsonify({"error": record.get("error") or "Task failed"}), record.get("status_code") or 500
+    return jsonify(record["result"]), record.get("status_code") or 200
+
+
+@app.route("/api/tasks/<task_id>", methods=["DELETE"])
+@require_auth
+def cancel_task(task_id):
+    record = task_queue.cancel(task_id, request.user_email)
+    if record is None: return jsonify({"error": "Task not found"}), 404
+    if record["status"] != "cancelled":
+        return jsonify({"error": f"Task already {record['status']}", "task": task_public(record)}), 409
+    return jsonify({"task": task_public(record)}), 200
 
 # ============================================================
 # ERROR HANDLERS
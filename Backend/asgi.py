@@ -0,0 +1,161 @@
+"""
+ASGI entry point (async serving mode).
+
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port $PORT --workers 2
+
+LLM-bound routes are served natively: their coroutines run on the aio loop
+and hold no thread while Gemini / Groq / Vapi respond. Every other route
+falls through to the Flask WSGI app in asgiref's thread pool. As under
+Flask, `Prefer: respond-async` or ?async=1 on the resume and question
+routes queues a background task and answers 202 with its id.
+"""
+
+import asyncio
+import json
+import logging
+from urllib.parse import parse_qsl
+
+from asgiref.wsgi import WsgiToAsgi
+
+import aio
+from app import (
+    app, authenticate, optional_email, llm_cache_allowed, prefers_async, queue_task, sse, CORS_ORIGINS,
+    _chat_unavailable, _chat_reply, _chat_events,
+    _generate_resume_reply, _generate_questions_reply, _vapi_assistant_reply,
+)
+
+logger = logging.getLogger(__name__)
+
+_wsgi = WsgiToAsgi(app)
+
+
+async def _chat(data, headers, query, email):
+    return await _chat_reply(data, optional_email(headers.get("authorization")))
+
+
+def _task_or(kind: str, reply):
+    """Handler that runs `reply` inline, or queues it as a `kind` task when the client prefers async."""
+    async def handler(data, headers, query, email):
+        use_cache = llm_cache_allowed(headers.get("cache-control"), data.get("no_cache"))
+        if prefers_async(headers.get("prefer"), query.get("async")):
+            return await asyncio.to_thread(queue_task, kind, data, email, use_cache)
+        return await reply(data, email, use_cache)
+    return handler
+
+
+async def _vapi(data, headers, query, email):
+    return await _vapi_assistant_reply(data, email)
+
+
+# (method, path) -> (handler, requires_auth)
+ROUTES = {
+    ("POST", "/multi-agent/chat"):    (_chat, False),
+    ("POST", "/generate-resume"):     (_task_or("generate_resume", _generate_resume_reply),       True),
+    ("POST", "/generate-questions"):  (_task_or("generate_questions", _generate_questions_reply), True),
+    ("POST", "/api/vapi/assistant"):  (_vapi, True),
+}
+
+# (method, path) -> (precheck, event generator); served as text/event-stream
+STREAMS = {
+    ("POST", "/multi-agent/chat/stream"): (
+        lambda data: _chat_unavailable((data.get("query") or "").strip()),
+        lambda data, headers: _chat_events(data, optional_email(headers.get("authorization")))),
+}
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        msg = await receive()
+        chunks.append(msg.get("body", b""))
+        if not msg.get("more_body"):
+            return b"".join(chunks)
+
+
+def _cors(origin: str = None) -> list:
+    if origin not in CORS_ORIGINS:
+        return []
+    return [(b"access-control-allow-origin", origin.encode()),
+            (b"access-control-allow-credentials", b"true"),
+            (b"vary", b"Origin")]
+
+
+async def _send_json(send, status: int, payload, origin: str = None, extra: dict = None):
+    body    = json.dumps(payload).encode()
+    headers = [(b"content-type", b"application/json"),
+               (b"content-length", str(len(body)).encode())] + _cors(origin)
+    headers += [(k.lower().encode(), str(v).encode()) for k, v in (extra or {}).items()]
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_sse(send, events, origin: str = None):
+    """Forward (event, payload) pairs as they are produced; a disconnect closes the generator."""
+    headers = [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache"),
+               (b"x-accel-buffering", b"no")] + _cors(origin)
+    await send({"type": "http.response.start", "status": 200, "headers": headers})
+    try:
+        async for event, payload in aio.aiterate(events):
+            await send({"type": "http.response.body", "body": sse(event, payload).encode(),
+                        "more_body": True})
+    except Exception as exc:
+        logger.error(f"Stream error: {exc}")
+        await send({"type": "http.response.body", "more_body": True,
+                    "body": sse("error", {"error": "Internal server error"}).encode()})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _read_json(receive) -> dict:
+    try:
+        data = json.loads(await _read_body(receive) or b"{}")
+    except ValueError:
+        data = {}
+    return data if isinstance(data, dict) else {}
+
+
+async def asgi_app(scope, receive, send):
+    key    = (scope.get("method"), scope.get("path")) if scope["type"] == "http" else None
+    route  = ROUTES.get(key)
+    stream = STREAMS.get(key)
+    if route is None and stream is None:
+        return await _wsgi(scope, receive, send)
+
+    headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope["headers"]}
+    origin  = headers.get("origin")
+    started = []
+
+    async def tracked(msg):
+        if msg["type"] == "http.response.start":
+            started.append(True)
+        await send(msg)
+    try:
+        await _dispatch(scope, receive, tracked, route, stream, headers, origin)
+    except Exception as exc:
+        # as Flask's 500 handler, but with CORS headers so the browser sees the error body
+        logger.error(f"Server error: {exc}")
+        if not started:
+            await _send_json(send, 500, {"error": "Internal server error"}, origin)
+
+
+async def _dispatch(scope, receive, send, route, stream, headers, origin):
+    if stream is not None:
+        precheck, events = stream
+        data = await _read_json(receive)
+        err  = precheck(data)
+        if err:
+            return await _send_json(send, err[1], err[0], origin)
+        return await _send_sse(send, events(data, headers), origin)
+
+    handler, needs_auth = route
+
+    email = None
+    if needs_auth:
+        payload, err, status = authenticate(headers.get("authorization", ""))
+        if err:
+            return await _send_json(send, status, {"error": err}, origin)
+        email = payload.get("email")
+
+    data  = await _read_json(receive)
+    query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+    body, status, *extra = await aio.call(handler(data, headers, query, email))
+    await _send_json(send, status, body, origin, *extra)
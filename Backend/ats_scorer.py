@@ -0,0 +1,198 @@
+"""
+Local ATS match scoring: resume vs job description, no LLM.
+
+Text is tokenised into normalised terms (aliases such as js -> javascript or
+k8s -> kubernetes, multi-word skills such as "machine learning" kept as one
+term). The JD's keywords are the known skills it mentions plus its most
+distinctive other terms. For every (resume, JD) pair, terms are weighted by
+BM25 term-frequency saturation x IDF, where document frequency is counted
+over the lines of the two documents (so a score does not depend on what
+else is scored with it). The score combines weighted keyword coverage with
+the cosine similarity of the two weighted term vectors. score_matrix()
+scores many resumes against many JDs in one NumPy pass.
+"""
+
+import math
+import re
+from collections import Counter
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+ALIASES = {
+    "js": "javascript", "ts": "typescript", "golang": "go", "py": "python", "cpp": "c++",
+    "nodejs": "node.js", "node": "node.js", "reactjs": "react", "react.js": "react", "vuejs": "vue",
+    "vue.js": "vue", "angularjs": "angular", "nextjs": "next.js", "expressjs": "express",
+    "k8s": "kubernetes", "postgres": "postgresql", "mongo": "mongodb", "sklearn": "scikit-learn",
+    "ml": "machine learning", "dl": "deep learning", "nlp": "natural language processing",
+    "cv": "computer vision", "tf": "tensorflow", "powerbi": "power bi", "restful": "rest",
+    "llms": "llm", "cicd": "ci/cd", "gcloud": "gcp", "apis": "api", "transformer": "transformers",
+}
+PHRASES = {
+    "amazon web services": "aws", "google cloud": "gcp", "google cloud platform": "gcp",
+    "microsoft azure": "azure", "ci cd": "ci/cd", "node js": "node.js", "react js": "react",
+    "spring boot": "spring boot", "rest api": "rest", "rest apis": "rest", "github actions": "github actions",
+    "scikit learn": "scikit-learn", "react native": "react native", "power bi": "power bi",
+    "unit testing": "unit testing", "system design": "system design", "data science": "data science",
+    "data analysis": "data analysis", "data engineering": "data engineering",
+    "feature engineering": "feature engineering", "distributed systems": "distributed systems",
+    "machine learning": "machine learning", "deep learning": "deep learning",
+    "computer vision": "computer vision", "natural language processing": "natural language processing",
+}
+SKILLS = frozenset("""
+python java javascript typescript go rust c++ c# ruby php kotlin swift scala matlab perl bash sql
+html css sass react angular vue svelte next.js node.js express django flask fastapi spring
+rails laravel graphql rest grpc websockets redux tailwind jquery bootstrap
+pandas numpy scipy scikit-learn tensorflow pytorch keras xgboost spark hadoop airflow kafka dbt
+statistics llm rag transformers langchain mlops etl
+aws azure gcp docker kubernetes terraform ansible jenkins ci/cd linux git nginx microservices serverless
+postgresql mysql mongodb redis elasticsearch cassandra dynamodb sqlite oracle snowflake bigquery
+excel tableau looker figma jira agile scrum selenium cypress jest pytest android ios flutter
+""".split()) | frozenset(PHRASES.values())
+STOP = frozenset("""
+a an the and or but if of to in on at by for with from as is are was were be been being am this that these
+those it its we our you your they their he she his her i me my will would should can could may might must
+shall do does did have has had not no nor so than too very just also etc via per into over under about
+using use used within across including include includes such other more most well new who what which when
+where how why all any each both few some own same only able
+experience experienced years year work working worked team teams strong ability skills skill knowledge
+good excellent great plus preferred required requirements requirement responsibilities responsible role
+candidate candidates job position company opportunity looking join ideal must-have nice-to-have
+understanding familiarity familiar proficiency proficient hands-on solid proven related relevant
+environment degree bachelor bachelors master masters field equivalent minimum least e.g i.e
+build building built write writing develop developing design designing maintain maintaining own help
+improve improving manage managing ensure support deliver drive collaborate closely day daily nice bonus
+""".split())
+_KEEP_S = frozenset(s for s in SKILLS if s.endswith("s")) | {"kubernetes", "aws", "redis", "pandas",
+                                                          "analytics", "statistics", "ios", "sas"}
+
+K1, B       = 1.2, 0.75
+AVG_TERMS   = {"resume": 400.0, "jd": 150.0}
+SKILL_BOOST = 2.0
+TOP_TERMS   = 15          # non-skill JD keywords
+MAX_MISSING = 15
+
+
+def _word(w: str) -> str:
+    w = w.rstrip(".-")
+    w = ALIASES.get(w, w)
+    if w in STOP:
+        return w
+    if len(w) > 3 and w.endswith("s") and not w.endswith(("ss", "us", "is")) and w not in _KEEP_S:
+        w = ALIASES.get(w[:-1], w[:-1])
+    return w
+
+
+PHRASES = {" ".join(_word(w) for w in k.split()): v for k, v in PHRASES.items()}
+
+
+def terms(text: str) -> list:
+    """Normalised terms: content words, plus canonical multi-word skills."""
+    words = [_word(p) for w in _TOKEN_RE.findall((text or "").lower())
+             for p in ([w] if "-" not in w or w in SKILLS else w.split("-"))]
+    words = [w for w in words if w]
+    out   = []
+    for i, w in enumerate(words):
+        if w not in STOP and not w.isdigit() and (len(w) > 1 or w in SKILLS):
+            out.append(w)
+        for n in (2, 3):
+            phrase = PHRASES.get(" ".join(words[i:i + n])) if i + n <= len(words) else None
+            if phrase and phrase != w:
+                out.append(phrase)
+    return out
+
+
+class _Doc:
+    __slots__ = ("tf", "df", "lines", "length")
+
+    def __init__(self, text: str):
+        lines       = [t for t in (terms(line) for line in (text or "").splitlines()) if t]
+        self.lines  = max(len(lines), 1)
+        self.tf     = Counter(t for line in lines for t in line)
+        self.df     = Counter(t for line in lines for t in set(line))
+        self.length = sum(self.tf.values())
+
+
+def _saturate(tf: np.ndarray, length: np.ndarray, avg: float) -> np.ndarray:
+    return tf * (K1 + 1) / (tf + K1 * (1 - B + B * length[:, None] / avg) + 1e-12)
+
+
+def jd_keywords(doc: _Doc) -> dict:
+    """{term: boost} for a parsed JD: the skills it names plus its top other terms by TF-IDF."""
+    skills = {t: SKILL_BOOST for t in doc.tf if t in SKILLS}
+    inside = {w for s in skills if " " in s for w in s.split()}
+    other  = sorted(((t, math.log1p(doc.tf[t]) * math.log1p(doc.lines / doc.df[t]))
+                     for t in doc.tf if t not in skills and t not in inside and len(t) > 2
+                     and not any(c.isdigit() for c in t)), key=lambda x: -x[1])
+    return {**skills, **{t: 1.0 for t, _ in other[:TOP_TERMS]}}
+
+
+def score_matrix(resumes: list, jds: list) -> list:
+    """results[i][j] = score of resumes[i] against jds[j]."""
+    R, J  = [_Doc(t) for t in resumes], [_Doc(t) for t in jds]
+    kws   = [jd_keywords(d) for d in J]
+    vocab = {t: i for i, t in enumerate(sorted({t for d in R + J for t in d.tf}))}
+    V     = max(len(vocab), 1)
+
+    def dense(docs, attr):
+        M = np.zeros((len(docs), V), dtype=np.float32)
+        for i, d in enumerate(docs):
+            for t, c in getattr(d, attr).items():
+                M[i, vocab[t]] = c
+        return M
+
+    TFR, TFJ = dense(R, "tf"), dense(J, "tf")
+    DFR, DFJ = dense(R, "df"), dense(J, "df")
+    K = np.zeros((len(J), V), dtype=np.float32)
+    for j, kw in enumerate(kws):
+        for t, boost in kw.items():
+            K[j, vocab[t]] = boost
+    NR = np.array([d.lines for d in R], dtype=np.float32)
+    NJ = np.array([d.lines for d in J], dtype=np.float32)
+
+    # (resumes, jds, vocab): IDF over the lines of each pair
+    idf = np.log1p((NR[:, None, None] + NJ[None, :, None] + 1) / (DFR[:, None, :] + DFJ[None, :, :] + 0.5))
+    sr  = _saturate(TFR, np.array([d.length for d in R], dtype=np.float32), AVG_TERMS["resume"])
+    sj  = _saturate(TFJ, np.array([d.length for d in J], dtype=np.float32), AVG_TERMS["jd"])
+    r   = sr[:, None, :] * idf
+    j   = sj[None, :, :] * idf
+    cos = (r * j).sum(-1) / np.maximum(np.linalg.norm(r, axis=-1) * np.linalg.norm(j, axis=-1), 1e-12)
+
+    present = TFR > 0
+    W   = idf * (sj * K)[None, :, :]
+    tot = W.sum(-1)
+    cov = np.where(tot > 0, (W * present[:, None, :]).sum(-1) / np.maximum(tot, 1e-12), 0.0)
+    score = np.clip(np.rint(100 * (0.7 * cov + 0.3 * np.minimum(cos / 0.5, 1.0))), 0, 100)
+
+    terms_of = list(vocab)
+    out = []
+    for i in range(len(R)):
+        row = []
+        for jj in range(len(J)):
+            idx     = np.flatnonzero(K[jj])
+            order   = idx[np.argsort(-W[i, jj, idx], kind="stable")]
+            missing = [terms_of[k] for k in order if not present[i, k]]
+            matched = [terms_of[k] for k in order if present[i, k]]
+            row.append({"match_score": int(score[i, jj]), "missing_keywords": missing[:MAX_MISSING],
+                        "matched_keywords": matched, "keyword_count": len(order),
+                        "coverage": round(float(cov[i, jj]), 3),
+                        "similarity": round(float(cos[i, jj]), 3)})
+        out.append(row)
+    return out
+
+
+def score(resume: str, jd: str) -> dict:
+    return score_matrix([resume], [jd])[0][0]
+
+
+def summary_text(result: dict) -> str:
+    """One-paragraph summary of a local score, used when no LLM summary is requested."""
+    matched, missing = result["matched_keywords"], result["missing_keywords"]
+    total = result.get("keyword_count", len(matched) + len(missing))     # missing_keywords is cut to MAX_MISSING
+    text  = f"Resume covers {len(matched)} of {total} key terms from the job description"
+    if matched:
+        text += f", including {', '.join(matched[:5])}"
+    if missing:
+        text += f". Missing or not evident: {', '.join(missing[:5])}"
+    return text + "."
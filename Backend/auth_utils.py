@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 import os
 from bson import ObjectId
 
+import activity_log
+
 JWT_SECRET = os.getenv("JWT_SECRET") or os.getenv("SECRET_KEY") or "jwtsecret"
 
 # Token blacklist (in production, use Redis)
@@ -69,26 +71,14 @@ def log_activity(db, user_email, activity_type, activity_name, metadata=None):
     """
     Log user activity to database
     """
-    try:
-        # Get user_id from email
-        user = db['users'].find_one({"email": user_email})
-        if not user:
-            return False
-        
-        activity = {
-            "user_id": user['_id'],
-            "email": user_email,
-            "activity_type": activity_type,
-            "activity_name": activity_name,
-            "metadata": metadata or {},
-            "timestamp": datetime.now(timezone.utc)
-        }
-        
-        db['user_activities'].insert_one(activity)
-        return True
-    except Exception as e:
-        print(f"Error logging activity: {e}")
-        return False
+    activity = {
+        "email": user_email,
+        "activity_type": activity_type,
+        "activity_name": activity_name,
+        "metadata": metadata or {},
+        "timestamp": datetime.now(timezone.utc)
+    }
+    return activity_log.submit(db, 'user_activities', activity, resolve_user=user_email)
 
 
 def log_question_bank_activity(db, user_email, company, role, domain, experience_level, 
@@ -96,30 +86,19 @@ def log_question_bank_activity(db, user_email, company, role, domain, experience
     """
     Log question bank activity
     """
-    try:
-        user = db['users'].find_one({"email": user_email})
-        if not user:
-            return False
-        
-        activity = {
-            "user_id": user['_id'],
-            "email": user_email,
-            "company": company,
-            "role": role,
-            "domain": domain,
-            "experience_level": experience_level,
-            "question_type": question_type,
-            "difficulty": difficulty,
-            "num_questions": num_questions,
-            "questions_generated": questions_generated,
-            "timestamp": datetime.now(timezone.utc)
-        }
-        
-        db['question_bank_activities'].insert_one(activity)
-        return True
-    except Exception as e:
-        print(f"Error logging question bank activity: {e}")
-        return False
+    activity = {
+        "email": user_email,
+        "company": company,
+        "role": role,
+        "domain": domain,
+        "experience_level": experience_level,
+        "question_type": question_type,
+        "difficulty": difficulty,
+        "num_questions": num_questions,
+        "questions_generated": questions_generated,
+        "timestamp": datetime.now(timezone.utc)
+    }
+    return activity_log.submit(db, 'question_bank_activities', activity, resolve_user=user_email)
 
 
 def log_resume_activity(db, user_email, activity_type, resume_filename=None, 
@@ -128,29 +107,18 @@ def log_resume_activity(db, user_email, activity_type, resume_filename=None,
     """
     Log resume activity
     """
-    try:
-        user = db['users'].find_one({"email": user_email})
-        if not user:
-            return False
-        
-        activity = {
-            "user_id": user['_id'],
-            "email": user_email,
-            "activity_type": activity_type,
-            "resume_filename": resume_filename,
-            "job_description": job_description,
-            "ats_score": ats_score,
-            "missing_keywords": missing_keywords or [],
-            "suggestions": suggestions,
-            "resume_data": resume_data,
-            "timestamp": datetime.now(timezone.utc)
-        }
-        
-        db['resume_activities'].insert_one(activity)
-        return True
-    except Exception as e:
-        print(f"Error logging resume activity: {e}")
-        return False
+    activity = {
+        "email": user_email,
+        "activity_type": activity_type,
+        "resume_filename": resume_filename,
+        "job_description": job_description,
+        "ats_score": ats_score,
+        "missing_keywords": missing_keywords or [],
+        "suggestions": suggestions,
+        "resume_data": resume_data,
+        "timestamp": datetime.now(timezone.utc)
+    }
+    return activity_log.submit(db, 'resume_activities', activity, resolve_user=user_email)
 
 
 def log_mock_interview(db, user_email, interview_type, job_description, duration_minutes,
@@ -160,33 +128,22 @@ def log_mock_interview(db, user_email, interview_type, job_description, duration
     """
     Log mock interview session
     """
-    try:
-        user = db['users'].find_one({"email": user_email})
-        if not user:
-            return False
-        
-        interview = {
-            "user_id": user['_id'],
-            "email": user_email,
-            "interview_type": interview_type,
-            "job_description": job_description,
-            "duration_minutes": duration_minutes,
-            "vapi_assistant_id": vapi_assistant_id,
-            "vapi_call_id": vapi_call_id,
-            "overall_rating": overall_rating,
-            "communication_score": communication_score,
-            "technical_score": technical_score,
-            "confidence_score": confidence_score,
-            "feedback": feedback,
-            "transcript": transcript,
-            "timestamp": datetime.now(timezone.utc)
-        }
-        
-        db['mock_interviews'].insert_one(interview)
-        return True
-    except Exception as e:
-        print(f"Error logging mock interview: {e}")
-        return False
+    interview = {
+        "email": user_email,
+        "interview_type": interview_type,
+        "job_description": job_description,
+        "duration_minutes": duration_minutes,
+        "vapi_assistant_id": vapi_assistant_id,
+        "vapi_call_id": vapi_call_id,
+        "overall_rating": overall_rating,
+        "communication_score": communication_score,
+        "technical_score": technical_score,
+        "confidence_score": confidence_score,
+        "feedback": feedback,
+        "transcript": transcript,
+        "timestamp": datetime.now(timezone.utc)
+    }
+    return activity_log.submit(db, 'mock_interviews', interview, resolve_user=user_email)
 
 
 def log_job_search(db, user_email, search_query, location, num_jobs_requested, 
@@ -194,28 +151,17 @@ def log_job_search(db, user_email, search_query, location, num_jobs_requested,
     """
     Log job search activity
     """
-    try:
-        user = db['users'].find_one({"email": user_email})
-        if not user:
-            return False
-        
-        search = {
-            "user_id": user['_id'],
-            "email": user_email,
-            "search_query": search_query,
-            "location": location,
-            "num_jobs_requested": num_jobs_requested,
-            "num_jobs_found": num_jobs_found,
-            "saved_jobs": saved_jobs or [],
-            "applied_jobs": [],
-            "timestamp": datetime.now(timezone.utc)
-        }
-        
-        db['job_searches'].insert_one(search)
-        return True
-    except Exception as e:
-        print(f"Error logging job search: {e}")
-        return False
+    search = {
+        "email": user_email,
+        "search_query": search_query,
+        "location": location,
+        "num_jobs_requested": num_jobs_requested,
+        "num_jobs_found": num_jobs_found,
+        "saved_jobs": saved_jobs or [],
+        "applied_jobs": [],
+        "timestamp": datetime.now(timezone.utc)
+    }
+    return activity_log.submit(db, 'job_searches', search, resolve_user=user_email)
 
 
 def update_chat_session(db, user_email, session_id, message, role='user'):
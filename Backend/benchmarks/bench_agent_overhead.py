@@ -0,0 +1,95 @@
+"""
+Per-turn Python overhead of the multi-agent path, with ChatGroq replaced by an
+in-process fake so only prompt/chain/agent/graph work is measured.
+
+    python benchmarks/bench_agent_overhead.py [--turns 2000]
+
+Part 1 compares building `ChatPromptTemplate.from_template(...) | model` per
+call (the old pattern) with invoking a chain compiled once. Part 2 times full
+chat turns through the compiled workflow and the sticky-agent path.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import langchain_groq                                                    # noqa: E402
+from langchain_core.language_models.chat_models import BaseChatModel    # noqa: E402
+from langchain_core.messages import AIMessage                           # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatResult           # noqa: E402
+from langchain_core.prompts import ChatPromptTemplate                   # noqa: E402
+
+TEMPLATE = "Categorize (NUMBER only):\n0:greeting/general\n1:learning/AI\nQuery:{query}\nCategory:"
+
+
+class FakeGroq(BaseChatModel):
+    def __init__(self, **kwargs):
+        super().__init__()
+
+    @property
+    def _llm_type(self):
+        return "fake-groq"
+
+    @staticmethod
+    def _reply(messages):
+        last = messages[-1].content
+        if "Pick the handler" in last:
+            return "learning_resource"
+        if "Categorize" in last:
+            return "1"
+        if "One word" in last:
+            return "Question"
+        return '{"should_handle": true, "reason": "in domain"}\nHere is the answer.'
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._reply(messages)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return self._generate(messages)
+
+
+def per_call_us(fn, n):
+    async def loop():
+        t0 = time.perf_counter()
+        for i in range(n):
+            await fn(i)
+        return (time.perf_counter() - t0) / n * 1e6
+    return asyncio.run(loop())
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns", type=int, default=2000)
+    args = ap.parse_args()
+
+    model    = FakeGroq()
+    compiled = ChatPromptTemplate.from_template(TEMPLATE) | model
+
+    rebuilt_us  = per_call_us(lambda i: (ChatPromptTemplate.from_template(TEMPLATE) | model)
+                              .ainvoke({"query": f"q{i}"}), args.turns)
+    compiled_us = per_call_us(lambda i: compiled.ainvoke({"query": f"q{i}"}), args.turns)
+    print(f"chain rebuilt per call   {rebuilt_us:8.1f} us/call")
+    print(f"chain compiled once      {compiled_us:8.1f} us/call   "
+          f"(saves {rebuilt_us - compiled_us:.1f} us per LLM hop)")
+
+    langchain_groq.ChatGroq = FakeGroq
+    os.environ.update(GROQ_API_KEY="bench", CHAT_LOCAL_ROUTER="0", MONGODB_URI="", LOG_LEVEL="WARNING")
+    import app
+
+    history = [{"role": "user" if i % 2 == 0 else "assistant", "content": f"turn {i} " * 20}
+               for i in range(20)]
+    graph_us = per_call_us(lambda i: app.multi_agent_workflow.ainvoke({
+        "query": f"what is rag {i}", "messages": history, "current_agent": "", "category": "",
+        "route": "", "response": "", "should_reroute": False}), args.turns // 4)
+    sticky_us = per_call_us(lambda i: app.get_agent_by_name("learning_resource")
+                            .check_and_respond(f"explain attention {i}", history), args.turns)
+    print(f"full graph turn          {graph_us:8.1f} us/turn  (router + agent, 20-message history)")
+    print(f"sticky agent turn        {sticky_us:8.1f} us/turn")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Load test: gunicorn sync workers vs the ASGI entry point, with Gemini stubbed.
+
+Both servers get the same worker count; each request to /generate-questions
+waits --delay seconds on the stub upstream.
+
+    python benchmarks/bench_async_serving.py --requests 400 --concurrency 200 --workers 2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import aiohttp
+import jwt
+import requests
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from stub_server import StubServer   # noqa: E402
+
+QUESTIONS = [{"id": 1, "question": "q", "answer": "a", "explanation": "e"}]
+REPLY     = {"candidates": [{"content": {"parts": [{"text": json.dumps(QUESTIONS)}]}}]}
+SECRET    = "bench-secret-" + "x" * 32
+
+
+def _wait_ready(base: str, proc, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with {proc.returncode}")
+        try:
+            if requests.get(base + "/healthz", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+async def _load(base: str, total: int, concurrency: int):
+    token = jwt.encode({"sub": "bench", "email": "bench@example.com",
+                        "exp": int(time.time()) + 3600}, SECRET, algorithm="HS256")
+    headers = {"Authorization": f"Bearer {token}", "Cache-Control": "no-cache"}
+    sem, lat, errors = asyncio.Semaphore(concurrency), [], 0
+
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency),
+                                     timeout=aiohttp.ClientTimeout(total=120)) as client:
+        async def one(i):
+            nonlocal errors
+            async with sem:
+                t0 = time.perf_counter()
+                try:
+                    async with client.post(base + "/generate-questions", headers=headers, json={
+                        "company_name": f"Co{i}", "role": "SDE", "domain": "backend",
+                        "experience_level": "mid", "question_type": "technical",
+                        "difficulty": "medium"}) as r:
+                        await r.read()
+                        errors += r.status != 200
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    errors += 1
+                lat.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        wall = time.perf_counter() - t0
+    lat.sort()
+    return wall, lat, errors
+
+
+def run(label, cmd, port, env, args):
+    proc = subprocess.Popen(cmd, cwd=BACKEND, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        base = f"http://127.0.0.1:{port}"
+        _wait_ready(base, proc)
+        wall, lat, errors = asyncio.run(_load(base, args.requests, args.concurrency))
+        print(f"{label:<28} wall={wall:6.2f}s  rps={args.requests / wall:7.1f}  "
+              f"p50={statistics.median(lat) * 1000:7.0f}ms  p95={lat[int(len(lat) * .95)] * 1000:7.0f}ms  "
+              f"errors={errors}")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests",    type=int,   default=400)
+    ap.add_argument("--concurrency", type=int,   default=200)
+    ap.add_argument("--workers",     type=int,   default=2)
+    ap.add_argument("--delay",       type=float, default=0.5, help="stub upstream latency (s)")
+    ap.add_argument("--port",        type=int,   default=5099)
+    args = ap.parse_args()
+
+    with StubServer(reply=REPLY, delay=args.delay) as stub:
+        env = dict(os.environ, GEMINI_API_KEY="bench", GEMINI_BASE_URL=stub.base + "/v1beta/models",
+                   JWT_SECRET=SECRET, GROQ_API_KEY="", MONGODB_URI="", LOG_LEVEL="WARNING")
+        w, p = str(args.workers), str(args.port)
+        print(f"{args.requests} requests, concurrency {args.concurrency}, {w} workers, "
+              f"{args.delay * 1000:.0f}ms upstream latency")
+        run("gunicorn sync (app:app)",
+            ["gunicorn", "-w", w, "-b", f"127.0.0.1:{p}", "--timeout", "120", "app:app"], p, env, args)
+        run("uvicorn (asgi:asgi_app)",
+            ["uvicorn", "asgi:asgi_app", "--workers", w, "--port", p, "--log-level", "warning"],
+            p, env, args)
+
+
+if __name__ == "__main__":
+    main()
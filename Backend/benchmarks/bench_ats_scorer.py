@@ -0,0 +1,121 @@
+"""
+Local ATS scorer vs Gemini on the fixture set.
+
+Scores every resume in fixtures/ats_pairs.json against every JD with
+ats_scorer and reports latency, mean score per expected-fit label and
+ranking agreement (for each JD, how often a strong/partial resume outscores
+a less suitable one). With GEMINI_API_KEY set, the same pairs also go
+through the previous full-Gemini ATS prompt, and the two scores are compared
+(Spearman rank correlation, mean absolute difference, latency).
+
+    python benchmarks/bench_ats_scorer.py [--repeat 50] [--gemini]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ats_scorer   # noqa: E402
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ats_pairs.json")
+RANK     = {"strong": 2, "partial": 1, "weak": 0}
+LEGACY_PROMPT = ("ATS evaluator. Return ONLY JSON: {{match_score (int), summary (str), missing_keywords (list)}}\n"
+                 "Resume:\n{resume}\nJob Description:\n{jd}")
+
+
+def spearman(a, b):
+    def ranks(x):
+        order = sorted(range(len(x)), key=lambda i: x[i])
+        r = [0.0] * len(x)
+        i = 0
+        while i < len(order):
+            j = i
+            while j + 1 < len(order) and x[order[j + 1]] == x[order[i]]:
+                j += 1
+            for k in range(i, j + 1):
+                r[order[k]] = (i + j) / 2
+            i = j + 1
+        return r
+    ra, rb = ranks(a), ranks(b)
+    ma, mb = statistics.mean(ra), statistics.mean(rb)
+    cov = sum((x - ma) * (y - mb) for x, y in zip(ra, rb))
+    return cov / ((sum((x - ma) ** 2 for x in ra) * sum((y - mb) ** 2 for y in rb)) ** 0.5 or 1)
+
+
+def agreement(pairs, scores):
+    """Fraction of same-JD pairs with different labels that the scores order correctly."""
+    ok = total = 0
+    for (r1, j1, l1), s1 in zip(pairs, scores):
+        for (r2, j2, l2), s2 in zip(pairs, scores):
+            if j1 == j2 and RANK[l1] > RANK[l2]:
+                total += 1
+                ok += s1 > s2
+    return ok / total if total else 0.0
+
+
+def gemini_scores(fx, pairs):
+    from gemini_client import GeminiClient
+    client = GeminiClient(os.environ["GEMINI_API_KEY"])
+    scores, lat = [], []
+    for r, j, _ in pairs:
+        t0 = time.perf_counter()
+        text = client.generate(LEGACY_PROMPT.format(resume=fx["resumes"][r], jd=fx["jds"][j]), endpoint="ats_score")
+        lat.append(time.perf_counter() - t0)
+        m = re.search(r'"match_score"\s*:\s*(\d+)', text or "")
+        scores.append(int(m.group(1)) if m else None)
+    return scores, lat
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--gemini", action="store_true", help="also score with Gemini (needs GEMINI_API_KEY)")
+    args = ap.parse_args()
+
+    with open(FIXTURES) as fh:
+        fx = json.load(fh)
+    labels = {(r, j): lab for r, j, lab in fx["labels"]}
+    R, J   = list(fx["resumes"]), list(fx["jds"])
+    pairs  = [(r, j, labels.get((r, j), "weak")) for r in R for j in J]
+
+    single = []
+    for _ in range(args.repeat):
+        for r, j, _ in pairs:
+            t0 = time.perf_counter()
+            ats_scorer.score(fx["resumes"][r], fx["jds"][j])
+            single.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    for _ in range(args.repeat):
+        matrix = ats_scorer.score_matrix([fx["resumes"][r] for r in R], [fx["jds"][j] for j in J])
+    batch = (time.perf_counter() - t0) / args.repeat
+    local = [matrix[R.index(r)][J.index(j)]["match_score"] for r, j, _ in pairs]
+
+    single.sort()
+    print(f"{len(R)} resumes x {len(J)} JDs")
+    print(f"local score(): p50={statistics.median(single) * 1e3:.2f}ms  p95={single[int(len(single) * .95)] * 1e3:.2f}ms"
+          f"   score_matrix() {len(R)}x{len(J)}: {batch * 1e3:.2f}ms")
+    for lab in RANK:
+        vals = [s for (_, _, l), s in zip(pairs, local) if l == lab]
+        print(f"  {lab:<8} n={len(vals):2d}  mean={statistics.mean(vals):5.1f}  range={min(vals)}-{max(vals)}")
+    print(f"local ranking agreement with labels: {agreement(pairs, local):.1%}")
+
+    if not args.gemini:
+        return
+    if not os.getenv("GEMINI_API_KEY"):
+        sys.exit("--gemini needs GEMINI_API_KEY")
+    remote, lat = gemini_scores(fx, pairs)
+    both = [(a, b) for a, b in zip(local, remote) if b is not None]
+    print(f"gemini: {len(both)}/{len(pairs)} parsed, p50 latency {statistics.median(lat) * 1e3:.0f}ms, "
+          f"ranking agreement {agreement(pairs, [b if b is not None else -1 for b in remote]):.1%}")
+    print(f"local vs gemini: spearman={spearman(*zip(*both)):.3f}  "
+          f"mean |diff|={statistics.mean(abs(a - b) for a, b in both):.1f} points")
+
+
+if __name__ == "__main__":
+    main()
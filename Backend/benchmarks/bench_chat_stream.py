@@ -0,0 +1,102 @@
+"""
+Time-to-first-token: /multi-agent/chat vs /multi-agent/chat/stream.
+
+ChatGroq is replaced by an in-process fake that emits a --tokens long answer
+at --token-ms per token, so the numbers isolate what streaming changes: the
+blocking route returns after the last token, the SSE route after the first.
+
+    python benchmarks/bench_chat_stream.py [--turns 20] [--tokens 200] [--token-ms 15]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import langchain_groq                                                    # noqa: E402
+from langchain_core.language_models.chat_models import BaseChatModel    # noqa: E402
+from langchain_core.messages import AIMessage, AIMessageChunk           # noqa: E402
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult  # noqa: E402
+
+ARGS = None
+
+
+class FakeGroq(BaseChatModel):
+    def __init__(self, **kwargs):
+        super().__init__()
+
+    @property
+    def _llm_type(self):
+        return "fake-groq"
+
+    @staticmethod
+    def _tokens(messages):
+        if "Pick the handler" in messages[-1].content:
+            return ["learning_resource"]
+        return ['{"should_handle": true, "reason": "in domain"}\n'] + ["word "] * ARGS.tokens
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(len(self._tokens(messages)) * ARGS.token_ms / 1e3)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self._tokens(messages))))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(len(self._tokens(messages)) * ARGS.token_ms / 1e3)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content="".join(self._tokens(messages))))])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        for tok in self._tokens(messages):
+            await asyncio.sleep(ARGS.token_ms / 1e3)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=tok))
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    print(f"{label:<34} p50={statistics.median(samples) * 1e3:7.0f}ms  "
+          f"p95={samples[int(len(samples) * .95)] * 1e3:7.0f}ms")
+
+
+def main():
+    global ARGS
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--turns",    type=int,   default=20)
+    ap.add_argument("--tokens",   type=int,   default=200)
+    ap.add_argument("--token-ms", type=float, default=15)
+    ARGS = ap.parse_args()
+
+    langchain_groq.ChatGroq = FakeGroq
+    # every turn repeats the same stateless query; keep the semantic cache from answering it
+    os.environ.update(GROQ_API_KEY="bench", CHAT_LOCAL_ROUTER="0", CHAT_SEMANTIC_CACHE="0", MONGODB_URI="",
+                      LOG_LEVEL="WARNING")
+    import app
+    client = app.app.test_client()
+    body   = {"query": "explain attention", "messages": []}
+
+    blocking, ttft, total = [], [], []
+    for _ in range(ARGS.turns):
+        t0 = time.perf_counter()
+        client.post("/multi-agent/chat", json=body)
+        blocking.append(time.perf_counter() - t0)
+
+        t0, first = time.perf_counter(), None
+        resp = client.post("/multi-agent/chat/stream", json=body, buffered=False)
+        for chunk in resp.response:
+            if first is None and b"event: token" in chunk:
+                first = time.perf_counter() - t0
+        total.append(time.perf_counter() - t0)
+        ttft.append(first)
+        resp.close()
+
+    print(f"{ARGS.turns} turns, {ARGS.tokens}-token answers at {ARGS.token_ms:.0f}ms/token")
+    report("blocking /multi-agent/chat", blocking)
+    report("stream: first token", ttft)
+    report("stream: done event", total)
+    print("server-side:", json.dumps(app.chat_ttft.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-call requests.post vs pooled GeminiClient against a local TLS stub.
+
+    python benchmarks/bench_gemini_pool.py --calls 400 --concurrency 16
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gemini_client import GeminiClient          # noqa: E402
+from stub_server import StubServer              # noqa: E402
+
+PROMPT = "You are an expert resume reviewer. Respond ONLY with JSON.\nResume:\n" + "x" * 2000
+
+
+def run(label, call, calls, concurrency, stub):
+    stub.reset()
+    lat = []
+
+    def one(_):
+        t0 = time.perf_counter()
+        call()
+        lat.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        list(ex.map(one, range(calls)))
+    wall = time.perf_counter() - t0
+    lat.sort()
+    print(f"{label:<24} wall={wall:6.2f}s  rps={calls / wall:7.1f}  "
+          f"mean={statistics.mean(lat) * 1000:6.1f}ms  p95={lat[int(len(lat) * .95)] * 1000:6.1f}ms  "
+          f"connections={stub.connections}")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--calls",       type=int,   default=400)
+    ap.add_argument("--concurrency", type=int,   default=16)
+    ap.add_argument("--delay",       type=float, default=0.02, help="stub think time (s)")
+    ap.add_argument("--no-tls",      action="store_true")
+    args = ap.parse_args()
+
+    with StubServer(delay=args.delay, tls=not args.no_tls) as stub:
+        client = GeminiClient("bench-key", base_url=stub.base + "/v1beta/models",
+                              pool_size=args.concurrency)
+        client.session.trust_env = False   # keep REQUESTS_CA_BUNDLE from overriding verify
+        client.session.verify = stub.cafile or True
+        url = client.url()
+
+        def bare():
+            r = requests.post(f"{url}?key=bench-key",
+                              json={"contents": [{"parts": [{"text": PROMPT}]}]},
+                              timeout=30, verify=stub.cafile or True)
+            r.json()
+
+        def pooled():
+            client.generate(PROMPT)
+
+        print(f"{args.calls} calls, concurrency {args.concurrency}, "
+              f"{stub.scheme.upper()} stub, {args.delay * 1000:.0f}ms think time")
+        run("requests.post per call", bare,   args.calls, args.concurrency, stub)
+        run("GeminiClient (pooled)",  pooled, args.calls, args.concurrency, stub)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
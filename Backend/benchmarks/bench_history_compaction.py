@@ -0,0 +1,81 @@
+"""
+Prompt-token savings of token-budgeted history with rolling summaries.
+
+Replays synthetic long chat sessions (short questions, mostly short answers,
+some tutorial-length replies) and, for every turn, counts the estimated
+history tokens the agent prompt would carry under:
+
+  last-20    the old `history[-20:]` slice
+  compacted  history.compact() per model budget, with the rolling summary
+             folded whenever compact() asks for it (summaries are a fixed
+             150-word stand-in; no LLM is called)
+
+    python benchmarks/bench_history_compaction.py [--sessions 50] [--turns 40]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import MODEL_BUDGETS, compact, estimate_tokens   # noqa: E402
+
+WORDS   = ("model attention layer vector embedding python service latency resume interview "
+           "system design cache queue token prompt retrieval index kubernetes api").split()
+SUMMARY = " ".join(["summary"] * 150)
+
+
+def words(rng, lo, hi):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(lo, hi)))
+
+
+def session(rng, turns):
+    msgs = []
+    for _ in range(turns):
+        msgs.append({"role": "user", "content": words(rng, 8, 60)})
+        long = rng.random() < 0.25
+        msgs.append({"role": "assistant", "content": words(rng, 800, 2500) if long else words(rng, 40, 250)})
+    return msgs
+
+
+def tokens(messages):
+    return sum(estimate_tokens(m["content"]) for m in messages)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sessions", type=int, default=50)
+    ap.add_argument("--turns",    type=int, default=40)
+    args = ap.parse_args()
+
+    rng      = random.Random(0)
+    sessions = [session(rng, args.turns) for _ in range(args.sessions)]
+    baseline = [tokens(s[:2 * t][-20:]) for s in sessions for t in range(args.turns)]
+    print(f"{args.sessions} sessions x {args.turns} turns, "
+          f"{statistics.mean(tokens(s) for s in sessions):.0f} history tokens per full session")
+    print(f"{'last-20':<34} mean={statistics.mean(baseline):7.0f}  max={max(baseline):6d} tokens/turn")
+
+    for model, budget in MODEL_BUDGETS.items():
+        per_turn, folds, spent = [], 0, 0.0
+        for s in sessions:
+            summary = None
+            for t in range(args.turns):
+                t0 = time.perf_counter()
+                c  = compact(s[:2 * t], budget, summary)
+                spent += time.perf_counter() - t0
+                per_turn.append(c.tokens)
+                if c.fold:
+                    summary = {"upto": c.fold_upto, "digest": c.fold_digest, "text": SUMMARY}
+                    folds += 1
+        saved = 1 - sum(per_turn) / sum(baseline)
+        print(f"{'compacted ' + model:<34} mean={statistics.mean(per_turn):7.0f}  max={max(per_turn):6d} "
+              f"tokens/turn  saved={saved:6.1%}  summaries/session={folds / args.sessions:4.1f}  "
+              f"compact()={spent / len(per_turn) * 1e6:5.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Router accuracy and latency: local intent classifier vs the LLM routers.
+
+Trains on a stratified split of data/intent_queries.jsonl and scores the
+held-out queries. With GROQ_API_KEY set, the same queries also go through
+the single-call LLM router and the legacy _categorize/_route_main chain.
+
+    python benchmarks/bench_intent_router.py [--test-frac 0.25] [--llm]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intent_classifier import IntentClassifier                                      # noqa: E402
+from train_intent_classifier import calibrate, fit, load_data, out_of_fold_logits   # noqa: E402
+
+
+def split(texts, labels, frac, seed=0):
+    rng, train, test = np.random.default_rng(seed), [], []
+    for label in sorted(set(labels)):
+        idx = rng.permutation([i for i, l in enumerate(labels) if l == label])
+        cut = max(1, int(len(idx) * frac))
+        test += idx[:cut].tolist(); train += idx[cut:].tolist()
+    return train, test
+
+
+def report(label, preds, gold, lat):
+    acc = np.mean([p == g for p, g in zip(preds, gold)])
+    lat = sorted(lat)
+    print(f"{label:<30} accuracy={acc:6.1%}  mean={statistics.mean(lat) * 1e3:8.3f}ms  "
+          f"p95={lat[int(len(lat) * .95)] * 1e3:8.3f}ms")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--test-frac", type=float, default=0.25)
+    ap.add_argument("--target-precision", type=float, default=0.95)
+    ap.add_argument("--llm", action="store_true", help="also call Groq (needs GROQ_API_KEY)")
+    args = ap.parse_args()
+
+    texts, labels = load_data()
+    names         = sorted(set(labels))
+    tr, te        = split(texts, labels, args.test_frac)
+    tr_x, tr_y    = [texts[i] for i in tr], [labels[i] for i in tr]
+    te_x, te_y    = [texts[i] for i in te], [labels[i] for i in te]
+
+    oof = out_of_fold_logits(tr_x, tr_y, names)
+    temperature, threshold, _ = calibrate(oof, np.array([names.index(l) for l in tr_y]),
+                                          args.target_precision)
+    vocab, idf, W, b = fit(tr_x, tr_y, names)
+    clf = IntentClassifier({"labels": names, "vocab": sorted(vocab, key=vocab.get), "idf": idf,
+                            "W": W, "b": b, "temperature": temperature, "threshold": threshold})
+
+    print(f"train={len(tr_x)} test={len(te_x)} threshold={threshold:.3f} temperature={temperature:.2f}")
+    preds, confs, lat = [], [], []
+    for q in te_x:
+        t0 = time.perf_counter()
+        label, conf, _ = clf.predict(q)
+        lat.append(time.perf_counter() - t0)
+        preds.append(label); confs.append(conf)
+    report("local (all queries)", preds, te_y, lat)
+
+    covered = [i for i, c in enumerate(confs) if c >= threshold]
+    if covered:
+        report(f"local (conf>=thr, {len(covered) / len(te_x):.0%} cov)",
+               [preds[i] for i in covered], [te_y[i] for i in covered], [lat[i] for i in covered])
+
+    if not args.llm:
+        print("(pass --llm with GROQ_API_KEY set to compare against the Groq routers)")
+        return
+    import app
+    if app.llm_route is None:
+        sys.exit("multi-agent workflow unavailable (GROQ_API_KEY missing?)")
+
+    async def llm(legacy):
+        out, lat = [], []
+        for q in te_x:
+            t0 = time.perf_counter()
+            out.append(await app.llm_route(q, legacy=legacy))
+            lat.append(time.perf_counter() - t0)
+        return out, lat
+
+    for legacy, name in [(True, "LLM _route_main chain"), (False, "LLM single-call router")]:
+        out, l = asyncio.run(llm(legacy))
+        report(name, out, te_y, l)
+
+    hybrid = [preds[i] if confs[i] >= threshold else out[i] for i in range(len(te_x))]
+    report("hybrid (local, LLM fallback)", hybrid, te_y,
+           [lat[i] if confs[i] >= threshold else l[i] for i in range(len(te_x))])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+jobspy DataFrame -> /api/jobs response body: previous path vs job_json.
+
+Builds a synthetic DataFrame with jobspy's columns (markdown descriptions,
+missing salaries and dates as NaN/None) at each size and times
+  legacy   df.to_dict("records") + per-field NaN loop + Flask jsonify
+  columnar job_json.records() + job_json.encode() (plain and gzip)
+reporting the conversion time and the response size.
+
+    python benchmarks/bench_job_json.py [--sizes 10 100 1000] [--repeat 20]
+"""
+
+import argparse
+import datetime as dt
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np                 # noqa: E402
+import pandas as pd                # noqa: E402
+from flask import Flask, jsonify   # noqa: E402
+
+import job_json                    # noqa: E402
+
+COLUMNS = ["id", "site", "job_url", "job_url_direct", "title", "company", "location", "date_posted", "job_type",
+           "salary_source", "interval", "min_amount", "max_amount", "currency", "is_remote", "job_level",
+           "job_function", "listing_type", "emails", "description", "company_industry", "company_url",
+           "company_logo", "company_url_direct", "company_addresses", "company_num_employees", "company_revenue",
+           "company_description", "skills", "experience_range", "company_rating", "company_reviews_count",
+           "vacancy_count", "work_from_home_type"]
+WORDS = "python sql data pipeline team build scalable services cloud aws ml model product customers".split()
+
+
+def make_df(n: int, rng: random.Random) -> pd.DataFrame:
+    rows = []
+    for i in range(n):
+        paid = rng.random() < 0.4
+        rows.append({
+            "id": f"in-{i:08x}", "site": "indeed", "job_url": f"https://in.indeed.com/viewjob?jk={i:08x}",
+            "job_url_direct": None, "title": f"Software Engineer {i}", "company": f"Company {i % 97}",
+            "location": "Bengaluru, KA, IN",
+            "date_posted": dt.date(2026, 1 + i % 12, 1 + i % 28) if rng.random() < 0.9 else None,
+            "job_type": "fulltime" if rng.random() < 0.7 else None, "salary_source": "direct_data" if paid else None,
+            "interval": "yearly" if paid else None, "min_amount": rng.randint(5, 20) * 1e5 if paid else np.nan,
+            "max_amount": rng.randint(20, 40) * 1e5 if paid else np.nan, "currency": "INR" if paid else None,
+            "is_remote": rng.random() < 0.2, "job_level": None, "job_function": None, "listing_type": None,
+            "emails": None, "description": "\n\n".join(" ".join(rng.choices(WORDS, k=60)) for _ in range(6)),
+            "company_industry": None, "company_url": f"https://example.com/c{i % 97}", "company_logo": None,
+            "company_url_direct": None, "company_addresses": None, "company_num_employees": "1,001 to 5,000",
+            "company_revenue": None, "company_description": None, "skills": None, "experience_range": None,
+            "company_rating": np.nan, "company_reviews_count": np.nan, "vacancy_count": np.nan,
+            "work_from_home_type": None})
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def legacy(df, flask_app):
+    jobs = df.to_dict("records")
+    for job in jobs:
+        for k, v in job.items():
+            if isinstance(v, float) and math.isnan(v): job[k] = None
+    with flask_app.app_context():
+        return jsonify({"jobs": jobs}).get_data()
+
+
+def columnar(df, accept=""):
+    return job_json.encode({"jobs": job_json.records(df)}, accept)[0]
+
+
+def timed(fn, repeat):
+    lat = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        lat.append(time.perf_counter() - t0)
+    return statistics.median(lat), out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes",  type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+    flask_app, rng = Flask(__name__), random.Random(3)
+
+    print(f"{'jobs':>5}  {'path':<16} {'p50 ms':>8} {'body KB':>9}")
+    for n in args.sizes:
+        df = make_df(n, rng)
+        for name, fn in (("legacy jsonify", lambda: legacy(df, flask_app)),
+                         ("columnar", lambda: columnar(df)),
+                         ("columnar+gzip", lambda: columnar(df, "gzip"))):
+            t, body = timed(fn, args.repeat)
+            print(f"{n:5d}  {name:<16} {t * 1e3:8.2f} {len(body) / 1024:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
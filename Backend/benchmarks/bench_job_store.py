@@ -0,0 +1,95 @@
+"""
+Local job_postings search vs live jobspy scraping.
+
+Seeds --postings synthetic postings into a scratch collection (database
+prepwise_bench on MONGODB_URI, dropped afterwards), then times
+JobStore.lookup() for a set of canonical searches. With --live, the same
+searches are also scraped from Indeed through jobspy (network required) and
+the two latencies are compared.
+
+    MONGODB_URI=mongodb://localhost:27017 python benchmarks/bench_job_store.py [--postings 20000] [--repeat 20] [--live]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo import MongoClient   # noqa: E402
+
+from job_store import JobStore    # noqa: E402
+
+ROLES     = ["data scientist", "software engineer", "ml engineer", "backend developer", "frontend developer",
+             "devops engineer", "product manager", "data analyst", "qa engineer", "android developer"]
+LEVELS    = ["", "senior ", "junior ", "lead ", "staff "]
+COMPANIES = [f"Company {i}" for i in range(300)]
+PLACES    = [("bengaluru", "india", "Bengaluru, KA, IN"), ("hyderabad", "india", "Hyderabad, TS, IN"),
+             ("pune", "india", "Pune, MH, IN"), ("new york, ny", "usa", "New York, NY, US"),
+             ("london, uk", "united kingdom", "London, ENG, GB")]
+SEARCHES  = [("data scientist", "bengaluru", "india"), ("software engineer", "india", "india"),
+             ("ml engineer", "new york, ny", "usa"), ("product manager", "london, uk", "united kingdom")]
+
+
+def seed(store, n, rng):
+    for start in range(0, n, 1000):
+        by_place = {}
+        for i in range(start, min(n, start + 1000)):
+            loc, country, label = rng.choice(PLACES)
+            by_place.setdefault((loc, country), []).append({
+                "id": f"bench-{i}", "title": (rng.choice(LEVELS) + rng.choice(ROLES)).title(),
+                "company": rng.choice(COMPANIES), "location": label, "job_url": f"https://example.com/jobs/{i}",
+                "date_posted": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "description": "Lorem ipsum " * 40})
+        for (loc, country), jobs in by_place.items():
+            store.upsert(jobs, loc, country)
+
+
+def timed(fn, repeat):
+    lat = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        lat.append(time.perf_counter() - t0)
+    return sorted(lat), out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--postings", type=int, default=20000)
+    ap.add_argument("--repeat",   type=int, default=20)
+    ap.add_argument("--wanted",   type=int, default=10)
+    ap.add_argument("--live", action="store_true", help="also scrape the same searches with jobspy")
+    args = ap.parse_args()
+    if not os.getenv("MONGODB_URI"):
+        sys.exit("set MONGODB_URI to a MongoDB the benchmark may write to")
+
+    client = MongoClient(os.environ["MONGODB_URI"])
+    db = client["prepwise_bench"]
+    db.drop_collection("job_postings")
+    store = JobStore(db["job_postings"])
+    t0 = time.perf_counter()
+    seed(store, args.postings, random.Random(7))
+    print(f"seeded {db['job_postings'].count_documents({})} postings in {time.perf_counter() - t0:.1f}s")
+
+    try:
+        for q, loc, country in SEARCHES:
+            lat, (docs, covered) = timed(lambda: store.lookup(q, loc, country, args.wanted), args.repeat)
+            line = (f"{q!r:22} {loc!r:16} local: {len(docs):3d} jobs covered={covered!s:5}  "
+                    f"p50={statistics.median(lat) * 1e3:7.1f}ms  p95={lat[int(len(lat) * .95)] * 1e3:7.1f}ms")
+            if args.live:
+                from jobspy import scrape_jobs
+                slat, df = timed(lambda: scrape_jobs(site_name=["indeed"], search_term=q, location=loc,
+                                                     results_wanted=args.wanted, country_indeed=country), 1)
+                line += f"   scrape: {len(df) if df is not None else 0:3d} jobs {slat[0] * 1e3:8.0f}ms"
+            print(line)
+        print("stats:", store.stats())
+    finally:
+        db.drop_collection("job_postings")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Resume PDF text extraction throughput per engine.
+
+Generates a deterministic corpus of multi-page resumes (1-4 pages) plus one
+long document, then reports pages/sec for PyMuPDF and pdfplumber, and
+serial vs process-pool extraction of the long document.
+
+    python benchmarks/bench_pdf_extract.py [--resumes 40] [--long-pages 60] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pdf_text                                    # noqa: E402
+from pdf_text import extract_pages, pymupdf        # noqa: E402
+
+WORDS = ("python kubernetes react developed led designed optimized latency pipeline team "
+         "service api cache database resume experience project university internship").split()
+
+
+def make_pdf(path, pages, rng):
+    doc = pymupdf.open()
+    for p in range(pages):
+        page = doc.new_page()
+        lines = [f"Section {p + 1}"] + [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14)))
+                                        for _ in range(45)]
+        page.insert_textbox(pymupdf.Rect(50, 50, 560, 800), "\n".join(lines), fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def timed(fn, paths):
+    t0 = time.perf_counter()
+    pages = sum(len(fn(p)) for p in paths)
+    return pages, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--resumes",    type=int, default=40)
+    ap.add_argument("--long-pages", type=int, default=60)
+    ap.add_argument("--workers",    type=int, default=4)
+    args = ap.parse_args()
+    if pymupdf is None:
+        sys.exit("PyMuPDF is required to build the corpus")
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        resumes = []
+        for i in range(args.resumes):
+            resumes.append(os.path.join(tmp, f"resume{i}.pdf"))
+            make_pdf(resumes[-1], rng.randint(1, 4), rng)
+        long_doc = os.path.join(tmp, "long.pdf")
+        make_pdf(long_doc, args.long_pages, rng)
+
+        print(f"{args.resumes} resumes, long document {args.long_pages} pages")
+        for engine in pdf_text.ENGINES:
+            pages, secs = timed(lambda p: extract_pages(p, engine, workers=1), resumes)
+            print(f"{engine:<11} resumes   {pages:4d} pages  {pages / secs:8.0f} pages/s")
+            _, serial = timed(lambda p: extract_pages(p, engine, workers=1), [long_doc])
+            extract_pages(long_doc, engine, workers=args.workers)           # warm the pool
+            _, par = timed(lambda p: extract_pages(p, engine, workers=args.workers), [long_doc])
+            print(f"{engine:<11} long doc  serial {args.long_pages / serial:8.0f} pages/s  "
+                  f"{args.workers} workers {args.long_pages / par:8.0f} pages/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Resume upload handling: in-memory parsing vs the old NamedTemporaryFile round-trip.
+
+Posts generated resume PDFs to /improve-resume from --concurrency threads
+through the Flask test client, with Gemini stubbed out so only upload
+handling and text extraction are timed. The old handler (save to a
+delete=False temp file, parse the path, os.remove) is mounted next to it
+for comparison. I/O is read from /proc/self/io: syscr/syscw are read and
+write syscalls, which is what temp-file round-trips add per request.
+
+    python benchmarks/bench_resume_upload.py [--requests 200] [--concurrency 8] [--pages 2]
+"""
+
+import argparse
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_pdf_extract import make_pdf   # noqa: E402
+
+IO_FIELDS = ("syscr", "syscw", "rchar", "wchar")
+
+
+def proc_io():
+    with open("/proc/self/io") as fh:
+        rows = dict(line.split(": ") for line in fh.read().splitlines())
+    return {k: int(rows[k]) for k in IO_FIELDS}
+
+
+def run(app_module, path, pdf, args):
+    token = app_module.issue_jwt("bench", "bench@example.com")
+
+    def one(_):
+        client = app_module.app.test_client()
+        t0 = time.perf_counter()
+        resp = client.post(path, headers={"Authorization": f"Bearer {token}"},
+                           data={"file": (io.BytesIO(pdf), "resume.pdf")}, content_type="multipart/form-data")
+        assert resp.status_code == 200, resp.get_data(as_text=True)
+        return time.perf_counter() - t0
+
+    before, t0 = proc_io(), time.perf_counter()
+    with ThreadPoolExecutor(args.concurrency) as pool:
+        lat = sorted(pool.map(one, range(args.requests)))
+    wall  = time.perf_counter() - t0
+    after = proc_io()
+    per   = {k: (after[k] - before[k]) / args.requests for k in IO_FIELDS}
+    print(f"{path:<28} p50={statistics.median(lat) * 1e3:6.1f}ms  p95={lat[int(len(lat) * .95)] * 1e3:6.1f}ms  "
+          f"{args.requests / wall:6.0f} req/s  io/req: {per['syscr']:5.1f} reads {per['syscw']:5.1f} writes  "
+          f"{per['wchar'] / 1024:7.1f} KiB written")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests",    type=int, default=200)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--pages",       type=int, default=2)
+    args = ap.parse_args()
+
+    os.environ.update(GROQ_API_KEY="", MONGODB_URI="", LOG_LEVEL="WARNING", JWT_SECRET="bench-" + "x" * 32)
+    import app
+    from flask import jsonify, request
+    app.get_gemini_resume_improvements = lambda text, use_cache=True: {"chars": len(text)}
+
+    @app.app.route("/bench/improve-resume-tempfile", methods=["POST"])
+    @app.require_auth
+    def improve_resume_tempfile():
+        f = request.files["file"]
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            f.save(tmp.name); p = tmp.name
+        try:
+            return jsonify(app.get_gemini_resume_improvements(app.extract_pdf_text(p))), 200
+        finally:
+            os.path.exists(p) and os.remove(p)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_pdf(os.path.join(tmp, "resume.pdf"), args.pages, random.Random(0))
+        with open(os.path.join(tmp, "resume.pdf"), "rb") as fh:
+            pdf = fh.read()
+
+    print(f"{args.requests} uploads of a {len(pdf) / 1024:.0f} KiB, {args.pages}-page resume, "
+          f"concurrency {args.concurrency}, spool threshold {app.UPLOAD_SPOOL_BYTES / 1024:.0f} KiB")
+    for path in ("/bench/improve-resume-tempfile", "/improve-resume") * 2:   # second pass is warm
+        run(app, path, pdf, args)
+    print("pdf:", {k: v for k, v in app.pdf_text.stats().items() if k.startswith("from_")})
+
+
+if __name__ == "__main__":
+    main()
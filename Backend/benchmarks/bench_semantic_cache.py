@@ -0,0 +1,62 @@
+"""
+Semantic chat cache: lookup latency at capacity and paraphrase hit quality.
+
+Fills the cache to --entries with synthetic questions, then times get() and
+checks that paraphrases of cached questions hit while questions about a
+different subject miss.
+
+    python benchmarks/bench_semantic_cache.py [--entries 2048] [--threshold 0.9]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic_cache import SemanticCache   # noqa: E402
+
+TOPICS = ("rag transformers attention embeddings docker kubernetes kafka redis graphql react "
+          "pandas pytorch tensorflow lora quantization tokenization backpropagation dropout "
+          "gradient-descent vector-databases microservices").split()
+ASK    = ["what is {}", "explain {}", "how does {} work", "{} explained", "tell me about {}"]
+PARAPHRASE = ["What is {}?", "explain {}", "tell me about {}", "can you explain {} please"]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--entries",   type=int,   default=2048)
+    ap.add_argument("--threshold", type=float, default=0.9)
+    args = ap.parse_args()
+
+    rng   = random.Random(0)
+    cache = SemanticCache(max_entries=args.entries, threshold=args.threshold)
+    for i in range(args.entries):
+        topic = f"{rng.choice(TOPICS)} {rng.choice(TOPICS)} v{i}"
+        cache.put("learning_resource", rng.choice(ASK).format(topic), f"answer {i}")
+    for t in TOPICS:
+        cache.put("learning_resource", f"what is {t}", f"answer about {t}")
+
+    lat, hits, wrong = [], 0, 0
+    for t in TOPICS:
+        for para in PARAPHRASE:
+            t0 = time.perf_counter()
+            got = cache.get("learning_resource", para.format(t))
+            lat.append(time.perf_counter() - t0)
+            hits  += got is not None
+            wrong += got is not None and got != f"answer about {t}"
+    misses_ok = sum(cache.get("learning_resource", f"what is {t}-variant-{i}") is None
+                    for i, t in enumerate(TOPICS))
+
+    lat.sort()
+    print(f"{cache.stats()['entries']} entries, threshold {args.threshold}")
+    print(f"get() p50={statistics.median(lat) * 1e3:.3f}ms  p95={lat[int(len(lat) * .95)] * 1e3:.3f}ms")
+    print(f"paraphrase hits {hits}/{len(lat)}  wrong answers {wrong}  "
+          f"different-subject misses {misses_ok}/{len(TOPICS)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Single-flight coalescing: upstream Gemini calls for bursts of identical requests.
+
+Fires --burst concurrent /generate-questions requests for each of --distinct
+parameter sets (with Cache-Control: no-cache, so the response cache cannot
+absorb them) at a local Gemini stub that answers after --delay-ms, with
+single-flight on and off, and counts what reached the upstream.
+
+    python benchmarks/bench_single_flight.py [--distinct 4] [--burst 25] [--delay-ms 500]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_server import StubServer   # noqa: E402
+
+QUESTIONS = {"candidates": [{"content": {"parts": [{"text": json.dumps(
+    [{"id": 1, "question": "q", "answer": "a", "explanation": "e"}])}]}}]}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--distinct", type=int,   default=4)
+    ap.add_argument("--burst",    type=int,   default=25)
+    ap.add_argument("--delay-ms", type=float, default=500)
+    args = ap.parse_args()
+
+    with StubServer(QUESTIONS, delay=args.delay_ms / 1e3) as stub:
+        os.environ.update(GEMINI_API_KEY="bench", GEMINI_BASE_URL=stub.base, GROQ_API_KEY="",
+                          MONGODB_URI="", LOG_LEVEL="WARNING", JWT_SECRET="bench-" + "x" * 32)
+        import app
+        token = app.issue_jwt("bench", "bench@example.com")
+        bodies = [{"company_name": f"Company{i}", "role": "SDE", "domain": "backend",
+                   "experience_level": "mid", "question_type": "technical", "difficulty": "medium"}
+                  for i in range(args.distinct)]
+
+        def one(body):
+            t0 = time.perf_counter()
+            r = app.app.test_client().post("/generate-questions", json=body,
+                                           headers={"Authorization": f"Bearer {token}", "Cache-Control": "no-cache"})
+            assert r.status_code == 200, r.get_data(as_text=True)
+            return time.perf_counter() - t0
+
+        print(f"{args.distinct} distinct requests x burst of {args.burst}, upstream {args.delay_ms:.0f}ms")
+        for enabled in (False, True):
+            app.gemini_flight.enabled = enabled
+            stub.reset()
+            before = app.gemini_flight.stats()["shared"]
+            with ThreadPoolExecutor(args.distinct * args.burst) as pool:
+                lat = sorted(pool.map(one, [b for b in bodies for _ in range(args.burst)]))
+            saved = app.gemini_flight.stats()["shared"] - before
+            print(f"single-flight {'on ' if enabled else 'off'}  upstream calls={stub.requests:4d}  saved={saved:4d}  "
+                  f"p50={statistics.median(lat) * 1e3:6.0f}ms  p95={lat[int(len(lat) * .95)] * 1e3:6.0f}ms")
+        print("metrics:", json.dumps(app.gemini_flight.stats()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Local stub upstream for benchmarks: a threaded HTTP/1.1 server (optionally
+TLS with a throwaway self-signed cert) that counts accepted connections.
+"""
+
+import json
+import os
+import socket
+import ssl
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GEMINI_REPLY = {"candidates": [{"content": {"parts": [{"text": '{"suggestions": "ok"}'}]}}]}
+
+
+def _self_signed_cert(tmpdir: str):
+    from cryptography import x509
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from cryptography.x509.oid import NameOID
+
+    key  = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now  = datetime.now(timezone.utc)
+    cert = (x509.CertificateBuilder().subject_name(name).issuer_name(name)
+            .public_key(key.public_key()).serial_number(x509.random_serial_number())
+            .not_valid_before(now - timedelta(minutes=1)).not_valid_after(now + timedelta(hours=1))
+            .add_extension(x509.SubjectAlternativeName([x509.DNSName("localhost")]), critical=False)
+            .sign(key, hashes.SHA256()))
+    cert_path = os.path.join(tmpdir, "cert.pem")
+    key_path  = os.path.join(tmpdir, "key.pem")
+    with open(cert_path, "wb") as f:
+        f.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as f:
+        f.write(key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                  serialization.NoEncryption()))
+    return cert_path, key_path
+
+
+class StubServer:
+    """
+    Serve `reply` (dict, or callable(path, body) -> (status, dict)) after `delay` seconds.
+    """
+
+    def __init__(self, reply=None, delay: float = 0.0, tls: bool = False):
+        self.reply       = reply or GEMINI_REPLY
+        self.delay       = delay
+        self.connections = 0
+        self.requests    = 0
+        self.cafile      = None
+        self._lock       = threading.Lock()
+        self._tmp        = tempfile.TemporaryDirectory() if tls else None
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                with stub._lock:
+                    stub.connections += 1
+                super().setup()
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def log_message(self, *args):
+                pass
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body   = self.rfile.read(length) if length else b""
+                with stub._lock:
+                    stub.requests += 1
+                if stub.delay:
+                    time.sleep(stub.delay)
+                status, payload = (stub.reply(self.path, body) if callable(stub.reply)
+                                   else (200, stub.reply))
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET  = _respond
+            do_POST = _respond
+
+        ThreadingHTTPServer.daemon_threads = True
+        ThreadingHTTPServer.request_queue_size = 1024
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if tls:
+            cert, key = _self_signed_cert(self._tmp.name)
+            ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            ctx.load_cert_chain(cert, key)
+            self.httpd.socket = ctx.wrap_socket(self.httpd.socket, server_side=True)
+            self.cafile = cert
+        self.scheme = "https" if tls else "http"
+        self.port   = self.httpd.server_address[1]
+        self.base   = f"{self.scheme}://localhost:{self.port}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._tmp:
+            self._tmp.cleanup()
+
+    def reset(self):
+        with self._lock:
+            self.connections = 0
+            self.requests    = 0
@@ -0,0 +1,172 @@
+"""
+Incremental parser for the agents' continuity replies.
+
+Agents answer the domain check with a JSON object first
+({"should_handle": true/false, "reason": "..."}) and, if they accept, the
+answer after it. ContinuityParser is fed the reply chunk by chunk as the
+model streams it: a decline is known as soon as `"should_handle": false`
+appears, an accept once the object closes and answer text follows, so the
+caller can stop generation early or start forwarding the answer. Replies
+that are not JSON-first are judged on the complete text with the same
+fallbacks as the old one-shot parser.
+"""
+
+import json
+import re
+
+_FALSE_RE = re.compile(r'"should_handle"\s*:\s*false', re.IGNORECASE)
+_PAIR_RE  = re.compile(r'\{\s*"should_handle"\s*:\s*(true|false)\s*,\s*"reason"\s*:\s*"([^"]+)"\s*\}',
+                       re.IGNORECASE)
+_TAIL_RE  = re.compile(r"\s*`{1,3}\s*$")
+_REJECTIONS = ('"should_handle": false', "cannot handle", "not my domain", "not related to",
+               "outside my expertise")
+
+
+def _skip_fence(t: str, i: int, fence: bool = True):
+    """Offset of the first character after whitespace (and, if `fence`, an optional ``` or
+    ```json line) from i; None while that is not yet known."""
+    i += len(t[i:]) - len(t[i:].lstrip())
+    if not t[i:]:
+        return None
+    if not fence:
+        return i
+    if "```json".startswith(t[i:].lower()):
+        return None
+    if t.startswith("```", i):
+        i += 3
+        if t[i:i + 4].lower() == "json":
+            i += 4
+        i += len(t[i:]) - len(t[i:].lstrip())
+        if i >= len(t):
+            return None
+    return i
+
+
+class ContinuityParser:
+    def __init__(self):
+        self.text          = ""
+        self.should_handle = None    # None until decided
+        self.reason        = ""
+        self._start = None           # offset of the leading "{", -1 if the reply is not JSON-first
+        self._fenced = False         # the JSON sits inside a ```json block
+        self._end   = None           # offset just past its matching "}"
+        self._scan, self._depth, self._in_str, self._esc = 0, 0, False, False
+        self._body = None            # offset where the answer starts
+        self._sent = 0
+
+    def feed(self, chunk: str) -> str:
+        """Add streamed text; returns answer text released by this chunk (only once accepted)."""
+        self.text += chunk or ""
+        if self.should_handle is None:
+            self._advance()
+        if not self.should_handle:
+            return ""
+        tail = _TAIL_RE.search(self.text, self._sent)       # hold back a possible closing fence
+        cut  = tail.start() if tail else len(self.text)
+        out, self._sent = self.text[self._sent:cut], max(self._sent, cut)
+        return out
+
+    def flush(self) -> str:
+        """Answer text still held back at the end of the stream (a trailing fence is dropped)."""
+        if not self.should_handle:
+            return ""
+        out = re.sub(r"```\s*$", "", self.text[self._sent:]).rstrip()
+        self._sent = len(self.text)
+        return out
+
+    def finish(self) -> dict:
+        """The decision for the complete reply: {"should_handle", "response", "reason"}."""
+        if self.should_handle:
+            body = re.sub(r"```\s*$", "", self.text[self._body:]).strip()
+            return {"should_handle": True, "response": body, "reason": self.reason}
+        if self.should_handle is False:
+            return self._decline(self.reason)
+        if self._end is not None and self._start >= 0:
+            return self._decline("No response content")
+
+        content = re.sub(r"```json\s*", "", self.text)
+        content = re.sub(r"```\s*$", "", content).strip()
+        m = _PAIR_RE.search(content)
+        if m:
+            rest = content[m.end():].strip()
+            if m.group(1).lower() == "true" and rest:
+                return {"should_handle": True, "response": rest, "reason": m.group(2)}
+            return self._decline(m.group(2))
+        if any(p in content.lower() for p in _REJECTIONS):
+            return self._decline("Explicit rejection")
+        return self._decline("No valid format")
+
+    @staticmethod
+    def _decline(reason: str) -> dict:
+        return {"should_handle": False, "response": None, "reason": reason}
+
+    def _advance(self):
+        t = self.text
+        if self._start is None:
+            i = _skip_fence(t, 0)
+            if i is None:
+                return
+            self._start = self._scan = i if t[i] == "{" else -1
+            self._fenced = t.lstrip().startswith("```")
+
+        if self._start < 0 or self._end is None:
+            if _FALSE_RE.search(t, max(self._start, 0)):
+                self.should_handle, self.reason = False, "Explicit rejection"
+                return
+        if self._start < 0:
+            return
+
+        if self._end is None:
+            for k in range(self._scan, len(t)):
+                c = t[k]
+                if self._in_str:
+                    if self._esc:        self._esc = False
+                    elif c == "\\":      self._esc = True
+                    elif c == '"':       self._in_str = False
+                elif c == '"':           self._in_str = True
+                elif c == "{":           self._depth += 1
+                elif c == "}":
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._end = k + 1
+                        break
+            self._scan = len(t)
+            if self._end is None:
+                return
+            try:
+                head = json.loads(t[self._start:self._end])
+            except ValueError:
+                head = None
+            if not isinstance(head, dict):
+                self._start, self._end = -1, None
+                return
+            self.reason = str(head.get("reason", ""))
+            if not head.get("should_handle", False):
+                self.should_handle = False
+                return
+
+        body = _skip_fence(t, self._end, self._fenced)
+        if body is not None:
+            self.should_handle, self._body, self._sent = True, body, body
+
+
+def parse_continuity(content: str) -> dict:
+    """One-shot parse of a complete reply."""
+    p = ContinuityParser()
+    p.feed(content)
+    return p.finish()
+
+
+def check_stream(chunks) -> dict:
+    """Consume a model's .stream() output, stopping generation as soon as the agent declines."""
+    p = ContinuityParser()
+    try:
+        for chunk in chunks:
+            p.feed(chunk.content)
+            if p.should_handle is False:
+                break
+    finally:
+        close = getattr(chunks, "close", None)
+        if close:
+            close()
+    return p.finish()
@@ -0,0 +1,176 @@
+"""
+Shared Gemini REST client.
+
+One pooled keep-alive session per process so resume, ATS and question-bank
+calls reuse TCP/TLS connections instead of handshaking on every request.
+Retries 429/5xx with jittered exponential backoff. agenerate() is the
+await-able twin backed by aiohttp, for callers on the aio loop.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+GEMINI_MODEL    = "gemini-2.5-flash"
+
+# Read timeout (seconds) per calling endpoint; connect timeout is shared.
+ENDPOINT_TIMEOUTS = {
+    "default":             30,
+    "resume_improvements": 30,
+    "ats_score":           30,
+    "ats_summary":         15,
+    "generate_resume":     45,
+    "generate_questions":  60,
+    "interview_feedback":  30,
+}
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class GeminiClient:
+    def __init__(self, api_key: str, model: str = GEMINI_MODEL, base_url: str = GEMINI_BASE_URL,
+                 pool_size: int = 10, max_retries: int = 2, backoff_base: float = 0.5,
+                 backoff_cap: float = 8.0, connect_timeout: float = 5.0,
+                 async_pool_size: int = 100):
+        self.model           = model
+        self.base_url        = base_url.rstrip("/")
+        self.max_retries     = max_retries
+        self.backoff_base    = backoff_base
+        self.backoff_cap     = backoff_cap
+        self.connect_timeout = connect_timeout
+        self.async_pool_size = async_pool_size
+        self._api_key        = api_key
+        self._aclient        = None
+
+        # pool_block=True bounds concurrent sockets: extra callers wait for a free connection
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size,
+                              pool_block=True, max_retries=0)
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"x-goog-api-key": api_key,
+                                     "Content-Type": "application/json"})
+
+        self._lock  = threading.Lock()
+        self._stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    def url(self, model: str = None) -> str:
+        return f"{self.base_url}/{model or self.model}:generateContent"
+
+    def _bump(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def _backoff(self, attempt: int, retry_after: str = None) -> float:
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_cap)
+        # "Full jitter": uniform over [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _request(self, prompt, endpoint, timeout, generation_config):
+        read_timeout = timeout or ENDPOINT_TIMEOUTS.get(endpoint, ENDPOINT_TIMEOUTS["default"])
+        body = {"contents": [{"parts": [{"text": prompt}]}]}
+        if generation_config:
+            body["generationConfig"] = generation_config
+        return read_timeout, body
+
+    def _outcome(self, endpoint, attempt, status, headers, text, json_fn):
+        """Return ("retry", delay) or ("done", text-or-None) for one HTTP response."""
+        if status in RETRY_STATUSES and attempt < self.max_retries:
+            delay = self._backoff(attempt, headers.get("Retry-After"))
+            logger.warning(f"Gemini [{endpoint}] {status}, retry in {delay:.2f}s")
+            self._bump("retries")
+            return "retry", delay
+        if not 200 <= status < 300:
+            logger.error(f"Gemini [{endpoint}] {status}: {text()[:200]}")
+            self._bump("failures")
+            return "done", None
+        try:
+            cands = json_fn().get("candidates", [])
+            return "done", (cands[0].get("content", {}).get("parts", [{}])[0].get("text")
+                            if cands else None)
+        except Exception as exc:
+            logger.error(f"Gemini [{endpoint}] bad response: {exc}")
+            self._bump("failures")
+            return "done", None
+
+    def _transport_error(self, endpoint, attempt, exc, final: bool):
+        # Read timeouts are final (the caller already waited the full budget), as are errors that are
+        # not connection failures or timeouts
+        if final or attempt == self.max_retries:
+            logger.error(f"Gemini [{endpoint}] error: {exc}")
+            self._bump("failures")
+            return "done", None
+        self._bump("retries")
+        return "retry", self._backoff(attempt)
+
+    def generate(self, prompt: str, endpoint: str = "default", timeout: float = None,
+                 generation_config: dict = None, model: str = None):
+        """Return the first candidate's text, or None on failure."""
+        read_timeout, body = self._request(prompt, endpoint, timeout, generation_config)
+        for attempt in range(self.max_retries + 1):
+            self._bump("requests")
+            try:
+                r = self.session.post(self.url(model), json=body,
+                                      timeout=(self.connect_timeout, read_timeout))
+                action, value = self._outcome(endpoint, attempt, r.status_code, r.headers,
+                                              lambda: r.text, r.json)
+            except requests.RequestException as exc:
+                retryable = isinstance(exc, (requests.ConnectionError, requests.Timeout))
+                action, value = self._transport_error(endpoint, attempt, exc,
+                                                      not retryable or isinstance(exc, requests.ReadTimeout))
+            if action == "done":
+                return value
+            time.sleep(value)
+        return None
+
+    def _async_session(self):
+        if self._aclient is None or self._aclient.closed:
+            import aiohttp
+            self._aclient = aiohttp.ClientSession(
+                headers={"x-goog-api-key": self._api_key, "Content-Type": "application/json"},
+                connector=aiohttp.TCPConnector(limit=self.async_pool_size),
+            )
+        return self._aclient
+
+    async def agenerate(self, prompt: str, endpoint: str = "default", timeout: float = None,
+                        generation_config: dict = None, model: str = None):
+        """Async generate(); the aiohttp session binds to the first loop that calls this."""
+        import aiohttp
+        session = self._async_session()
+        read_timeout, body = self._request(prompt, endpoint, timeout, generation_config)
+        tmo = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=read_timeout)
+        for attempt in range(self.max_retries + 1):
+            self._bump("requests")
+            try:
+                async with session.post(self.url(model), json=body, timeout=tmo) as r:
+                    raw = await r.text()
+                action, value = self._outcome(endpoint, attempt, r.status, r.headers,
+                                              lambda: raw, lambda: json.loads(raw))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                action, value = self._transport_error(endpoint, attempt, exc,
+                                                      isinstance(exc, aiohttp.SocketTimeoutError))
+            if action == "done":
+                return value
+            await asyncio.sleep(value)
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        self.session.close()
+
+    async def aclose(self):
+        if self._aclient is not None:
+            await self._aclient.close()
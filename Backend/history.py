@@ -0,0 +1,171 @@
+"""
+Token-budgeted conversation history for the chat agents.
+
+compact() keeps the newest messages that fit a per-model token budget and
+says which older ones to fold, off the request path, into a rolling
+summary covering a prefix of the conversation. SummaryStore keeps that
+summary in process, and on the chat_sessions document when the turn
+belongs to a saved session, so later turns send "summary + recent
+messages" without re-summarising anything.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+# History tokens per request, by model (the system prompt and query come on top)
+MODEL_BUDGETS = {
+    "llama-3.1-8b-instant":    2000,
+    "llama-3.3-70b-versatile": 6000,
+}
+DEFAULT_BUDGET = 3000
+MESSAGE_OVERHEAD = 4           # role / separator tokens per chat message
+
+
+def estimate_tokens(text: str) -> int:
+    """~4 characters per token for English prose and code under the Llama 3 tokenizer."""
+    return (len(text or "") + 3) // 4 + MESSAGE_OVERHEAD
+
+
+def budget_for(model_name: str, scale: float = 1.0) -> int:
+    return int(MODEL_BUDGETS.get(model_name, DEFAULT_BUDGET) * scale)
+
+
+def digest(messages) -> str:
+    h = hashlib.sha1()
+    for m in messages:
+        h.update(json.dumps([m.get("role"), m.get("content")]).encode())
+    return h.hexdigest()
+
+
+def clip(text: str, max_tokens: int) -> str:
+    """Head of an oversized message (e.g. a long tutorial) instead of the whole thing."""
+    limit = max(0, (max_tokens - MESSAGE_OVERHEAD) * 4)
+    return text if len(text) <= limit else text[:limit] + " …[truncated]"
+
+
+class Compaction(NamedTuple):
+    summary: str           # rolling summary covering the first `start` messages, "" if none
+    recent:  list          # newest messages that fit the budget, oldest first
+    start:   int           # index of the first message not covered by the summary
+    fold:    list          # messages to fold into the summary next (empty while everything fits)
+    fold_upto:   int       # the summary's new `upto` once `fold` is folded in
+    fold_digest: str
+    tokens:  int           # estimated tokens of summary + recent
+    original_tokens: int   # estimated tokens of the full history
+
+
+def _newest_fitting(messages, avail: int, per_msg: int):
+    out, used = [], 0
+    for m in reversed(messages):
+        content = clip(m["content"], per_msg)
+        t = estimate_tokens(content)
+        if used + t > avail:
+            break
+        out.append({"role": m["role"], "content": content})
+        used += t
+    out.reverse()
+    return out, used
+
+
+def compact(history: list, budget: int, summary: dict = None) -> Compaction:
+    """Fit `history` into `budget` tokens. `summary` ({"upto", "digest", "text"}) replaces
+    history[:upto] when its digest still matches that prefix.
+
+    Once messages start falling out of the budget, `fold` lists everything except the
+    newest half-budget's worth, so one summary update buys several turns of headroom.
+    """
+    history = [m for m in history or [] if m.get("role") in ("user", "assistant") and m.get("content")]
+    start, text = 0, ""
+    if summary and 0 < summary.get("upto", 0) <= len(history) \
+            and digest(history[:summary["upto"]]) == summary.get("digest"):
+        start, text = summary["upto"], summary.get("text", "")
+
+    reserved = estimate_tokens(text) if text else 0
+    avail    = budget - reserved
+    per_msg  = max(MESSAGE_OVERHEAD + 64, avail // 4)
+    recent, used = _newest_fitting(history[start:], avail, per_msg)
+
+    fold, upto = [], start
+    if len(recent) < len(history) - start:
+        keep = len(_newest_fitting(history[start:], avail // 2, per_msg)[0])
+        upto = len(history) - keep
+        fold = history[start:upto]
+    return Compaction(text, recent, start, fold, upto, digest(history[:upto]) if fold else "",
+                      reserved + used, sum(estimate_tokens(m["content"]) for m in history))
+
+
+def session_filter(email: str, session_id: str) -> dict:
+    """The user's chat_sessions document by session_id or, as the frontend addresses it, by _id
+    (the same lookup auth_utils.update_chat_session uses)."""
+    if ObjectId.is_valid(session_id):
+        return {"email": email, "$or": [{"session_id": session_id}, {"_id": ObjectId(session_id)}]}
+    return {"email": email, "session_id": session_id}
+
+
+class SummaryStore:
+    """Rolling summaries by conversation key: an in-process LRU, plus the chat_sessions
+    document ("history_summary") when a (email, session_id) pair is known."""
+
+    def __init__(self, db=None, max_entries: int = 2048):
+        self.db          = db
+        self.max_entries = max_entries
+        self._lock  = threading.Lock()
+        self._local = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "folds": 0, "fold_errors": 0}
+
+    @staticmethod
+    def key(history: list, session_id: str = None, email: str = None) -> str:
+        if session_id:
+            return f"{email or ''}:{session_id}"
+        return "anon:" + digest((history or [])[:2])
+
+    def get(self, key: str, email: str = None, session_id: str = None):
+        with self._lock:
+            found = self._local.get(key)
+            if found is not None:
+                self._local.move_to_end(key)
+        if found is None and self.db is not None and email and session_id:
+            try:
+                doc = self.db["chat_sessions"].find_one(session_filter(email, session_id), {"history_summary": 1})
+                found = (doc or {}).get("history_summary")
+            except Exception as exc:
+                logger.warning(f"Summary load failed: {exc}")
+            if found:
+                self._remember(key, found)
+        with self._lock:
+            self._stats["hits" if found else "misses"] += 1
+        return found
+
+    def put(self, key: str, summary: dict, email: str = None, session_id: str = None):
+        self._remember(key, summary)
+        with self._lock:
+            self._stats["folds"] += 1
+        if self.db is not None and email and session_id:
+            try:
+                self.db["chat_sessions"].update_one(session_filter(email, session_id),
+                                                    {"$set": {"history_summary": summary}})
+            except Exception as exc:
+                logger.warning(f"Summary save failed: {exc}")
+
+    def fold_failed(self):
+        with self._lock:
+            self._stats["fold_errors"] += 1
+
+    def _remember(self, key, summary):
+        with self._lock:
+            self._local[key] = summary
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._local)}
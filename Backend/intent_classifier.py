@@ -0,0 +1,132 @@
+"""
+Local zero-LLM intent classifier for the multi-agent router.
+
+Keyword rules catch the unambiguous cases (greetings, "find jobs in X");
+everything else goes through a TF-IDF + multinomial logistic regression
+model in NumPy, exported by train_intent_classifier.py. predict() returns
+the leaf label and a temperature-calibrated confidence so the caller can
+fall back to the LLM router below a threshold.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "intent_model.json")
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+# (label, pattern) — first match wins, confidence 1.0
+RULES = [
+    ("general", re.compile(
+        r"^\s*(hi|hii+|hello|hey|hey there|hiya|yo|sup|good (morning|afternoon|evening)|thanks|thank you"
+        r"|thx|bye|goodbye|ok|okay|cool|who are you|what can you do|help)( prepwise)?\s*[!.?]*\s*$")),
+    ("mock_interview", re.compile(r"\bmock interview|\binterview me\b|\bpractice interview\b")),
+    ("tutorial", re.compile(r"\b(tutorial|blog post|step[- ]by[- ]step guide)\b")),
+    # a search command or a bare "<role> jobs in <place>" query; never interview prep that mentions jobs
+    # ("questions for SDE jobs") or a question about jobs ("are jobs at startups worth it")
+    ("job_search", re.compile(
+        r"^(?!.*\b(interview|questions?|prepar))(?!(how|what|why|which|when|where|are|is|do|does|can|should)\b)"
+        r"(.*\b(find|search|show|looking for)\b( [a-z0-9+#.\-]+){0,4} (jobs?|openings?|vacanc(y|ies)|internships?)\b"
+        r"|([a-z0-9+#.\-]+ ){0,4}jobs? (in|near|at|for) "
+        r"|.*\bwho is hiring\b|.*\bhiring (for|in)\b)")),
+]
+
+
+def tokenize(text: str) -> list:
+    """Lowercased word unigrams plus adjacent bigrams."""
+    words = _TOKEN_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def featurize(texts, vocab: dict, idf: np.ndarray) -> np.ndarray:
+    """Sublinear-TF x IDF rows, L2-normalised."""
+    X = np.zeros((len(texts), len(vocab)), dtype=np.float32)
+    for i, t in enumerate(texts):
+        for tok in tokenize(t):
+            j = vocab.get(tok)
+            if j is not None:
+                X[i, j] += 1.0
+    np.log1p(X, out=X)
+    X *= idf
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    return X / np.maximum(norms, 1e-12)
+
+
+def softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=-1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=-1, keepdims=True)
+
+
+def match_rule(text: str):
+    t = text.strip().lower()
+    for label, pattern in RULES:
+        if pattern.search(t):
+            return label
+    return None
+
+
+class IntentClassifier:
+    def __init__(self, model: dict):
+        self.labels      = model["labels"]
+        self.vocab       = {tok: i for i, tok in enumerate(model["vocab"])}
+        self.idf         = np.asarray(model["idf"], dtype=np.float32)
+        self.W           = np.asarray(model["W"], dtype=np.float32)
+        self.b           = np.asarray(model["b"], dtype=np.float32)
+        self.temperature = float(model.get("temperature", 1.0))
+        self.threshold   = float(model.get("threshold", 0.7))
+        self._lock  = threading.Lock()
+        self._stats = {"rule": 0, "model": 0, "fallback": 0}
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def proba(self, texts) -> np.ndarray:
+        X = featurize(texts, self.vocab, self.idf)
+        return softmax((X @ self.W + self.b) / self.temperature)
+
+    def predict(self, text: str):
+        """Return (label, confidence, source) with source "rule" or "model"."""
+        label = match_rule(text)
+        if label:
+            return label, 1.0, "rule"
+        p = self.proba([text])[0]
+        k = int(p.argmax())
+        return self.labels[k], float(p[k]), "model"
+
+    def route(self, text: str, threshold: float = None):
+        """Label if confident enough to skip the LLM router, else None (and count a fallback)."""
+        label, conf, source = self.predict(text)
+        key = source if conf >= (self.threshold if threshold is None else threshold) else "fallback"
+        with self._lock:
+            self._stats[key] += 1
+        return None if key == "fallback" else label
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+        total = sum(out.values())
+        out["local_rate"] = round((out["rule"] + out["model"]) / total, 4) if total else 0.0
+        out["threshold"]  = self.threshold
+        return out
+
+
+def load_classifier(path: str = MODEL_PATH):
+    """The exported classifier, or None if no model has been trained yet."""
+    if not os.path.exists(path):
+        logger.warning(f"Intent model not found at {path}; routing every query through the LLM")
+        return None
+    try:
+        return IntentClassifier.load(path)
+    except Exception as exc:
+        logger.error(f"Intent model load failed: {exc}")
+        return None
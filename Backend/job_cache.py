@@ -0,0 +1,151 @@
+"""
+Job search result cache.
+
+Entries are fresh for `ttl` seconds and may then be served stale for up to
+`stale_ttl` more while one background refresh per key runs (stale-while-
+revalidate); after that they are dropped. The cache is bounded by entry
+count and by the approximate JSON size of the cached results, evicting the
+least recently used entries, and sweeps expired entries periodically.
+Misses are loaded through a SingleFlight so concurrent misses for one key
+cost one upstream scrape. A `covers` predicate lets one entry answer several
+requests (e.g. a 20-result search also serves a 10-result one); an entry that
+does not cover a request is reloaded, and the loader gets the previous value
+so it can fetch enough for both.
+"""
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class JobCache:
+    def __init__(self, max_entries: int = 500, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300,
+                 stale_ttl: float = 3600, sweep_interval: float = 60, refresh_workers: int = 2,
+                 flight: SingleFlight = None):
+        self.max_entries    = max_entries
+        self.max_bytes      = max_bytes
+        self.ttl            = ttl
+        self.stale_ttl      = stale_ttl
+        self.sweep_interval = sweep_interval
+        self.flight         = flight or SingleFlight()
+        self.bytes = 0
+        self._data = OrderedDict()      # key -> (value, size, stored_at)
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._pool       = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="job-cache")
+        self._last_sweep = time.monotonic()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "uncovered": 0, "sets": 0, "evictions": 0, "expired": 0,
+                       "refreshes": 0, "refresh_errors": 0}
+
+    def get(self, key):
+        """(value, "fresh" | "stale"), or (None, None) on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None, None
+            age = now - item[2]
+            if age >= self.ttl + self.stale_ttl:
+                self._drop(key)
+                self._stats["expired"] += 1
+                return None, None
+            self._data.move_to_end(key)
+            return item[0], "fresh" if age < self.ttl else "stale"
+
+    def set(self, key, value):
+        size = len(json.dumps(value, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, size, time.monotonic())
+            self.bytes += size
+            self._stats["sets"] += 1
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self._stats["evictions"] += 1
+            self._maybe_sweep()
+
+    def get_or_load(self, key, loader, keep=bool, covers=None):
+        """(value, state) with state "fresh", "stale" or "miss". A stale value is returned at once and
+        refreshed in the background; a miss calls loader(previous value or None), coalesced per key.
+        Loaded values are cached when keep(value) is true. A cached value for which covers(value) is
+        false counts as a miss."""
+        value, state = self.get(key)
+        if state is not None and covers is not None and not covers(value):
+            self._bump("uncovered")
+            state = None
+        if state == "fresh":
+            self._bump("hits")
+            return value, state
+        if state == "stale":
+            self._bump("stale_hits")
+            self._refresh(key, loader, keep, value)
+            return value, state
+        self._bump("misses")
+        for _ in range(2):
+            # a concurrent load we joined may have fetched less than this caller needs; retry once as leader
+            value = self.flight.do(key, lambda prev=value: self._load(key, loader, keep, prev))
+            if covers is None or covers(value):
+                break
+        return value, "miss"
+
+    def _load(self, key, loader, keep, prev):
+        value = loader(prev)
+        if keep(value):
+            self.set(key, value)
+        return value
+
+    def _refresh(self, key, loader, keep, prev):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            self._stats["refreshes"] += 1
+
+        def run():
+            try:
+                self.flight.do(key, lambda: self._load(key, loader, keep, prev))
+            except Exception as exc:
+                logger.warning(f"Job cache refresh failed for {key!r}: {exc}")
+                self._bump("refresh_errors")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        self._pool.submit(run)
+
+    def _maybe_sweep(self):
+        now = time.monotonic()
+        if now - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = now
+        dead = [k for k, (_, _, ts) in self._data.items() if now - ts >= self.ttl + self.stale_ttl]
+        for k in dead:
+            self._drop(k)
+        self._stats["expired"] += len(dead)
+
+    def _drop(self, key):
+        _, size, _ = self._data.pop(key)
+        self.bytes -= size
+
+    def _bump(self, key):
+        with self._lock:
+            self._stats[key] += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats, entries=len(self._data), bytes=self.bytes, refreshing=len(self._refreshing))
+        total = out["hits"] + out["stale_hits"] + out["misses"]
+        out["hit_rate"] = round((out["hits"] + out["stale_hits"]) / total, 4) if total else 0.0
+        return out
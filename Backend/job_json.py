@@ -0,0 +1,94 @@
+"""
+jobspy DataFrame -> the job objects the frontend renders.
+
+records() works column by column: each needed column becomes a NumPy object
+array with NaN/NaT masked to None in one pass, dates become ISO strings and
+amounts whole numbers as arrays, the card fields jobspy does not have
+(salary, type, jd, skills as a list, salary_min/salary_max) are derived only
+for the rows that have the data, and the per-job dicts are zipped together
+at the end. Columns outside FIELDS are never touched. encode() serializes a payload
+compactly and gzips it when the client accepts that and it is large enough
+to be worth it.
+"""
+
+import gzip
+import json
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("id", "title", "company", "location", "salary", "type", "skills", "jd", "job_type", "currency",
+          "salary_min", "salary_max", "is_remote", "date_posted", "description", "job_url", "company_url")
+JD_CHARS = 240
+
+
+def _col(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Column as an object array with NaN/NaT/None all None (a column jobspy did not return is all None)."""
+    if name not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    col = df[name].to_numpy(dtype=object, copy=True)
+    col[pd.isna(col)] = None
+    return col
+
+
+def _amount(df: pd.DataFrame, name: str) -> np.ndarray:
+    """Rounded whole amounts as Python ints, None where missing."""
+    if name not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    raw = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+    out, ok = np.full(len(df), None, dtype=object), ~np.isnan(raw)
+    out[ok] = np.rint(raw[ok]).astype(np.int64).tolist()
+    return out
+
+
+def _salary(lo: np.ndarray, hi: np.ndarray, currency: np.ndarray, interval: np.ndarray) -> np.ndarray:
+    out = np.full(len(lo), None, dtype=object)
+    for i in np.flatnonzero(~(np.equal(lo, None) & np.equal(hi, None))):
+        l, h = lo[i], hi[i]
+        if l is not None and h is not None: text = f"{l:,} - {h:,}"
+        elif l is not None:                 text = f"From {l:,}"
+        else:                               text = f"Up to {h:,}"
+        unit = f"{currency[i] or ''}{'/' + interval[i] if interval[i] else ''}"
+        out[i] = f"{text} {unit}".rstrip()
+    return out
+
+
+def _dates(df: pd.DataFrame) -> np.ndarray:
+    if "date_posted" not in df.columns:
+        return np.full(len(df), None, dtype=object)
+    days = pd.to_datetime(df["date_posted"], errors="coerce").to_numpy(dtype="datetime64[D]")
+    out = np.datetime_as_string(days).astype(object)
+    out[np.isnat(days)] = None
+    return out
+
+
+def records(df) -> list:
+    """Frontend job dicts (see FIELDS) for a jobspy DataFrame; [] for None or empty."""
+    if df is None or len(df) == 0:
+        return []
+    desc, skills, job_type = _col(df, "description"), _col(df, "skills"), _col(df, "job_type")
+    lo, hi, currency = _amount(df, "min_amount"), _amount(df, "max_amount"), _col(df, "currency")
+    ids = _col(df, "id")
+    job_url = _col(df, "job_url")
+    missing = np.equal(ids, None)
+    ids[missing] = job_url[missing]
+    jd = np.full(len(df), None, dtype=object)
+    has = np.flatnonzero(~np.equal(desc, None))
+    jd[has] = [" ".join(d[:JD_CHARS].split()) for d in desc[has]]
+    skill_lists = np.empty(len(df), dtype=object)
+    skill_lists[:] = [s.split(", ") if s else [] for s in skills]
+    cols = (ids, _col(df, "title"), _col(df, "company"), _col(df, "location"),
+            _salary(lo, hi, currency, _col(df, "interval")), job_type, skill_lists, jd, job_type, currency,
+            lo, hi, _col(df, "is_remote"), _dates(df), desc, job_url, _col(df, "company_url"))
+    return [dict(zip(FIELDS, row)) for row in zip(*cols)]
+
+
+def encode(payload, accept_encoding: str = "", gzip_min: int = 1024):
+    """(body bytes, headers): compact UTF-8 JSON, gzipped when accepted and at least gzip_min bytes
+    (gzip_min 0 disables compression)."""
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str).encode()
+    headers = {"Vary": "Accept-Encoding"}
+    if gzip_min and len(body) >= gzip_min and "gzip" in (accept_encoding or "").lower():
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
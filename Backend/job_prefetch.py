@@ -0,0 +1,178 @@
+"""
+Scheduled prefetch of popular job searches.
+
+Every `interval` seconds the prefetcher ranks the most frequent canonical
+(query, location) searches of the last `lookback_days` from job_searches
+and the job_finder entries in user_activities (both the app's and
+auth_utils' layouts), and warms them through the caller's warm(key, wanted)
+with at most `concurrency` at a time. Upstream scrapes made while warming
+go through `limiter`, a token bucket of `rate` scrapes per second.
+
+Only one process runs rounds: each round first takes (or renews) a lease
+document in scheduler_leases, so with several workers or instances
+enabled the others stand by and take over when the holder stops renewing.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+LEASE_ID = "job_prefetch"
+
+
+class RateLimiter:
+    """Token bucket: wait() blocks until one of `rate` tokens per second (burst `burst`) is free."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate   = rate
+        self.burst  = burst
+        self.tokens = float(burst)
+        self.waited = 0.0
+        self._last  = time.monotonic()
+        self._lock  = threading.Lock()
+
+    def wait(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self._last) * self.rate)
+                self._last  = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+                self.waited += delay
+            time.sleep(delay)
+
+
+class JobPrefetcher:
+    def __init__(self, db, warm, canonical, interval: int = 900, top_n: int = 20, lookback_days: int = 7,
+                 concurrency: int = 2, rate: float = 0.2, max_jobs: int = 50):
+        """warm(key, wanted) -> number of jobs now cached; canonical(query, location) -> key."""
+        self.db            = db
+        self.warm          = warm
+        self.canonical     = canonical
+        self.interval      = interval
+        self.top_n         = top_n
+        self.lookback_days = lookback_days
+        self.concurrency   = concurrency
+        self.max_jobs      = max_jobs
+        self.limiter  = RateLimiter(rate)
+        self.owner    = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.leader   = False
+        self._stop    = threading.Event()
+        self._thread  = None
+        self._lock    = threading.Lock()
+        self._stats   = {"rounds": 0, "warmed": 0, "empty": 0, "errors": 0}
+        self._last    = {}
+
+    # ---- scheduling ----
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="job-prefetch", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self.leader:
+            try:
+                self.db["scheduler_leases"].delete_one({"_id": LEASE_ID, "owner": self.owner})
+            except Exception:
+                pass
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if self._acquire():
+                    self.run_once()
+            except Exception as exc:
+                logger.warning(f"Job prefetch round failed: {exc}")
+                self._bump("errors")
+            self._stop.wait(self.interval)
+
+    def _acquire(self) -> bool:
+        """Take or renew the lease; it outlives one interval so a live holder keeps it."""
+        now = datetime.now(timezone.utc)
+        try:
+            self.db["scheduler_leases"].update_one(
+                {"_id": LEASE_ID, "$or": [{"owner": self.owner}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"owner": self.owner, "expires_at": now + timedelta(seconds=self.interval * 2 + 60)}},
+                upsert=True)
+            self.leader = True
+        except DuplicateKeyError:
+            self.leader = False
+        return self.leader
+
+    # ---- one round ----
+
+    def popular(self) -> list:
+        """[(key, wanted, count)] for the top_n canonical searches, most frequent first."""
+        since = datetime.now(timezone.utc) - timedelta(days=self.lookback_days)
+        rows = self.db["job_searches"].aggregate([
+            {"$match": {"timestamp": {"$gte": since}}},
+            {"$group": {"_id": {"q": "$search_query", "loc": "$location"}, "n": {"$sum": 1},
+                        "wanted": {"$max": "$num_jobs_requested"}}},
+            {"$sort": {"n": -1}}, {"$limit": self.top_n * 5},
+        ])
+        raw = [(r["_id"].get("q"), r["_id"].get("loc"), r.get("wanted"), r["n"]) for r in rows]
+        rows = self.db["user_activities"].aggregate([
+            {"$match": {"$or": [{"type": "job_finder", "created_at": {"$gte": since}},
+                                {"activity_type": "job_finder", "timestamp": {"$gte": since}}]}},
+            {"$group": {"_id": {"q": "$metadata.query", "loc": "$metadata.location"}, "n": {"$sum": 1},
+                        "wanted": {"$max": "$metadata.num_jobs"}}},
+            {"$sort": {"n": -1}}, {"$limit": self.top_n * 5},
+        ])
+        raw += [(r["_id"].get("q"), r["_id"].get("loc"), r.get("wanted"), r["n"]) for r in rows]
+
+        merged = {}
+        for q, loc, wanted, n in raw:
+            if not q:
+                continue
+            key = self.canonical(q, loc or "india")
+            count, most = merged.get(key, (0, 0))
+            merged[key] = (count + n, max(most, int(wanted or 10)))
+        top = sorted(merged.items(), key=lambda kv: -kv[1][0])[:self.top_n]
+        return [(key, min(wanted, self.max_jobs), count) for key, (count, wanted) in top]
+
+    def run_once(self) -> dict:
+        t0 = time.monotonic()
+        searches = self.popular()
+
+        def one(item):
+            key, wanted, _ = item
+            if self._stop.is_set():
+                return
+            try:
+                self._bump("warmed" if self.warm(key, wanted) else "empty")
+            except Exception as exc:
+                logger.warning(f"Job prefetch {key}: {exc}")
+                self._bump("errors")
+
+        with ThreadPoolExecutor(self.concurrency, thread_name_prefix="job-prefetch") as pool:
+            list(pool.map(one, searches))
+        self._bump("rounds")
+        with self._lock:
+            self._last = {"at": datetime.now(timezone.utc).isoformat(), "searches": len(searches),
+                          "seconds": round(time.monotonic() - t0, 1)}
+        return self._last
+
+    def _bump(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats, last_round=dict(self._last))
+        out.update(leader=self.leader, interval=self.interval, top_n=self.top_n,
+                   rate_limit_wait_s=round(self.limiter.waited, 1))
+        return out
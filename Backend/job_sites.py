@@ -0,0 +1,158 @@
+"""
+Concurrent multi-site job scraping.
+
+search() fans one jobspy scrape per site (Indeed, LinkedIn, Glassdoor, ...)
+out on a shared thread pool and returns a SiteSearch that collects each
+site's jobs (projected by job_json) as the site completes. follow() replays
+the batches already in and then yields the rest as they arrive, so a
+streaming response can send the fastest site's jobs first; result() waits
+for the remaining sites and merges. A search for a key that is already
+being scraped at the same or a larger size joins the running SiteSearch.
+
+merge() is deterministic: sites in configured order, each site's own
+order, and a posting several sites list (same title, company and city)
+kept once.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import job_json
+from latency import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+# sites jobspy only supports for some countries; the rest are tried everywhere
+SITE_COUNTRIES = {"zip_recruiter": {"usa", "canada"}}
+
+
+def dedupe_key(job: dict) -> tuple:
+    city = (job.get("location") or "").split(",")[0]
+    return tuple(" ".join(str(v or "").lower().split()) for v in (job.get("title"), job.get("company"), city))
+
+
+def merge(batches: dict, sites) -> list:
+    """batches: site -> jobs. One list in site order without cross-site duplicates."""
+    seen, out = set(), []
+    for site in sites:
+        for job in batches.get(site) or []:
+            key = dedupe_key(job)
+            if key not in seen:
+                seen.add(key)
+                out.append(job)
+    return out
+
+
+class SiteSearch:
+    def __init__(self, key, wanted: int, sites: list):
+        self.key     = key
+        self.wanted  = wanted
+        self.sites   = sites
+        self.batches = []           # (site, jobs, error, seconds) in completion order
+        self._cond    = threading.Condition()
+        self._pending = len(sites)
+
+    @property
+    def done(self) -> bool:
+        return self._pending == 0
+
+    def _add(self, site, jobs, error, seconds):
+        with self._cond:
+            self.batches.append((site, jobs, error, seconds))
+            self._pending -= 1
+            self._cond.notify_all()
+
+    def follow(self, timeout: float = None):
+        """Yield (site, jobs, error, seconds) per site, earliest first; stops early after `timeout`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        i = 0
+        while True:
+            with self._cond:
+                while i >= len(self.batches) and self._pending:
+                    left = None if deadline is None else deadline - time.monotonic()
+                    if left is not None and left <= 0:
+                        return
+                    self._cond.wait(left)
+                if i >= len(self.batches):
+                    return
+                batch = self.batches[i]
+            i += 1
+            yield batch
+
+    def result(self, timeout: float = None) -> dict:
+        """{"wanted", "jobs", "errors"} once every site finished (or `timeout` passed; missing sites
+        count as errors). Raises RuntimeError when no site returned anything usable."""
+        for _ in self.follow(timeout):
+            pass
+        with self._cond:
+            batches = list(self.batches)
+        ok     = {site: jobs for site, jobs, error, _ in batches if error is None}
+        errors = {site: error for site, _, error, _ in batches if error is not None}
+        errors.update({site: "timeout" for site in self.sites if site not in ok and site not in errors})
+        if not ok:
+            raise RuntimeError("; ".join(f"{s}: {e}" for s, e in errors.items()) or "no job sites configured")
+        return {"wanted": self.wanted, "jobs": merge(ok, self.sites), "errors": errors}
+
+
+class MultiSiteScraper:
+    def __init__(self, sites, workers: int = 16, timeout: float = 60):
+        self.sites   = list(sites)
+        self.timeout = timeout
+        self.latency = {site: LatencyStats() for site in self.sites}
+        self._pool    = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-site")
+        self._running = {}          # key -> SiteSearch
+        self._lock    = threading.Lock()
+        self._stats   = {"searches": 0, "joined": 0}
+        self._sites   = {site: {"ok": 0, "errors": 0, "jobs": 0} for site in self.sites}
+
+    def sites_for(self, country: str) -> list:
+        return [s for s in self.sites if country in SITE_COUNTRIES.get(s, {country})]
+
+    def search(self, scrape_jobs, key, wanted: int) -> SiteSearch:
+        """Start (or join) scraping every site for key = (query, location, country)."""
+        with self._lock:
+            run = self._running.get(key)
+            if run is not None and run.wanted >= wanted:
+                self._stats["joined"] += 1
+                return run
+            run = self._running[key] = SiteSearch(key, wanted, self.sites_for(key[2]))
+            self._stats["searches"] += 1
+        for site in run.sites:
+            self._pool.submit(self._scrape, run, scrape_jobs, site)
+        if not run.sites:
+            self._finish(run)
+        return run
+
+    def _scrape(self, run, scrape_jobs, site):
+        q, loc, country = run.key
+        t0 = time.monotonic()
+        try:
+            jobs, error = job_json.records(scrape_jobs(site_name=[site], search_term=q, location=loc,
+                                                       results_wanted=run.wanted, country_indeed=country)), None
+        except Exception as exc:
+            logger.warning(f"Job scrape {site} {run.key}: {exc}")
+            jobs, error = [], str(exc)
+        seconds = time.monotonic() - t0
+        self.latency[site].record(seconds)
+        with self._lock:
+            self._sites[site]["ok" if error is None else "errors"] += 1
+            self._sites[site]["jobs"] += len(jobs)
+        run._add(site, jobs, error, seconds)
+        if run.done:
+            self._finish(run)
+
+    def _finish(self, run):
+        with self._lock:
+            if self._running.get(run.key) is run:
+                del self._running[run.key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats, running=len(self._running))
+            sites = {s: dict(v) for s, v in self._sites.items()}
+        for site, v in sites.items():
+            v["latency"] = self.latency[site].stats()
+        out["sites"] = sites
+        return out
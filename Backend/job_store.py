@@ -0,0 +1,117 @@
+"""
+Persistent job postings (MongoDB job_postings collection).
+
+Every scraped posting is upserted under its jobspy id (or job URL), so the
+same posting seen by many searches is stored once; meta records the
+canonical locations and country it was found for and when it was last seen.
+search() answers a canonical (query, location, country) search from a text
+index over title, company and location, newest postings first. Postings
+expire `max_age` seconds after they were last seen.
+
+lookup() tells the caller whether to scrape: a search is served locally
+only when enough of its results were seen by a scrape within `fresh_age`.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from pymongo import DESCENDING, TEXT, UpdateOne
+
+from latency import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+
+def posting_id(job: dict) -> str:
+    if job.get("id"):
+        return str(job["id"])
+    if job.get("job_url"):
+        return job["job_url"]
+    raw = "|".join(str(job.get(k) or "").lower() for k in ("title", "company", "location"))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+class JobStore:
+    def __init__(self, collection, fresh_age: int = 6 * 3600, max_age: int = 30 * 86400):
+        self.col       = collection
+        self.fresh_age = fresh_age
+        self.max_age   = max_age
+        self.latency   = LatencyStats()
+        self._lock  = threading.Lock()
+        self._stats = {"queries": 0, "local_served": 0, "upserted": 0, "errors": 0}
+        self.col.create_index([("title", TEXT), ("company", TEXT), ("location", TEXT)],
+                              weights={"title": 10, "company": 3, "location": 1}, name="job_text")
+        self.col.create_index([("meta.country", 1), ("meta.locations", 1), ("date_posted", DESCENDING)])
+        self.col.create_index([("company", 1), ("title", 1)])
+        self.col.create_index("meta.expires_at", expireAfterSeconds=0)
+
+    def _bump(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    def upsert(self, jobs: list, location: str, country: str) -> int:
+        """Store scraped postings (plain JSON-able dicts) found for this canonical location."""
+        if not jobs:
+            return 0
+        now = datetime.now(timezone.utc)
+        ops = [UpdateOne({"_id": posting_id(job)}, {
+            "$set": {**{k: v for k, v in job.items() if k != "_id"}, "meta.country": country,
+                     "meta.last_seen": now, "meta.expires_at": now + timedelta(seconds=self.max_age)},
+            "$addToSet": {"meta.locations": location},
+            "$setOnInsert": {"meta.first_seen": now},
+        }, upsert=True) for job in jobs]
+        try:
+            res = self.col.bulk_write(ops, ordered=False)
+            n = res.upserted_count + res.modified_count
+            self._bump("upserted", n)
+            return n
+        except Exception as exc:
+            logger.warning(f"Job store upsert: {exc}")
+            self._bump("errors")
+            return 0
+
+    def search(self, query: str, location: str, country: str, limit: int) -> list:
+        """Postings matching `query` as a phrase in this location, newest first, with meta.last_seen.
+        A location equal to its country searches the whole country."""
+        phrase = " ".join(query.replace('"', " ").replace("\\", " ").split())     # $text has no phrase escape
+        if not phrase:
+            return []
+        flt = {"$text": {"$search": f'"{phrase}"'}, "meta.country": country}
+        if location != country:
+            flt["meta.locations"] = location
+        t0 = time.perf_counter()
+        try:
+            return list(self.col.find(flt, {"_id": 0, "meta.locations": 0, "meta.expires_at": 0})
+                        .sort([("date_posted", DESCENDING)]).limit(limit))
+        except Exception as exc:
+            logger.warning(f"Job store search: {exc}")
+            self._bump("errors")
+            return []
+        finally:
+            self.latency.record(time.perf_counter() - t0)
+            self._bump("queries")
+
+    def lookup(self, query: str, location: str, country: str, wanted: int):
+        """(postings, covered): up to `wanted` local results, and whether at least `wanted` of them
+        were seen by a scrape within fresh_age (so no scrape is needed)."""
+        docs = self.search(query, location, country, wanted)
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.fresh_age)
+        fresh = 0
+        for doc in docs:
+            seen = doc.pop("meta", {}).get("last_seen")
+            if seen and seen.tzinfo is None:      # pymongo returns naive UTC unless tz_aware
+                seen = seen.replace(tzinfo=timezone.utc)
+            fresh += bool(seen and seen >= cutoff)
+        covered = fresh >= wanted
+        if covered:
+            self._bump("local_served")
+        return docs, covered
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+        out["query_latency"] = self.latency.stats()
+        return out
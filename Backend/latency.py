@@ -0,0 +1,31 @@
+"""
+Rolling latency percentiles for /metrics.
+"""
+
+import threading
+from collections import deque
+
+
+class LatencyStats:
+    """Keeps the last `window` samples (seconds); stats() reports milliseconds."""
+
+    def __init__(self, window: int = 1000):
+        self._lock    = threading.Lock()
+        self._samples = deque(maxlen=window)
+        self._count   = 0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            s, count = sorted(self._samples), self._count
+        if not s:
+            return {"count": 0}
+
+        def pct(q):
+            return round(s[min(len(s) - 1, int(len(s) * q))] * 1e3, 1)
+        return {"count": count, "mean_ms": round(sum(s) / len(s) * 1e3, 1),
+                "p50_ms": pct(.50), "p95_ms": pct(.95), "max_ms": round(s[-1] * 1e3, 1)}
@@ -0,0 +1,139 @@
+"""
+Content-addressed cache for LLM responses.
+
+Keys are a SHA-256 of (model, prompt, generation config). Lookups go to an
+in-process LRU tier bounded by entry count and bytes, then to an optional
+MongoDB tier shared by all workers (expired via a TTL index).
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(model: str, prompt: str, config: dict = None) -> str:
+    raw = json.dumps([model, prompt, config or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUTier:
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024, ttl: int = 3600):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+        self.ttl         = ttl
+        self.bytes       = 0
+        self.evictions   = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()   # key -> (value, size, expires)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[2] < time.time():
+                self._drop(key)
+                return None
+            self._data.move_to_end(key)
+            return item[0]
+
+    def set(self, key: str, value: str):
+        size = len(key) + len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, size, time.time() + self.ttl)
+            self.bytes += size
+            while len(self._data) > self.max_entries or self.bytes > self.max_bytes:
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+
+    def _drop(self, key: str):
+        _, size, _ = self._data.pop(key)
+        self.bytes -= size
+
+    def __len__(self):
+        return len(self._data)
+
+
+class MongoTier:
+    def __init__(self, collection, ttl: int = 86400):
+        self.col = collection
+        self.ttl = ttl
+        self.col.create_index("expires_at", expireAfterSeconds=0)
+
+    def get(self, key: str):
+        doc = self.col.find_one({"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+                                {"value": 1})
+        return doc["value"] if doc else None
+
+    def set(self, key: str, value: str):
+        now = datetime.now(timezone.utc)
+        self.col.update_one({"_id": key},
+                            {"$set": {"value": value, "created_at": now,
+                                      "expires_at": now + timedelta(seconds=self.ttl)}},
+                            upsert=True)
+
+
+class ResponseCache:
+    def __init__(self, local: LRUTier, shared: MongoTier = None):
+        self.local  = local
+        self.shared = shared
+        self._lock  = threading.Lock()
+        self._stats = {"hits": 0, "shared_hits": 0, "misses": 0, "sets": 0, "errors": 0}
+
+    def _bump(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def get(self, key: str):
+        value = self.local.get(key)
+        if value is not None:
+            self._bump("hits")
+            return value
+        if self.shared is not None:
+            try:
+                value = self.shared.get(key)
+            except Exception as exc:
+                logger.warning(f"LLM cache shared get: {exc}")
+                self._bump("errors")
+            if value is not None:
+                self.local.set(key, value)
+                self._bump("shared_hits")
+                return value
+        self._bump("misses")
+        return None
+
+    def set(self, key: str, value: str):
+        if value is None:
+            return
+        self.local.set(key, value)
+        self._bump("sets")
+        if self.shared is not None:
+            try:
+                self.shared.set(key, value)
+            except Exception as exc:
+                logger.warning(f"LLM cache shared set: {exc}")
+                self._bump("errors")
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+        total = out["hits"] + out["shared_hits"] + out["misses"]
+        out.update({"hit_rate": round((out["hits"] + out["shared_hits"]) / total, 4) if total else 0.0,
+                    "evictions": self.local.evictions, "entries": len(self.local),
+                    "bytes": self.local.bytes, "shared": self.shared is not None})
+        return out
@@ -8,7 +8,6 @@ import os
 from queue import Queue
 import threading
 from dotenv import load_dotenv
-import json
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import time
@@ -33,6 +32,9 @@ from langchain_community.tools import DuckDuckGoSearchResults
 from langchain.agents import create_agent
 from langchain.tools import tool as langchain_tool
 
+from continuity import check_stream, parse_continuity
+from history import DEFAULT_BUDGET, estimate_tokens
+
 app = Flask(__name__)
 CORS(app)
 
@@ -803,13 +805,13 @@ class MultiAgentState(TypedDict):
     current_agent: str  # Current active agent
     should_reroute: bool  # Whether to reroute to new agent
 
-def trim_conversation_history(messages, max_messages=10):
-    """Trim conversation history to retain only the latest messages."""
+def trim_conversation_history(messages, max_tokens=DEFAULT_BUDGET):
+    """Trim conversation history to the latest messages that fit an estimated token budget."""
     return trim_messages(
         messages,
-        max_tokens=max_messages,
+        max_tokens=max_tokens,
         strategy="last",
-        token_counter=len,
+        token_counter=lambda msgs: sum(estimate_tokens(m.content) for m in msgs),
         start_on="human",
         include_system=True,
         allow_partial=False,
@@ -831,112 +833,10 @@ def save_agent_output(data, filename):
 
 def parse_agent_continuity_response(content, agent_name="Agent"):
     """Shared robust JSON parser for agent continuity checks."""
-    import re
-    
-    # Remove markdown code blocks if present
-    content = re.sub(r'```json\s*', '', content)
-    content = re.sub(r'```\s*$', '', content)
-    content = content.strip()
-    
-    try:
-        # Strategy 1: JSON at the start
-        if content.startswith('{'):
-            json_end = content.find('}')
-            if json_end != -1:
-                json_part = content[:json_end + 1]
-                remaining_content = content[json_end + 1:].strip()
-                
-                try:
-                    check_result = json.loads(json_part)
-                    should_handle = check_result.get('should_handle', False)
-                    reason = check_result.get('reason', '')
-                    
-                    if should_handle:
-                        # Must have response content if should_handle is true
-                        if remaining_content:
-                            return {
-                                "should_handle": True,
-                                "response": remaining_content,
-                                "reason": reason
-                            }
-                        else:
-                            # No content provided, reroute
-                            return {
-                                "should_handle": False,
-                                "response": None,
-                                "reason": "No response content"
-                            }
-                    else:
-                        return {
-                            "should_handle": False,
-                            "response": None,
-                            "reason": reason
-                        }
-                except json.JSONDecodeError:
-                    pass  # Try next strategy
-        
-        # Strategy 2: Find JSON pattern anywhere in text
-        json_pattern = r'\{\s*"should_handle"\s*:\s*(true|false)\s*,\s*"reason"\s*:\s*"([^"]+)"\s*\}'
-        match = re.search(json_pattern, content, re.IGNORECASE)
-        
-        if match:
-            should_handle = match.group(1).lower() == 'true'
-            reason = match.group(2)
-            
-            # Extract response after JSON
-            json_end_pos = match.end()
-            remaining_content = content[json_end_pos:].strip()
-            
-            if should_handle:
-                if remaining_content:
-                    return {
-                        "should_handle": True,
-                        "response": remaining_content,
-                        "reason": reason
-                    }
-                else:
-                    return {
-                        "should_handle": False,
-                        "response": None,
-                        "reason": "No response after JSON"
-                    }
-            else:
-                return {
-                    "should_handle": False,
-                    "response": None,
-                    "reason": reason
-                }
-        
-        # Strategy 3: Look for explicit rejection signals
-        content_lower = content.lower()
-        if any(phrase in content_lower for phrase in [
-            '"should_handle": false',
-            "cannot handle",
-            "not my domain",
-            "not related to",
-            "outside my expertise"
-        ]):
-            return {
-                "should_handle": False,
-                "response": None,
-                "reason": "Explicit rejection detected"
-            }
-        
-        # Fallback: No valid JSON found - safer to reroute
+    result = parse_continuity(content.strip())
+    if result["reason"] == "No valid format":
         print(f"WARNING [{agent_name}]: No valid JSON found. Content: {content[:150]}...")
-        return {
-            "should_handle": False,
-            "response": None,
-            "reason": "No valid continuity check format"
-        }
-        
-    except Exception as e:
-        print(f"ERROR [{agent_name}]: Parse error - {str(e)}")
-        return {
-            "should_handle": False,
-            "response": None,
-            "reason": f"Parse error: {str(e)}"
-        }
+    return result
 
 class LearningResourceAgent:
     """Agent for handling learning resources and Q&A sessions."""
@@ -1005,11 +905,8 @@ If should_handle is false, write ONLY the JSON, nothing else.
 """
         messages_list.append(HumanMessage(content=continuity_prompt))
         
-        response = self.model.invoke(messages_list)
-        content = response.content.strip()
-        
-        # Use shared parsing function
-        return parse_agent_continuity_response(content, "LearningResourceAgent")
+        # Streamed so a decline stops generation right after the leading JSON
+        return check_stream(self.model.stream(messages_list))
     
     def TutorialAgent(self, user_input):
         """Create a comprehensive tutorial using web search and AI."""
@@ -1104,11 +1001,8 @@ If should_handle is false, write ONLY the JSON, nothing else.
 """
         messages_list.append(HumanMessage(content=continuity_prompt))
         
-        response = self.model.invoke(messages_list)
-        content = response.content.strip()
-        
-        # Use shared parsing function
-        return parse_agent_continuity_response(content, "InterviewAgent")
+        # Streamed so a decline stops generation right after the leading JSON
+        return check_stream(self.model.stream(messages_list))
     
     def Interview_questions(self, user_input):
         """Generate curated interview questions."""
@@ -1206,11 +1100,8 @@ If should_handle is false, write ONLY the JSON, nothing else.
 """
         messages_list.append(HumanMessage(content=continuity_prompt))
         
-        response = self.model.invoke(messages_list)
-        content = response.content.strip()
-        
-        # Use shared parsing function
-        return parse_agent_continuity_response(content, "ResumeAgent")
+        # Streamed so a decline stops generation right after the leading JSON
+        return check_stream(self.model.stream(messages_list))
     
     def Create_Resume(self, user_input):
         """Create a resume through AI - single turn for REST API."""
@@ -1285,11 +1176,8 @@ If should_handle is false, write ONLY the JSON, nothing else.
 """
         messages_list.append(HumanMessage(content=continuity_prompt))
         
-        response = self.model.invoke(messages_list)
-        content = response.content.strip()
-        
-        # Use shared parsing function
-        return parse_agent_continuity_response(content, "GeneralAgent")
+        # Streamed so a decline stops generation right after the leading JSON
+        return check_stream(self.model.stream(messages_list))
 
 class JobSearchAgent:
     """Agent for job search assistance."""
@@ -1348,11 +1236,8 @@ If should_handle is false, write ONLY the JSON, nothing else.
 """
         messages_list.append(HumanMessage(content=continuity_prompt))
         
-        response = self.model.invoke(messages_list)
-        content = response.content.strip()
-        
-        # Use shared parsing function
-        result = parse_agent_continuity_response(content, "JobSearchAgent")
+        # Streamed so a decline stops generation right after the leading JSON
+        result = check_stream(self.model.stream(messages_list))
         
         # If should handle, actually perform job search
         if result["should_handle"]:
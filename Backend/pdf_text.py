@@ -0,0 +1,175 @@
+"""
+PDF text extraction for resumes.
+
+Two engines behind one call: PyMuPDF (default, an order of magnitude
+faster) and pdfplumber, which is kept as the fallback when PyMuPDF cannot
+open a file or recovers almost no text from it (odd encodings, drawn-text
+layouts). Documents with at least PDF_PARALLEL_MIN_PAGES pages are split
+into page ranges extracted in a process pool; pages are joined once.
+
+Uploads are parsed straight from the request: an in-memory upload (BytesIO,
+an unrolled SpooledTemporaryFile, a werkzeug FileStorage over either) is
+handed to the parser as a memoryview of its buffer, so the PDF is never
+copied or written to disk; only uploads the server already spooled to
+disk are read back once.
+"""
+
+import hashlib
+import io
+import logging
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+try:
+    import pymupdf
+except ImportError:              # PyMuPDF < 1.24 only ships the `fitz` name
+    try:
+        import fitz as pymupdf
+    except ImportError:
+        pymupdf = None
+
+logger = logging.getLogger(__name__)
+
+ENGINES            = ("pymupdf", "pdfplumber")
+DEFAULT_ENGINE     = os.getenv("PDF_ENGINE", "pymupdf" if pymupdf else "pdfplumber")
+PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+WORKERS            = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+MIN_CHARS_PER_PAGE = 40
+
+_lock  = threading.Lock()
+_pool  = None
+_pid   = None
+_stats = {"documents": 0, "pages": 0, "parallel": 0, "fallbacks": 0, "errors": 0,
+          "from_memory": 0, "from_disk": 0, **{e: 0 for e in ENGINES}}
+
+
+def _source(source):
+    """A path, or the document bytes; in-memory file objects are viewed, not copied."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, memoryview)):
+        return source
+    if isinstance(source, bytearray):
+        return memoryview(source)
+    stream = getattr(source, "stream", source)        # werkzeug FileStorage
+    buf    = getattr(stream, "_file", stream)         # SpooledTemporaryFile, rolled or not
+    if isinstance(buf, io.BytesIO):
+        return buf.getbuffer()
+    stream.seek(0)
+    return stream.read()
+
+
+def fingerprint(source) -> str:
+    """SHA-256 of the document bytes, hashed in place for in-memory uploads."""
+    src = _source(source)
+    try:
+        if isinstance(src, str):
+            with open(src, "rb") as fh:
+                return hashlib.file_digest(fh, "sha256").hexdigest()
+        return hashlib.sha256(src).hexdigest()
+    finally:
+        if isinstance(src, memoryview) and src is not source:
+            src.release()
+
+
+def _pymupdf_open(src):
+    return pymupdf.open(src) if isinstance(src, str) else pymupdf.open(stream=src, filetype="pdf")
+
+
+def _pymupdf_pages(src, start: int = 0, stop: int = None) -> list:
+    with _pymupdf_open(src) as doc:
+        return [doc[i].get_text() for i in range(start, len(doc) if stop is None else stop)]
+
+
+def _pdfplumber_pages(src, start: int = 0, stop: int = None) -> list:
+    with pdfplumber.open(src if isinstance(src, str) else io.BytesIO(src)) as pdf:
+        return [p.extract_text() or "" for p in pdf.pages[start:stop]]
+
+
+_PAGES = {"pymupdf": _pymupdf_pages, "pdfplumber": _pdfplumber_pages}
+
+
+def page_count(src, engine: str = None) -> int:
+    if (engine or DEFAULT_ENGINE) == "pymupdf":
+        with _pymupdf_open(src) as doc:
+            return len(doc)
+    with pdfplumber.open(src if isinstance(src, str) else io.BytesIO(src)) as pdf:
+        return len(pdf.pages)
+
+
+def _executor() -> ProcessPoolExecutor:
+    global _pool, _pid
+    with _lock:
+        if _pool is None or _pid != os.getpid():
+            # spawn, not fork: forking this multi-threaded server can copy a held lock into the child
+            _pool = ProcessPoolExecutor(max_workers=WORKERS, mp_context=multiprocessing.get_context("spawn"))
+            _pid  = os.getpid()
+    return _pool
+
+
+def extract_pages(source, engine: str = None, workers: int = None) -> list:
+    """Text of every page, in order."""
+    src, engine = _source(source), engine or DEFAULT_ENGINE
+    fn, workers = _PAGES[engine], WORKERS if workers is None else workers
+    n = page_count(src, engine) if workers > 1 else 0
+    if n < PARALLEL_MIN_PAGES:
+        return fn(src)
+    step = math.ceil(n / workers)
+    data = bytes(src) if isinstance(src, memoryview) else src     # memoryviews don't pickle
+    futures = [_executor().submit(fn, data, s, min(s + step, n)) for s in range(0, n, step)]
+    with _lock:
+        _stats["parallel"] += 1
+    return [page for f in futures for page in f.result()]
+
+
+def _looks_broken(text: str, pages: int) -> bool:
+    return len(text) < MIN_CHARS_PER_PAGE * max(pages, 1) or text.count("\ufffd") > len(text) // 20
+
+
+def extract_pdf_text(source, engine: str = None) -> str:
+    """Plain text of a PDF (path, bytes, binary file object or upload); "" if unreadable."""
+    src = _source(source)
+    try:
+        in_memory = isinstance(src, memoryview) or isinstance(source, (bytes, bytearray))
+        return _extract(src, engine, from_disk=not in_memory)
+    finally:
+        if isinstance(src, memoryview) and src is not source:
+            src.release()
+
+
+def _extract(src, engine: str, from_disk: bool) -> str:
+    engine = engine or DEFAULT_ENGINE
+    chain  = [engine] + [e for e in ENGINES if e != engine and (e != "pymupdf" or pymupdf)]
+    best, pages = "", []
+    for i, eng in enumerate(chain):
+        try:
+            pages = extract_pages(src, eng)
+        except Exception as exc:
+            logger.warning(f"PDF extraction with {eng} failed: {exc}")
+            continue
+        text = "\n".join(p.strip() for p in pages if p and p.strip())
+        with _lock:
+            _stats[eng] += 1
+            _stats["fallbacks"] += i > 0
+        if len(text) > len(best):
+            best = text
+        if not _looks_broken(text, len(pages)):
+            break
+    with _lock:
+        _stats["documents"] += 1
+        _stats["pages"] += len(pages)
+        _stats["errors"] += not best
+        _stats["from_disk" if from_disk else "from_memory"] += 1
+    if not best:
+        logger.error("PDF error: no engine could extract text")
+    return best
+
+
+def stats() -> dict:
+    with _lock:
+        return dict(_stats, engine=DEFAULT_ENGINE, workers=WORKERS)
@@ -0,0 +1,153 @@
+"""
+Per-user cache of parsed resumes, keyed by the SHA-256 of the uploaded file.
+
+An entry holds the extracted text, the text split into normalised sections,
+the last improvement suggestions and ATS results per job description. A
+repeat upload of the same file by the same user skips PDF parsing, and the
+Gemini call when the result it needs is already there.
+
+Entries live in an in-process LRU tier (bounded by total bytes) and, when
+MongoDB is available, in the resume_cache collection: a TTL index expires
+entries that have not been used for `ttl` seconds, and each user's entries
+are trimmed, least recently used first, to `user_max_bytes` / `user_max_entries`.
+Keys always include the user's email, so users never see each other's entries.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+
+from llm_cache import LRUTier
+
+logger = logging.getLogger(__name__)
+
+SECTION_ALIASES = {
+    "summary":        ("summary", "professional summary", "profile", "objective", "career objective",
+                       "about me"),
+    "experience":     ("experience", "work experience", "professional experience", "employment",
+                       "employment history", "work history", "internships", "internship"),
+    "education":      ("education", "academic background", "academics", "qualifications"),
+    "skills":         ("skills", "technical skills", "core competencies", "technologies", "tech stack",
+                       "key skills"),
+    "projects":       ("projects", "personal projects", "academic projects", "key projects"),
+    "certifications": ("certifications", "certificates", "licenses", "courses"),
+    "achievements":   ("achievements", "awards", "honors", "honours", "accomplishments"),
+    "publications":   ("publications", "research"),
+    "languages":      ("languages",),
+    "interests":      ("interests", "hobbies", "extracurricular activities", "activities"),
+}
+_HEADING = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+_HEADING_RE = re.compile(r"^[\W_]*([A-Za-z][A-Za-z &/]{1,40}?)[\s:\-–—_]*$")
+
+
+def jd_key(jd: str) -> str:
+    return hashlib.sha256(" ".join((jd or "").lower().split()).encode()).hexdigest()[:16]
+
+
+def normalize_sections(text: str) -> dict:
+    """{section: text} using canonical section names; text before the first heading is "header"."""
+    sections, name, lines = {}, "header", []
+    for line in (text or "").splitlines():
+        m = _HEADING_RE.match(line.strip())
+        heading = m and _HEADING.get(" ".join(m.group(1).lower().replace("&", "and").split()))
+        if heading:
+            if lines:
+                sections[name] = (sections.get(name, "") + "\n" + "\n".join(lines)).strip()
+            name, lines = heading, []
+        elif line.strip():
+            lines.append(" ".join(line.split()))
+    if lines:
+        sections[name] = (sections.get(name, "") + "\n" + "\n".join(lines)).strip()
+    return sections
+
+
+class ResumeCache:
+    def __init__(self, collection=None, max_bytes: int = 64 * 1024 * 1024, ttl: int = 30 * 86400,
+                 user_max_bytes: int = 2 * 1024 * 1024, user_max_entries: int = 20):
+        self.col              = collection
+        self.ttl              = ttl
+        self.user_max_bytes   = user_max_bytes
+        self.user_max_entries = user_max_entries
+        self.local  = LRUTier(max_entries=1 << 20, max_bytes=max_bytes, ttl=ttl)
+        self._lock  = threading.Lock()
+        self._stats = {"hits": 0, "shared_hits": 0, "misses": 0, "sets": 0, "trimmed": 0, "errors": 0}
+        if self.col is not None:
+            self.col.create_index("expires_at", expireAfterSeconds=0)
+            self.col.create_index([("email", 1), ("last_used", -1)])
+
+    def _bump(self, key: str, n: int = 1):
+        with self._lock:
+            self._stats[key] += n
+
+    @staticmethod
+    def key(email: str, fingerprint: str) -> str:
+        return f"{email}:{fingerprint}"
+
+    def get(self, email: str, fingerprint: str) -> dict:
+        """The cached entry for this user's file, or None."""
+        key = self.key(email, fingerprint)
+        raw = self.local.get(key)
+        if raw is not None:
+            self._bump("hits")
+            return json.loads(raw)
+        if self.col is not None:
+            try:
+                now = datetime.now(timezone.utc)
+                doc = self.col.find_one_and_update(
+                    {"_id": key, "email": email, "expires_at": {"$gt": now}},
+                    {"$set": {"last_used": now, "expires_at": now + timedelta(seconds=self.ttl)}},
+                    {"entry": 1})
+                if doc:
+                    self.local.set(key, json.dumps(doc["entry"]))
+                    self._bump("shared_hits")
+                    return doc["entry"]
+            except Exception as exc:
+                logger.warning(f"Resume cache get: {exc}")
+                self._bump("errors")
+        self._bump("misses")
+        return None
+
+    def put(self, email: str, fingerprint: str, entry: dict):
+        """Store the whole entry (callers read, update and put back)."""
+        if not email or not entry:
+            return
+        key, raw = self.key(email, fingerprint), json.dumps(entry)
+        self.local.set(key, raw)
+        self._bump("sets")
+        if self.col is None:
+            return
+        try:
+            now = datetime.now(timezone.utc)
+            self.col.update_one({"_id": key}, {
+                "$set": {"email": email, "sha256": fingerprint, "entry": entry, "size": len(raw),
+                         "last_used": now, "expires_at": now + timedelta(seconds=self.ttl)},
+                "$setOnInsert": {"created_at": now},
+            }, upsert=True)
+            self._trim(email)
+        except Exception as exc:
+            logger.warning(f"Resume cache set: {exc}")
+            self._bump("errors")
+
+    def _trim(self, email: str):
+        total, drop = 0, []
+        for i, doc in enumerate(self.col.find({"email": email}, {"size": 1}).sort("last_used", -1)):
+            total += doc.get("size", 0)
+            if i >= self.user_max_entries or total > self.user_max_bytes:
+                drop.append(doc["_id"])
+        if drop:
+            self.col.delete_many({"_id": {"$in": drop}, "email": email})
+            for key in drop:
+                self.local.delete(key)
+            self._bump("trimmed", len(drop))
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+        total = out["hits"] + out["shared_hits"] + out["misses"]
+        out.update(hit_rate=round((out["hits"] + out["shared_hits"]) / total, 4) if total else 0.0,
+                   entries=len(self.local), bytes=self.local.bytes, evictions=self.local.evictions,
+                   shared=self.col is not None)
+        return out
@@ -0,0 +1,126 @@
+"""
+Semantic answer cache for stateless multi-agent chat turns.
+
+Queries are embedded locally (signed feature hashing of content words,
+word bigrams and character trigrams, L2-normalised) into one preallocated
+NumPy matrix. A lookup is a single matrix-vector product: the top-k rows
+in the agent's scope are checked and the best one is served if its cosine
+similarity clears the threshold. Entries expire after a TTL; when the
+matrix is full the least recently used slot is reused.
+"""
+
+import re
+import threading
+import time
+import zlib
+
+import numpy as np
+
+from latency import LatencyStats
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+_STOP = frozenset("""a an the is are was were be been am i me my we you your it its of to in on for
+    with about and or as at by from into how what which who whom why when where can could would should
+    do does did please tell give show explain me some any this that these those there here just""".split())
+
+
+def _terms(text: str):
+    words = [w.rstrip(".") for w in _WORD_RE.findall(text.lower())]
+    words = [w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+             for w in words if w and w not in _STOP]
+    feats = [(w, 1.0) for w in words] + [(f"{a} {b}", 0.7) for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"#{w}#"
+        feats += [("3:" + padded[i:i + 3], 0.25) for i in range(len(padded) - 2)]
+    return feats
+
+
+def embed(text: str, dim: int = 1024) -> np.ndarray:
+    v = np.zeros(dim, dtype=np.float32)
+    for feat, weight in _terms(text):
+        h = zlib.crc32(feat.encode())
+        v[h % dim] += weight if h & 0x80000000 else -weight
+    n = float(np.linalg.norm(v))
+    return v / n if n else v
+
+
+class SemanticCache:
+    def __init__(self, max_entries: int = 2048, dim: int = 1024, threshold: float = 0.9,
+                 ttl: float = 86400, top_k: int = 3):
+        self.dim, self.threshold, self.ttl, self.top_k = dim, threshold, ttl, top_k
+        self._lock    = threading.Lock()
+        self._E       = np.zeros((max_entries, dim), dtype=np.float32)
+        self._scope   = np.full(max_entries, -1, dtype=np.int32)     # -1 = free slot
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._used    = np.zeros(max_entries, dtype=np.float64)
+        self._answers = [None] * max_entries
+        self._scopes  = {}
+        self._stats   = {"hits": 0, "misses": 0, "sets": 0, "evictions": 0, "expired": 0}
+        self.lookup     = LatencyStats()   # get() time
+        self.generation = LatencyStats()   # what a miss cost to answer (put(..., elapsed))
+
+    def _scope_id(self, scope: str) -> int:
+        return self._scopes.setdefault(scope, len(self._scopes))
+
+    def _best(self, sid: int, q: np.ndarray, now: float):
+        """(slot, similarity) of the closest live entry in scope, or (None, 0)."""
+        live = (self._scope == sid) & (self._expires > now)
+        n    = int(live.sum())
+        if not n:
+            return None, 0.0
+        sims = np.where(live, self._E @ q, -np.inf)
+        k    = min(self.top_k, n)
+        top  = np.argpartition(-sims, k - 1)[:k]
+        j    = int(top[np.argmax(sims[top])])
+        return j, float(sims[j])
+
+    def get(self, scope: str, query: str):
+        """Cached answer for a semantically equivalent query in `scope`, else None."""
+        t0 = time.perf_counter()
+        q  = embed(query, self.dim)
+        now = time.time()
+        with self._lock:
+            slot, sim = self._best(self._scope_id(scope), q, now)
+            hit = slot is not None and sim >= self.threshold
+            if hit:
+                self._used[slot] = now
+                answer = self._answers[slot]
+            self._stats["hits" if hit else "misses"] += 1
+        self.lookup.record(time.perf_counter() - t0)
+        return answer if hit else None
+
+    def put(self, scope: str, query: str, answer: str, elapsed: float = None):
+        if elapsed is not None:
+            self.generation.record(elapsed)
+        if not answer:
+            return
+        q, now = embed(query, self.dim), time.time()
+        with self._lock:
+            sid = self._scope_id(scope)
+            slot, sim = self._best(sid, q, now)
+            if slot is None or sim < 0.98:                       # else refresh the near-identical entry
+                slot = self._free_slot(now)
+            self._E[slot], self._scope[slot] = q, sid
+            self._expires[slot], self._used[slot] = now + self.ttl, now
+            self._answers[slot] = answer
+            self._stats["sets"] += 1
+
+    def _free_slot(self, now: float) -> int:
+        free = np.flatnonzero(self._scope < 0)
+        if len(free):
+            return int(free[0])
+        expired = np.flatnonzero(self._expires <= now)
+        if len(expired):
+            self._stats["expired"] += 1
+            return int(expired[0])
+        self._stats["evictions"] += 1
+        return int(np.argmin(self._used))
+
+    def stats(self) -> dict:
+        with self._lock:
+            out     = dict(self._stats)
+            entries = int((self._scope >= 0).sum())
+        total = out["hits"] + out["misses"]
+        out.update(hit_rate=round(out["hits"] / total, 4) if total else 0.0, entries=entries,
+                   threshold=self.threshold, lookup=self.lookup.stats(), miss_generation=self.generation.stats())
+        return out
@@ -0,0 +1,81 @@
+"""
+Single-flight request coalescing.
+
+While an upstream call for a key is in flight, identical calls (same key)
+wait for it instead of starting their own; everyone gets the same result or
+exception. Sync callers (do) and coroutines on the aio loop (ado) share the
+same in-flight table, so a blocking Flask view and an async core asking for
+the same Gemini prompt still cost one call. A coroutine that is cancelled
+while waiting (client disconnect) does not cancel the shared call.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock   = threading.Lock()
+        self._flight = {}     # key -> concurrent.futures.Future
+        self._stats  = {"calls": 0, "shared": 0, "errors": 0}
+
+    def _join(self, key):
+        """(future, leader)"""
+        with self._lock:
+            fut = self._flight.get(key)
+            if fut is not None:
+                self._stats["shared"] += 1
+                return fut, False
+            fut = self._flight[key] = Future()
+            self._stats["calls"] += 1
+            return fut, True
+
+    def _settle(self, key, fut, result=None, exc=None):
+        with self._lock:
+            self._flight.pop(key, None)
+            if exc is not None:
+                self._stats["errors"] += 1
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+
+    def do(self, key, fn):
+        """fn() once per key at a time; concurrent callers with the same key share its outcome."""
+        if not self.enabled:
+            return fn()
+        fut, leader = self._join(key)
+        if not leader:
+            return fut.result()
+        try:
+            result = fn()
+        except BaseException as exc:        # CancelledError / KeyboardInterrupt too, or waiters hang
+            self._settle(key, fut, exc=exc)
+            raise
+        self._settle(key, fut, result)
+        return result
+
+    async def ado(self, key, coro_fn):
+        """Async do(): coro_fn() is started once, as its own task, and awaited by every caller."""
+        if not self.enabled:
+            return await coro_fn()
+        fut, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(coro_fn())
+
+            def done(t):
+                if t.cancelled():
+                    self._settle(key, fut, exc=asyncio.CancelledError())
+                else:
+                    self._settle(key, fut, t.result() if t.exception() is None else None, t.exception())
+            task.add_done_callback(done)
+        return await asyncio.shield(asyncio.wrap_future(fut))
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats, in_flight=len(self._flight))
+        total = out["calls"] + out["shared"]
+        out["saved_ratio"] = round(out["shared"] / total, 4) if total else 0.0
+        return out
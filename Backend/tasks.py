@@ -0,0 +1,241 @@
+"""
+Background tasks for long-running AI requests (resume generation, question
+banks, interview feedback).
+
+submit() records a task and schedules its handler, an async core returning
+(payload, status) like the ones behind the sync routes, on the aio I/O loop.
+At most `concurrency` handlers run at once per process; at most
+`max_pending` tasks may be queued or running, after which submit() raises
+QueueFull. An identical task (same kind, user and payload) that is still
+queued or running is returned instead of starting a second one.
+
+Task state lives in process and, when MongoDB is available, in the tasks
+collection so any worker can answer a poll. Results expire `result_ttl`
+seconds after the task finishes (TTL index on expires_at). Cancelling a
+task owned by another worker marks it cancelled there: it will not start,
+and a result it still produces is discarded.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import aio
+from latency import LatencyStats
+
+logger = logging.getLogger(__name__)
+
+ACTIVE   = ("queued", "running")
+FINISHED = ("done", "failed", "cancelled")
+
+
+class QueueFull(Exception):
+    pass
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def public(record: dict, with_result: bool = False) -> dict:
+    out = {k: record.get(k) for k in ("task_id", "kind", "status", "status_code", "error")}
+    for k in ("created_at", "started_at", "finished_at"):
+        out[k] = record[k].isoformat() if record.get(k) else None
+    if with_result:
+        out["result"] = record.get("result")
+    return out
+
+
+class TaskQueue:
+    def __init__(self, collection=None, concurrency: int = 4, max_pending: int = 200,
+                 result_ttl: int = 3600, max_age: int = 86400):
+        self.col         = collection
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.result_ttl  = result_ttl
+        self.max_age     = max_age
+        self._handlers = {}
+        self._records  = {}      # task_id -> record
+        self._futures  = {}      # task_id -> concurrent.futures.Future
+        self._inflight = {}      # dedup key -> task_id
+        self._sem      = None
+        self._lock     = threading.Lock()
+        self._stats    = {"submitted": 0, "deduplicated": 0, "rejected": 0, "done": 0, "failed": 0,
+                          "cancelled": 0}
+        self.wait     = LatencyStats()   # queued -> running
+        self.duration = LatencyStats()   # running -> finished
+        if self.col is not None:
+            self.col.create_index("expires_at", expireAfterSeconds=0)
+            self.col.create_index([("key", 1), ("status", 1)])
+
+    def register(self, kind: str, handler):
+        """handler: async (payload, email, use_cache) -> (body, status)."""
+        self._handlers[kind] = handler
+
+    @property
+    def kinds(self):
+        return sorted(self._handlers)
+
+    # ---- submit / poll / cancel (called from request threads) ----
+
+    def submit(self, kind: str, payload: dict, email: str, use_cache: bool = True):
+        """(public record, created). Raises KeyError for an unknown kind, QueueFull when saturated."""
+        handler = self._handlers[kind]
+        key = hashlib.sha256(json.dumps([kind, email, payload], sort_keys=True, default=str).encode()).hexdigest()
+        with self._lock:
+            self._sweep()
+            existing = self._records.get(self._inflight.get(key))
+            if existing is not None:
+                self._stats["deduplicated"] += 1
+                return public(existing), False
+            if sum(r["status"] in ACTIVE for r in self._records.values()) >= self.max_pending:
+                self._stats["rejected"] += 1
+                raise QueueFull(f"{self.max_pending} tasks already pending")
+            now = _now()
+            record = {"task_id": uuid.uuid4().hex, "kind": kind, "email": email, "key": key,
+                      "status": "queued", "created_at": now, "expires_at": now + timedelta(seconds=self.max_age)}
+            self._records[record["task_id"]] = record
+            self._inflight[key] = record["task_id"]
+            self._stats["submitted"] += 1
+
+        if self.col is not None:
+            try:
+                other = self.col.find_one({"key": key, "status": {"$in": list(ACTIVE)}, "expires_at": {"$gt": now}})
+                if other is not None:
+                    self._forget(record["task_id"], key)
+                    with self._lock:
+                        self._stats["submitted"] -= 1
+                        self._stats["deduplicated"] += 1
+                    return public(other), False
+                self.col.insert_one({"_id": record["task_id"], **record, "payload": payload})
+            except Exception as exc:
+                logger.warning(f"Task store insert: {exc}")
+
+        future = aio.submit(self._run(record["task_id"], handler, payload, email, use_cache))
+        with self._lock:
+            self._futures[record["task_id"]] = future
+        future.add_done_callback(lambda _f, tid=record["task_id"]: self._futures.pop(tid, None))
+        return public(record), True
+
+    def get(self, task_id: str, email: str):
+        """The task's record if it belongs to `email`, else None."""
+        with self._lock:
+            record = self._records.get(task_id)
+        if record is not None:
+            return record if record["email"] == email else None
+        if self.col is None:
+            return None
+        try:
+            return self.col.find_one({"_id": task_id, "email": email})
+        except Exception as exc:
+            logger.warning(f"Task store get: {exc}")
+            return None
+
+    def cancel(self, task_id: str, email: str):
+        """Cancel a queued or running task. Returns its record (status "cancelled" unless it had
+        already finished), or None if unknown."""
+        record = self.get(task_id, email)
+        if record is None or record["status"] in FINISHED:
+            return record
+        with self._lock:
+            future = self._futures.get(task_id)
+            local  = self._records.get(task_id)
+        if future is not None:
+            future.cancel()
+        fields = {"status": "cancelled", "finished_at": _now(),
+                  "expires_at": _now() + timedelta(seconds=self.result_ttl)}
+        if local is not None:
+            self._finish_local(local, fields)
+        if self.col is not None:
+            try:
+                self.col.update_one({"_id": task_id, "status": {"$in": list(ACTIVE)}}, {"$set": fields})
+            except Exception as exc:
+                logger.warning(f"Task store cancel: {exc}")
+        return {**record, **fields}
+
+    # ---- execution (on the aio loop) ----
+
+    async def _run(self, task_id, handler, payload, email, use_cache):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        async with self._sem:
+            record = self._records[task_id]
+            if record["status"] != "queued" or await self._cancelled_elsewhere(task_id):
+                return
+            started = _now()
+            self.wait.record((started - record["created_at"]).total_seconds())
+            record.update(status="running", started_at=started)
+            await self._store(task_id, {"status": "running", "started_at": started})
+            try:
+                body, status = await handler(payload, email, use_cache)
+                fields = {"status": "done" if status < 400 else "failed", "status_code": status, "result": body}
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.error(f"Task {task_id} ({record['kind']}) failed: {exc}", exc_info=True)
+                fields = {"status": "failed", "status_code": 500, "error": str(exc)}
+            finished = _now()
+            fields.update(finished_at=finished, expires_at=finished + timedelta(seconds=self.result_ttl))
+            self.duration.record((finished - started).total_seconds())
+            if not await self._store(task_id, fields):
+                fields = {"status": "cancelled", "result": None}
+            self._finish_local(record, fields)
+
+    async def _cancelled_elsewhere(self, task_id) -> bool:
+        if self.col is None:
+            return False
+        try:
+            doc = await asyncio.to_thread(self.col.find_one, {"_id": task_id}, {"status": 1})
+        except Exception:
+            return False
+        if doc and doc["status"] == "cancelled":
+            self._finish_local(self._records[task_id], {"status": "cancelled", "finished_at": _now()})
+            return True
+        return False
+
+    async def _store(self, task_id, fields) -> bool:
+        """Persist `fields` unless the task was cancelled meanwhile; False if it was."""
+        if self.col is None:
+            return True
+        try:
+            res = await asyncio.to_thread(self.col.update_one,
+                                          {"_id": task_id, "status": {"$ne": "cancelled"}}, {"$set": fields})
+            return res.matched_count > 0
+        except Exception as exc:
+            logger.warning(f"Task store update: {exc}")
+            return True
+
+    def _finish_local(self, record, fields):
+        with self._lock:
+            if record["status"] in FINISHED:
+                return
+            record.update(fields)
+            record.setdefault("finished_at", _now())
+            record["expires_at"] = record["finished_at"] + timedelta(seconds=self.result_ttl)
+            self._stats[record["status"]] += 1
+            if self._inflight.get(record["key"]) == record["task_id"]:
+                del self._inflight[record["key"]]
+
+    def _forget(self, task_id, key):
+        with self._lock:
+            self._records.pop(task_id, None)
+            if self._inflight.get(key) == task_id:
+                del self._inflight[key]
+
+    def _sweep(self):
+        now = _now()
+        for tid in [t for t, r in self._records.items() if r["status"] in FINISHED and r["expires_at"] <= now]:
+            del self._records[tid]
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+            for s in ACTIVE:
+                out[s] = sum(r["status"] == s for r in self._records.values())
+        out.update(concurrency=self.concurrency, max_pending=self.max_pending,
+                   wait=self.wait.stats(), duration=self.duration.stats(), shared=self.col is not None)
+        return out
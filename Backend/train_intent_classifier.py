@@ -0,0 +1,122 @@
+"""
+Train and export the router's intent classifier.
+
+    python train_intent_classifier.py [--data data/intent_queries.jsonl] [--out data/intent_model.json]
+
+Fits TF-IDF + multinomial logistic regression on labelled queries, then
+calibrates a softmax temperature and a confidence threshold on k-fold
+out-of-fold predictions: the threshold is the lowest confidence at which
+held-out precision still meets --target-precision.
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from intent_classifier import MODEL_PATH, featurize, softmax, tokenize
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "intent_queries.jsonl")
+
+
+def load_data(path: str = DATA_PATH):
+    texts, labels = [], []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                texts.append(row["text"]); labels.append(row["label"])
+    return texts, labels
+
+
+def build_vocab(texts):
+    df = {}
+    for t in texts:
+        for tok in set(tokenize(t)):
+            df[tok] = df.get(tok, 0) + 1
+    vocab = sorted(df)
+    n     = len(texts)
+    idf   = np.array([np.log((1 + n) / (1 + df[tok])) + 1 for tok in vocab], dtype=np.float32)
+    return {tok: i for i, tok in enumerate(vocab)}, idf
+
+
+def fit(texts, labels, label_names, l2: float = 1e-3, epochs: int = 400, lr: float = 2.0):
+    """Return (vocab, idf, W, b) trained with full-batch gradient descent."""
+    vocab, idf = build_vocab(texts)
+    X = featurize(texts, vocab, idf)
+    Y = np.eye(len(label_names), dtype=np.float32)[[label_names.index(l) for l in labels]]
+    W = np.zeros((X.shape[1], Y.shape[1]), dtype=np.float32)
+    b = np.zeros(Y.shape[1], dtype=np.float32)
+    for _ in range(epochs):
+        G  = softmax(X @ W + b) - Y
+        W -= lr * (X.T @ G / len(X) + l2 * W)
+        b -= lr * G.mean(axis=0)
+    return vocab, idf, W, b
+
+
+def out_of_fold_logits(texts, labels, label_names, folds: int = 5, seed: int = 0, **kw):
+    idx    = np.random.default_rng(seed).permutation(len(texts))
+    logits = np.zeros((len(texts), len(label_names)), dtype=np.float32)
+    for k in range(folds):
+        test  = idx[k::folds]
+        train = np.setdiff1d(idx, test)
+        vocab, idf, W, b = fit([texts[i] for i in train], [labels[i] for i in train], label_names, **kw)
+        logits[test] = featurize([texts[i] for i in test], vocab, idf) @ W + b
+    return logits
+
+
+def calibrate(logits, y, target_precision: float):
+    """Temperature minimising NLL, then the lowest threshold meeting the precision target."""
+    best_t, best_nll = 1.0, np.inf
+    for t in np.linspace(0.05, 3.0, 60):
+        p   = softmax(logits / t)
+        nll = -np.log(p[np.arange(len(y)), y] + 1e-12).mean()
+        if nll < best_nll:
+            best_t, best_nll = float(t), float(nll)
+
+    p       = softmax(logits / best_t)
+    conf    = p.max(axis=1)
+    correct = p.argmax(axis=1) == y
+    threshold = 1.0
+    for t in np.unique(conf)[::-1]:
+        mask = conf >= t
+        if correct[mask].mean() < target_precision:
+            break
+        threshold = float(t)
+    coverage = float((conf >= threshold).mean())
+    return best_t, threshold, {"nll": round(best_nll, 4), "coverage": round(coverage, 4),
+                               "oof_accuracy": round(float(correct.mean()), 4)}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--data", default=DATA_PATH)
+    ap.add_argument("--out",  default=MODEL_PATH)
+    ap.add_argument("--target-precision", type=float, default=0.95)
+    ap.add_argument("--l2",     type=float, default=1e-3)
+    ap.add_argument("--epochs", type=int,   default=400)
+    args = ap.parse_args()
+
+    texts, labels = load_data(args.data)
+    label_names   = sorted(set(labels))
+    y = np.array([label_names.index(l) for l in labels])
+
+    oof = out_of_fold_logits(texts, labels, label_names, l2=args.l2, epochs=args.epochs)
+    temperature, threshold, report = calibrate(oof, y, args.target_precision)
+
+    vocab, idf, W, b = fit(texts, labels, label_names, l2=args.l2, epochs=args.epochs)
+    model = {
+        "labels": label_names, "vocab": sorted(vocab, key=vocab.get),
+        "idf": np.round(idf, 5).tolist(), "W": np.round(W, 5).tolist(), "b": np.round(b, 5).tolist(),
+        "temperature": round(temperature, 4), "threshold": round(threshold, 4),
+        "trained_on": len(texts), "calibration": report,
+    }
+    with open(args.out, "w") as f:
+        json.dump(model, f, separators=(",", ":"))
+    print(json.dumps({"out": args.out, "examples": len(texts), "features": len(vocab),
+                      "temperature": model["temperature"], "threshold": model["threshold"], **report}))
+
+
+if __name__ == "__main__":
+    main()
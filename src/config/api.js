@@ -33,12 +33,14 @@ export const API_ENDPOINTS = {
   // ── Job Finder ────────────────────────────────────────────────────────────
   SCRAPE_REVIEW:         `${API_BASE_URL}/scrape-review`,
   GET_JOBS:              `${API_BASE_URL}/api/jobs`,
+  GET_JOBS_STREAM:       `${API_BASE_URL}/api/jobs/stream`,
 
   // ── Question Bank ─────────────────────────────────────────────────────────
   GENERATE_QUESTIONS:    `${API_BASE_URL}/generate-questions`,
 
   // ── Mock Interview ────────────────────────────────────────────────────────
   VAPI_ASSISTANT:        `${API_BASE_URL}/api/vapi/assistant`,
+  VAPI_FEEDBACK:         `${API_BASE_URL}/api/vapi/generate-feedback`,
 
   // ── User / Dashboard ─────────────────────────────────────────────────────
   DASHBOARD_INFO:        `${API_BASE_URL}/api/dashboard-info`,